@@ -0,0 +1,80 @@
+"""Benchmark the remote catalog fetch against a local HTTP stand-in.
+
+Compares the old one-request-at-a-time loop with CatalogClient's pooled,
+concurrent fetch, then times the on-disk cache: a cold fill, a fresh hit,
+an ETag revalidation round and an offline load:
+
+    python benchmarks/bench_catalog.py --plugins 300 --latency 0.02
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalog_server import CatalogServer, make_fake_catalog  # noqa: E402
+from simpletoolsuite.catalog import CatalogCache, CatalogClient  # noqa: E402
+
+
+def fetch_sequential(api_url, raw_url):
+    """The pre-CatalogClient algorithm: unpooled, one request after another."""
+    results = {}
+    for entry in requests.get(api_url).json():
+        if entry["type"] == "dir":
+            response = requests.get(f"{raw_url}/{entry['name']}/metadata.json")
+            if response.status_code == 200:
+                results[entry["name"]] = response.json()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plugins", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds of injected latency per request")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, "catalog_cache.json")
+        make_fake_catalog(root, args.plugins)
+        with CatalogServer(root, latency=args.latency) as server:
+            start = time.perf_counter()
+            sequential = fetch_sequential(server.api_url(), server.raw_url())
+            sequential_time = time.perf_counter() - start
+
+            client = CatalogClient(server.api_url(), server.raw_url(), max_workers=args.workers)
+            start = time.perf_counter()
+            concurrent = client.fetch()
+            concurrent_time = time.perf_counter() - start
+            client.close()
+
+            assert sequential == concurrent
+            print(f"plugins={args.plugins} latency={args.latency}s workers={args.workers}")
+            print(f"sequential: {sequential_time:.3f}s")
+            print(f"concurrent: {concurrent_time:.3f}s ({sequential_time / concurrent_time:.1f}x)")
+
+            for label, ttl in (("cache cold", 600), ("cache fresh", 600), ("cache revalidate", 0)):
+                server.reset_counters()
+                client = CatalogClient(server.api_url(), server.raw_url(), max_workers=args.workers,
+                                       cache=CatalogCache(cache_path, ttl=ttl))
+                start = time.perf_counter()
+                assert client.fetch() == sequential
+                elapsed = time.perf_counter() - start
+                client.close()
+                print(f"{label}: {elapsed:.3f}s requests={server.request_count} "
+                      f"304s={server.not_modified_count} bytes={server.bytes_sent}")
+            api_url, raw_url = server.api_url(), server.raw_url()
+
+        # The server is gone now: everything must come from the cache.
+        client = CatalogClient(api_url, raw_url, cache=CatalogCache(cache_path, ttl=0))
+        start = time.perf_counter()
+        assert client.fetch() == sequential and client.offline
+        print(f"cache offline: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
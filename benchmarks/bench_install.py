@@ -0,0 +1,52 @@
+"""Compare per-file and single-archive plugin installs against a local HTTP stand-in.
+
+    python benchmarks/bench_install.py --files 200 --file-size 2048 --latency 0.005
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalog_server import CatalogServer, make_fake_catalog, make_plugin_archive  # noqa: E402
+from simpletoolsuite.downloader import PluginDownloader  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="files per plugin")
+    parser.add_argument("--file-size", type=int, default=2048)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as plugins:
+        catalog = os.path.join(root, "catalog")
+        make_fake_catalog(catalog, 1, files_per_plugin=args.files, file_size=args.file_size)
+        plugin_name = os.listdir(catalog)[0]
+        archives = {}
+        for fmt, suffix in (("gztar", ".tar.gz"), ("zip", ".zip")):
+            path, sha256 = make_plugin_archive(os.path.join(catalog, plugin_name), os.path.join(root, "plugin"), fmt)
+            archives[suffix] = (os.path.basename(path), sha256)
+
+        with CatalogServer(root, latency=args.latency) as server:
+            downloader = PluginDownloader()
+            runs = [("per-file", lambda dest: downloader.download(server.api_url(f"catalog/{plugin_name}"), dest))]
+            for suffix, (name, sha256) in archives.items():
+                runs.append((f"archive {suffix}", lambda dest, name=name, sha256=sha256:
+                             downloader.download_archive(server.raw_url(name), dest, sha256)))
+            runs.append(("archive local", lambda dest: downloader.download_archive(
+                os.path.join(root, archives[".tar.gz"][0]), dest, archives[".tar.gz"][1])))
+
+            print(f"files={args.files} file_size={args.file_size} latency={args.latency}s")
+            for label, run in runs:
+                server.reset_counters()
+                report = run(os.path.join(plugins, label))
+                assert report.ok, report.summary()
+                print(f"{label:>16}: {report.elapsed:.3f}s bytes={report.bytes_transferred} "
+                      f"requests={server.request_count} files={len(report.files)}")
+            downloader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Local HTTP stand-in for the GitHub endpoints used by SimpleToolSuite.
+
+Serves a directory tree the way GitHub does:
+
+* ``/api/<path>``  - contents API: a JSON listing for directories
+* ``/raw/<path>``  - raw file contents
+
+Responses carry an ETag and honour If-None-Match with a 304. An optional
+per-request latency can be injected to mimic a remote server, and setting
+``fail_status`` answers every request with that status (e.g. 403 for a rate
+limit) until it is cleared.
+"""
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import threading
+import time
+from urllib.parse import quote, unquote, urlsplit
+
+
+def git_blob_sha(data):
+    """Return the git blob SHA-1 of a byte string, as the contents API reports it."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+MALFORMED_METADATA = (
+    "{not json",  # a syntax error
+    "[1, 2, 3]",  # valid JSON that is not an object
+    None,  # no metadata.json at all
+)
+
+
+def make_fake_catalog(root, count, files_per_plugin=1, file_size=0, malformed_every=0):
+    """Create ``count`` fake plugin directories under ``root``.
+
+    With ``malformed_every=n`` every n-th plugin gets a broken or missing
+    metadata.json, cycling through ``MALFORMED_METADATA``.
+    """
+    os.makedirs(root, exist_ok=True)
+    for i in range(count):
+        plugin_dir = os.path.join(root, f"Plugin {i:05d}")
+        os.makedirs(plugin_dir, exist_ok=True)
+        if malformed_every and i % malformed_every == malformed_every - 1:
+            broken = MALFORMED_METADATA[(i // malformed_every) % len(MALFORMED_METADATA)]
+            if broken is not None:
+                with open(os.path.join(plugin_dir, "metadata.json"), "w") as f:
+                    f.write(broken)
+            with open(os.path.join(plugin_dir, "main.py"), "w") as f:
+                f.write("def main(parent):\n    return None\n")
+            continue
+        metadata = {
+            "name": f"Plugin {i:05d}",
+            "author": f"Author {i % 37}",
+            "version": "1.0.0",
+            "main": "main.py",
+            "description": f"Synthetic benchmark plugin number {i}.",
+            "features": ["benchmark", f"group {i % 10}"],
+        }
+        with open(os.path.join(plugin_dir, "metadata.json"), "w") as f:
+            json.dump(metadata, f)
+        with open(os.path.join(plugin_dir, "main.py"), "w") as f:
+            f.write("def main(parent):\n    return None\n")
+        for j in range(files_per_plugin - 1):
+            with open(os.path.join(plugin_dir, f"asset_{j}.bin"), "wb") as f:
+                f.write(os.urandom(file_size))
+    return root
+
+
+def make_plugin_archive(plugin_dir, out_base, fmt="gztar"):
+    """Archive ``plugin_dir`` (with one top-level directory, like GitHub) and return (path, sha256)."""
+    parent, name = os.path.split(os.path.abspath(plugin_dir))
+    path = shutil.make_archive(out_base, fmt, root_dir=parent, base_dir=name)
+    with open(path, "rb") as f:
+        return path, hashlib.sha256(f.read()).hexdigest()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/octet-stream", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _local_path(self, rel):
+        path = os.path.normpath(os.path.join(self.server.root, unquote(rel)))
+        if not path.startswith(os.path.abspath(self.server.root)):
+            return None
+        return path
+
+    def _listing(self, rel, path):
+        base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        entries = []
+        for name in sorted(os.listdir(path)):
+            full = os.path.join(path, name)
+            child = f"{rel}/{name}".strip("/")
+            if os.path.isdir(full):
+                entries.append({"name": name, "path": child, "type": "dir", "sha": None, "size": 0,
+                                "url": f"{base}/api/{quote(child)}", "download_url": None})
+            else:
+                with open(full, "rb") as f:
+                    data = f.read()
+                entries.append({"name": name, "path": child, "type": "file", "sha": git_blob_sha(data),
+                                "size": len(data), "url": f"{base}/api/{quote(child)}",
+                                "download_url": f"{base}/raw/{quote(child)}"})
+        return json.dumps(entries).encode()
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.request_count += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.fail_status:
+            return self._send(self.server.fail_status)
+        url_path = urlsplit(self.path).path
+        for prefix in ("/api", "/raw"):
+            if url_path == prefix or url_path.startswith(prefix + "/"):
+                rel = url_path[len(prefix):].strip("/")
+                break
+        else:
+            return self._send(404)
+        path = self._local_path(rel)
+        if path is None or not os.path.exists(path):
+            return self._send(404)
+        if prefix == "/api":
+            if not os.path.isdir(path):
+                return self._send(404)
+            return self._send_cacheable(self._listing(unquote(rel), path), "application/json")
+        if os.path.isdir(path):
+            return self._send(404)
+        with open(path, "rb") as f:
+            data = f.read()
+        return self._send_cacheable(data)
+
+    def _send_cacheable(self, data, content_type="application/octet-stream"):
+        etag = f'"{git_blob_sha(data)}"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.not_modified_count += 1
+            return self._send(304, headers={"ETag": etag})
+        with self.server.lock:
+            self.server.bytes_sent += len(data)
+        return self._send(200, data, content_type, headers={"ETag": etag})
+
+    do_HEAD = do_GET
+
+
+class CatalogServer(http.server.ThreadingHTTPServer):
+    """A threaded local server for ``root``; use as a context manager."""
+    daemon_threads = True
+
+    def __init__(self, root, latency=0.0, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.fail_status = None
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.bytes_sent = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def api_url(self, rel=""):
+        return f"{self.base_url}/api/{quote(rel)}".rstrip("/")
+
+    def raw_url(self, rel=""):
+        return f"{self.base_url}/raw/{quote(rel)}".rstrip("/")
+
+    def reset_counters(self):
+        with self.lock:
+            self.request_count = 0
+            self.not_modified_count = 0
+            self.bytes_sent = 0
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
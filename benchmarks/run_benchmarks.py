@@ -0,0 +1,316 @@
+"""Benchmark suite for PluginManager and the window's hot paths.
+
+Generates synthetic plugin trees and serves a synthetic catalog from a local
+stand-in for the GitHub endpoints, then times:
+
+* ``discover``  - PluginManager.discover_plugins, cold (no index), warm (index
+  on disk, new manager) and cached (same manager), with malformed metadata mixed in
+* ``load``      - PluginManager.load_plugin cold and warm, with a bundled .venv
+* ``download``  - PluginManager.download_plugin and the catalog fetch behind
+  fetch_available_plugins, with injected latency
+* ``search``    - building the plugin search index and prefix, multi-word and
+  fuzzy queries against it
+* ``window``    - window startup and catalog fetch under the offscreen Qt platform
+
+Results are written as JSON; pass an earlier result file as ``--baseline`` to
+compare medians and flag regressions:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --baseline before.json --output after.json
+    python benchmarks/run_benchmarks.py --sizes 100,1000,10000,50000 --only discover
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalog_server import CatalogServer, make_fake_catalog  # noqa: E402
+from simpletoolsuite.catalog import CatalogCache, CatalogClient  # noqa: E402
+from simpletoolsuite.pluginmanager import INDEX_FILE_NAME, PluginManager  # noqa: E402
+from simpletoolsuite.search import CATALOG, SearchIndex  # noqa: E402
+
+SUITES = ("discover", "load", "download", "search", "window")
+DEFAULT_SIZES = "100,1000,10000"
+RESULTS_VERSION = 1
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the managers' logging while timing."""
+    logger = logging.getLogger("simpletoolsuite")
+    level = logger.level
+    logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def summarize(samples, **extra):
+    result = {"median": statistics.median(samples), "min": min(samples), "max": max(samples),
+              "samples": [round(sample, 6) for sample in samples]}
+    result.update(extra)
+    return result
+
+
+def timed(fn, repeat, setup=None):
+    """Run ``fn`` ``repeat`` times (after ``setup`` each time, untimed) and return the durations."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_discover(args, workdir):
+    results = {}
+    for size in args.sizes:
+        plugin_dir = os.path.join(workdir, f"discover-{size}")
+        make_fake_catalog(plugin_dir, size, malformed_every=args.malformed_every)
+        index_path = os.path.join(plugin_dir, INDEX_FILE_NAME)
+
+        def drop_index():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(index_path)
+
+        with quiet():
+            found = len(PluginManager(plugin_dir).discover_plugins())
+            cold = timed(lambda: PluginManager(plugin_dir).discover_plugins(), args.repeat, setup=drop_index)
+            PluginManager(plugin_dir).discover_plugins()
+            warm = timed(lambda: PluginManager(plugin_dir).discover_plugins(), args.repeat)
+            manager = PluginManager(plugin_dir)
+            manager.discover_plugins()
+            cached = timed(manager.discover_plugins, args.repeat)
+        results[f"discover.cold.{size}"] = summarize(cold, plugins=size, valid=found)
+        results[f"discover.warm.{size}"] = summarize(warm, plugins=size, valid=found)
+        results[f"discover.cached.{size}"] = summarize(cached, plugins=size, valid=found)
+        shutil.rmtree(plugin_dir)
+    return results
+
+
+def make_load_tree(root, count, modules=20):
+    """Plugins whose main.py imports ``modules`` local modules and a package from the plugin's .venv."""
+    version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    for i in range(count):
+        plugin_dir = os.path.join(root, f"loadbench{i}")
+        site = os.path.join(plugin_dir, ".venv", "lib", version, "site-packages", f"loadbench_dep{i}")
+        os.makedirs(site)
+        with open(os.path.join(plugin_dir, ".venv", "pyvenv.cfg"), "w") as f:
+            f.write("home = /usr/bin\n")
+        with open(os.path.join(site, "__init__.py"), "w") as f:
+            f.write("".join(f"def helper_{n}(x):\n    return x * {n}\n" for n in range(50)))
+        imports = [f"import loadbench_dep{i}"]
+        for n in range(modules):
+            name = f"loadbench{i}_mod{n}"
+            with open(os.path.join(plugin_dir, f"{name}.py"), "w") as f:
+                f.write("".join(f"def fn_{k}(x):\n    return x + {k}\n" for k in range(50)))
+            imports.append(f"import {name}")
+        with open(os.path.join(plugin_dir, "main.py"), "w") as f:
+            f.write("import os, sys\nsys.path.insert(0, os.path.dirname(__file__))\n" + "\n".join(imports)
+                    + "\n\ndef main(parent):\n    return None\n")
+    return [os.path.join(root, f"loadbench{i}") for i in range(count)]
+
+
+def bench_load(args, workdir):
+    root = os.path.join(workdir, "load")
+    plugins = make_load_tree(root, args.repeat)
+
+    def forget_modules():
+        for name, module in list(sys.modules.items()):
+            if (getattr(module, "__file__", None) or "").startswith(root):
+                del sys.modules[name]
+        sys.path[:] = [path for path in sys.path if not path.startswith(root)]
+
+    cold, warm = [], []
+    with quiet():
+        for plugin_path in plugins:
+            manager = PluginManager(root)
+            start = time.perf_counter()
+            assert manager.load_plugin(plugin_path, "main.py") is not None
+            cold.append(time.perf_counter() - start)
+            warm += timed(lambda: manager.load_plugin(plugin_path, "main.py"), 3)
+            manager.unload_plugin_dependencies(plugin_path)
+            forget_modules()
+    shutil.rmtree(root)
+    return {"load.cold": summarize(cold), "load.warm": summarize(warm)}
+
+
+def bench_download(args, workdir):
+    results = {}
+    catalog = os.path.join(workdir, "catalog")
+    make_fake_catalog(catalog, args.catalog_plugins, files_per_plugin=args.files, file_size=args.file_size)
+    with CatalogServer(catalog, latency=args.latency) as server:
+        plugin_dir = os.path.join(workdir, "downloaded")
+        manager = PluginManager(plugin_dir)
+        names = sorted(os.listdir(catalog))[:args.repeat]
+        with quiet():
+            samples = []
+            for name in names:
+                start = time.perf_counter()
+                assert manager.download_plugin(server.api_url(), name)
+                samples.append(time.perf_counter() - start)
+        manager.downloader.close()
+        results["download.plugin"] = summarize(samples, files=args.files, file_size=args.file_size,
+                                               latency=args.latency)
+
+        cache_path = os.path.join(workdir, "catalog_cache.json")
+        for label, ttl in (("cold", 600), ("revalidate", 0)):
+            def fetch(ttl=ttl):
+                client = CatalogClient(server.api_url(), server.raw_url(), cache=CatalogCache(cache_path, ttl=ttl))
+                assert len(client.fetch()) == args.catalog_plugins
+                client.close()
+
+            def clear_cache():
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(cache_path)
+
+            with quiet():
+                if label == "revalidate":
+                    fetch()
+                samples = timed(fetch, args.repeat, setup=clear_cache if label == "cold" else None)
+            results[f"catalog.{label}"] = summarize(samples, plugins=args.catalog_plugins, latency=args.latency)
+    return results
+
+
+def synthetic_metadata(count):
+    """(name, metadata) pairs shaped like make_fake_catalog's, without touching disk."""
+    words = ("image", "resize", "convert", "pdf", "merge", "text", "editor", "clock", "timer", "weather",
+             "notes", "calculator", "password", "generator", "color", "picker", "json", "viewer", "markdown")
+    for i in range(count):
+        yield f"Plugin {i:05d}", {
+            "name": f"Plugin {i:05d} {words[i % len(words)]}",
+            "author": f"Author {i % 37}",
+            "description": " ".join(words[(i * k) % len(words)] for k in (1, 3, 7)) + f" plugin number {i}.",
+            "features": ["benchmark", f"group {i % 10}", words[(i // 7) % len(words)]],
+        }
+
+
+def bench_search(args, workdir):
+    results = {}
+    queries = {"prefix": "calc", "words": "pdf merge", "fuzzy": "calculater", "miss": "zzzzzz"}
+    for size in args.sizes:
+        entries = list(synthetic_metadata(size))
+        index = SearchIndex()
+
+        def build():
+            index.replace(CATALOG, [])
+            index.replace(CATALOG, entries)
+
+        results[f"search.build.{size}"] = summarize(timed(build, args.repeat), plugins=size)
+        for label, query in queries.items():
+            samples = timed(lambda: index.search(query, source=CATALOG), args.repeat * 4)
+            results[f"search.{label}.{size}"] = summarize(samples, plugins=size, query=query,
+                                                          hits=len(index.search(query, source=CATALOG)))
+    return results
+
+
+def bench_window(args, workdir):
+    try:
+        import PyQt5  # noqa: F401
+    except ImportError:
+        print("PyQt5 is not installed; skipping the window benchmarks.", file=sys.stderr)
+        return {}
+    plugin_dir = os.path.join(workdir, "window-plugins")
+    catalog = os.path.join(workdir, "window-catalog")
+    make_fake_catalog(plugin_dir, args.window_plugins, malformed_every=args.malformed_every)
+    make_fake_catalog(catalog, args.catalog_plugins)
+    probe = os.path.join(os.path.dirname(os.path.abspath(__file__)), "window_probe.py")
+    runs = []
+    with CatalogServer(catalog, latency=args.latency) as server:
+        for _ in range(args.repeat):
+            home = tempfile.mkdtemp(dir=workdir)
+            env = dict(os.environ, HOME=home, QT_QPA_PLATFORM="offscreen")
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, probe, "--plugin-dir", plugin_dir, "--api-url", server.api_url(),
+                                     "--raw-url", server.raw_url()], env=env, check=True, capture_output=True,
+                                    text=True).stdout
+            wall = time.perf_counter() - start
+            timings = json.loads(output.strip().splitlines()[-1])
+            timings["process"] = wall
+            runs.append(timings)
+    results = {}
+    for phase in ("import", "construct", "first_paint", "plugins_listed", "process"):
+        results[f"window.{phase}"] = summarize([run[phase] for run in runs], plugins=args.window_plugins)
+    results["window.catalog"] = summarize([run["catalog"] for run in runs], plugins=args.catalog_plugins,
+                                          latency=args.latency)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each result against the baseline's median. Returns the names that regressed."""
+    regressions = []
+    previous = baseline.get("results", {}) if baseline else {}
+    for name, result in results.items():
+        line = f"{name:<28}{result['median'] * 1000:10.2f} ms  (min {result['min'] * 1000:.2f})"
+        base = previous.get(name)
+        if base and base["median"] > 0:
+            ratio = result["median"] / base["median"]
+            line += f"  {ratio:5.2f}x baseline"
+            if ratio > 1 + threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", choices=SUITES, help="run only these suites (repeatable)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"plugin counts for discover and search (default {DEFAULT_SIZES})")
+    parser.add_argument("--malformed-every", type=int, default=20, help="every n-th plugin has bad metadata")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds of injected latency per request")
+    parser.add_argument("--catalog-plugins", type=int, default=100)
+    parser.add_argument("--window-plugins", type=int, default=200)
+    parser.add_argument("--files", type=int, default=10, help="files per downloaded plugin")
+    parser.add_argument("--file-size", type=int, default=4096)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="median slowdown over baseline reported as a regression (default 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sts-bench-") as workdir:
+        for suite in args.only or SUITES:
+            results.update(globals()[f"bench_{suite}"](args, workdir))
+
+    regressions = compare(results, baseline, args.threshold)
+    with open(args.output, "w") as f:
+        json.dump({
+            "version": RESULTS_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
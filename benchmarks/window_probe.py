@@ -0,0 +1,78 @@
+"""Start the SimpleToolSuite window offscreen once and report phase timings as JSON.
+
+Run by run_benchmarks.py in a fresh interpreter per sample, so imports are
+cold every time. HOME should point at a throwaway directory:
+
+    HOME=$(mktemp -d) python benchmarks/window_probe.py --plugin-dir DIR [--api-url URL --raw-url URL]
+"""
+import time
+START = time.perf_counter()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def spin(app, condition, timeout=60.0):
+    """Process events until ``condition()`` holds; raises on timeout."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("window probe timed out")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plugin-dir", required=True)
+    parser.add_argument("--api-url")
+    parser.add_argument("--raw-url")
+    args = parser.parse_args(argv)
+
+    from simpletoolsuite.config import get_default_config_path, write_json_atomic
+    config_path, _ = get_default_config_path()
+    os.makedirs(os.path.dirname(config_path), exist_ok=True)
+    write_json_atomic(config_path, {"config_version": 1, "dark_mode": False, "plugin_location": args.plugin_dir})
+
+    from PyQt5 import QtWidgets
+    from simpletoolsuite import simpletoolsuite as sts
+    if args.api_url:
+        sts.GITHUB_API_URL, sts.GITHUB_RAW_URL = args.api_url, args.raw_url
+    timings = {"import": time.perf_counter() - START}
+
+    app = QtWidgets.QApplication([])
+    # Diagnostics are not what is being measured; keep them off the JSON on stdout.
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    start = time.perf_counter()
+    window = sts.SimpleToolSuite()
+    timings["construct"] = time.perf_counter() - start
+    window.show()
+    app.processEvents()
+    timings["first_paint"] = time.perf_counter() - START
+
+    # populate_plugins is queued by setup_ui; wait for its discovery task to finish.
+    spin(app, lambda: not window.tasks.is_running("discover"))
+    app.processEvents()
+    timings["plugins_listed"] = time.perf_counter() - START
+
+    if args.api_url:
+        start = time.perf_counter()
+        window.download_mode = True
+        window.fetch_available_plugins()
+        spin(app, lambda: not window.tasks.is_running("catalog"))
+        app.processEvents()
+        timings["catalog"] = time.perf_counter() - start
+        timings["catalog_plugins"] = len(window.catalog_model)
+
+    window.close()
+    sys.stdout = stdout
+    print(json.dumps(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,10 @@ venv/bin/pip install --upgrade pip wheel pyinstaller
 venv/bin/pip install -r requirements.txt
 
 
+echo " => Precompiling main.ui..."
+venv/bin/python -m PyQt5.uic.pyuic src/simpletoolsuite/main.ui -o src/simpletoolsuite/main_ui.py
+
+
 echo " => Running PyInstaller to create executable..."
 pyinstaller --onefile \
     --add-data "src/simpletoolsuite/*.ui:simpletoolsuite" \
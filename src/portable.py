@@ -1,5 +1,10 @@
 #!/usr/bin/python3
-from simpletoolsuite.simpletoolsuite import main
+import sys
+from simpletoolsuite.cli import main
 
 if __name__ == '__main__':
-    main()
+    if getattr(sys, 'frozen', False):
+        # In a frozen build, spawned compute workers re-run this file; let them run their job instead.
+        import multiprocessing
+        multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import quote
+
+from .tracing import span
+
+GITHUB_API_URL = "https://api.github.com/repos/MaxTheSpy/SimpleToolSuite/contents/Available%20Plugins"
+GITHUB_RAW_URL = "https://raw.githubusercontent.com/MaxTheSpy/SimpleToolSuite/main/Available%20Plugins"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+DEFAULT_CACHE_TTL = 600  # seconds a cached response is served without revalidation
+CACHE_FILE_NAME = "catalog_cache.json"
+CACHE_VERSION = 1
+UNAVAILABLE_STATUSES = (403, 429)  # GitHub's rate limits; 5xx answers are treated the same
+
+log = logging.getLogger(__name__)
+
+
+def make_session(max_workers=DEFAULT_MAX_WORKERS):
+    """Create a requests.Session whose keep-alive pool fits ``max_workers`` threads."""
+    # requests is imported on first use to keep it off the startup path.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CatalogError(Exception):
+    """Raised when the remote plugin catalog cannot be listed."""
+
+
+class CatalogCache:
+    """Persistent cache of catalog responses keyed by URL.
+
+    Each entry keeps the parsed JSON body with the response's ETag and
+    Last-Modified validators. Entries younger than ``ttl`` seconds are served
+    without touching the network; older ones are revalidated with a
+    conditional request.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries = None  # read from disk on first use
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._entries is None:
+            self.load()
+
+    def load(self):
+        self._entries = {}
+        try:
+            with open(self.path, "r") as cache_file:
+                data = json.load(cache_file)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    def save(self):
+        """Atomically write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": CACHE_VERSION, "entries": self._entries}
+            self._dirty = False
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not save catalog cache: %s", e)
+
+    def get(self, url):
+        with self._lock:
+            self._ensure_loaded()
+            return self._entries.get(url)
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def store(self, url, body, headers):
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[url] = {
+                "body": body,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            self._dirty = True
+
+    def touch(self, url):
+        """Mark an entry as freshly validated (after a 304)."""
+        with self._lock:
+            self._ensure_loaded()
+            if url in self._entries:
+                self._entries[url]["fetched_at"] = time.time()
+                self._dirty = True
+
+    def prune(self, prefix, keep):
+        """Drop the entries whose URL starts with ``prefix`` but is not in ``keep``. Returns how many were dropped."""
+        with self._lock:
+            self._ensure_loaded()
+            stale = [url for url in self._entries if url.startswith(prefix) and url not in keep]
+            for url in stale:
+                del self._entries[url]
+            if stale:
+                self._dirty = True
+            return len(stale)
+
+    def count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class CatalogClient:
+    """Fetch the remote plugin catalog over a pooled keep-alive session.
+
+    The catalog listing is a GitHub contents-API style JSON array; each plugin
+    directory's metadata.json is then fetched concurrently from ``raw_base_url``
+    using a bounded number of workers.
+
+    With a ``cache`` the client sends conditional requests, treats 304s as
+    cache hits and falls back to the cached catalog, setting ``offline``, when
+    the network is unavailable or the server refuses with a rate limit or a
+    server error.
+    """
+
+    def __init__(self, api_url, raw_base_url, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT, session=None,
+                 cache=None):
+        self.api_url = api_url
+        self.raw_base_url = raw_base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = False
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """A shared requests.Session whose connection pool fits the worker count."""
+        with self._session_lock:
+            if self._session is None:
+                self._session = make_session(self.max_workers)
+            return self._session
+
+    def metadata_url(self, plugin_name):
+        return f"{self.raw_base_url}/{quote(plugin_name)}/metadata.json"
+
+    def get_json(self, url):
+        """GET a JSON document through the cache. Returns (status_code, body)."""
+        import requests
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            self.cache.count("hits")
+            return 200, entry["body"]
+
+        headers = self.cache.conditional_headers(entry) if entry is not None else {}
+        try:
+            with span("http_get", "catalog", url=url) as get_span:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                get_span.set(status=response.status_code)
+        except (requests.ConnectionError, requests.Timeout):
+            if entry is None:
+                raise
+            self.offline = True
+            self.cache.count("hits")
+            return 200, entry["body"]
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.count("revalidated")
+            return 200, entry["body"]
+        if response.status_code != 200:
+            if entry is not None and (response.status_code in UNAVAILABLE_STATUSES or response.status_code >= 500):
+                log.warning("Catalog answered HTTP %s for %s; using the cached copy", response.status_code, url)
+                self.offline = True
+                self.cache.count("hits")
+                return 200, entry["body"]
+            return response.status_code, None
+        body = response.json()
+        if self.cache is not None:
+            self.cache.count("misses")
+            self.cache.store(url, body, response.headers)
+        return 200, body
+
+    def list_plugins(self):
+        """Return the plugin directory names in the remote catalog."""
+        import requests
+        try:
+            status, entries = self.get_json(self.api_url)
+        except (requests.RequestException, ValueError) as e:
+            raise CatalogError(f"Error fetching plugins: {e}") from e
+        if status != 200:
+            raise CatalogError(f"Failed to fetch plugins: {status}")
+        return [entry["name"] for entry in entries if entry.get("type") == "dir"]
+
+    def fetch_metadata(self, plugin_name):
+        """Fetch and parse one plugin's metadata.json, returning None on failure."""
+        import requests
+        try:
+            status, metadata = self.get_json(self.metadata_url(plugin_name))
+            if status == 200:
+                return metadata
+            log.warning("Failed to fetch metadata for %s: %s", plugin_name, status)
+        except (requests.RequestException, ValueError) as e:
+            log.warning("Error fetching metadata for %s: %s", plugin_name, e)
+        return None
+
+    def fetch(self, on_result=None, is_cancelled=None):
+        """Fetch the whole catalog and return a {plugin_name: metadata} dict.
+
+        ``on_result(name, metadata)`` is called from the calling thread as each
+        plugin's metadata arrives. ``is_cancelled()`` is polled between results;
+        returning True abandons the remaining requests.
+        """
+        with span("catalog_fetch", "catalog") as fetch_span:
+            results = self._fetch(on_result, is_cancelled)
+            fetch_span.set(plugins=len(results), offline=self.offline)
+            return results
+
+    def _fetch(self, on_result, is_cancelled):
+        self.offline = False
+        try:
+            names = self.list_plugins()
+            if self.cache is not None and not self.offline:
+                # Forget plugins that have left this catalog so the cache does not grow without bound.
+                self.cache.prune(f"{self.raw_base_url}/", {self.metadata_url(name) for name in names})
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_metadata, name): name for name in names}
+            for future in concurrent.futures.as_completed(futures):
+                if is_cancelled is not None and is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                metadata = future.result()
+                if metadata is None:
+                    continue
+                name = futures[future]
+                results[name] = metadata
+                if on_result is not None:
+                    on_result(name, metadata)
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,351 @@
+"""Headless command line interface: list, search, inspect, install, update and remove plugins.
+
+``store`` reports (and with ``--link`` extends) the packages plugins share.
+
+Nothing here imports PyQt5; running ``simpletoolsuite`` without a subcommand
+starts the GUI as before.
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+
+from .catalog import CatalogCache, CatalogClient, CatalogError, CACHE_FILE_NAME, DEFAULT_CACHE_TTL, GITHUB_API_URL, \
+    GITHUB_RAW_URL
+from .config import get_default_config_path
+from .search import SearchIndex, INSTALLED, CATALOG
+from .tracing import configure_logging, LOG_LEVEL_ENV
+
+COMMANDS = ("list", "search", "info", "install", "update", "remove", "store")
+DEFAULT_INSTALL_WORKERS = 4
+DEFAULT_SEARCH_LIMIT = 20
+
+
+def read_config(config_path):
+    """Read config.json without creating or migrating it; returns {} if it is missing or unreadable."""
+    try:
+        with open(config_path, "r") as f:
+            config = json.load(f)
+        return config if isinstance(config, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def check_plugin_name(name, where):
+    """Reject names that are not a single plugin folder, such as paths or hidden names."""
+    if not name or name.startswith(".") or "/" in name or "\\" in name:
+        raise ValueError(f"{where}: {name!r} is not a plugin name")
+    return name
+
+
+def read_manifest(path):
+    """Plugin names from a manifest: a JSON list, a JSON ``{"plugins": [...]}`` object, or one name per line.
+
+    In the line format ``#`` starts a comment and blank lines are skipped.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        lines = ((number, line.split("#", 1)[0].strip()) for number, line in enumerate(text.splitlines(), 1))
+        return [check_plugin_name(name, f"{path}:{number}") for number, name in lines if name]
+    if isinstance(data, dict):
+        data = data.get("plugins", [])
+    if not isinstance(data, list) or not all(isinstance(name, str) for name in data):
+        raise ValueError(f"{path}: expected a list of plugin names")
+    return [check_plugin_name(name, path) for name in data]
+
+
+class Cli:
+    """Runs one CLI command against the configured plugin directory and remote catalog."""
+
+    def __init__(self, args):
+        self.args = args
+        config_path, default_plugin_dir = get_default_config_path()
+        self.config = read_config(config_path)
+        self.plugin_dir = args.plugin_dir or self.config.get("plugin_location", default_plugin_dir)
+        cache = CatalogCache(os.path.join(os.path.dirname(config_path), CACHE_FILE_NAME),
+                             ttl=self.config.get("catalog_ttl", DEFAULT_CACHE_TTL))
+        self.catalog = CatalogClient(args.api_url, args.raw_url, cache=cache)
+        self._plugin_manager = None
+
+    @property
+    def plugin_manager(self):
+        if self._plugin_manager is None:
+            from .pluginmanager import PluginManager
+            os.makedirs(self.plugin_dir, exist_ok=True)
+            self._plugin_manager = PluginManager(self.plugin_dir)
+        return self._plugin_manager
+
+    def installed(self):
+        """Installed plugins keyed by folder name, which is also their name in the catalog."""
+        return {os.path.basename(plugin["path"]): plugin for plugin in self.plugin_manager.discover_plugins()}
+
+    def remote_metadata(self, names):
+        """Fetch catalog metadata for ``names`` in parallel. Returns {name: metadata or None}."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.catalog.max_workers) as executor:
+            results = dict(zip(names, executor.map(self.catalog.fetch_metadata, names)))
+        if self.catalog.cache is not None:
+            self.catalog.cache.save()
+        return results
+
+    def requested_names(self):
+        names = [check_plugin_name(name, "argument") for name in self.args.names]
+        if getattr(self.args, "manifest", None):
+            names.extend(read_manifest(self.args.manifest))
+        return list(dict.fromkeys(names))
+
+    def cmd_list(self):
+        installed = [{"name": plugin["name"], "version": plugin["version"], "author": plugin["author"],
+                      "folder": os.path.basename(plugin["path"])}
+                     for plugin in sorted(self.installed().values(), key=lambda plugin: plugin["name"].lower())]
+        if not self.args.available:
+            return 0, {"plugin_dir": self.plugin_dir, "installed": installed}
+        catalog = self.catalog.fetch()
+        installed_names = {plugin["folder"] for plugin in installed}
+        available = [{"name": name, "version": metadata.get("version", "N/A"), "author": metadata.get("author", ""),
+                      "installed": name in installed_names}
+                     for name, metadata in sorted(catalog.items(), key=lambda item: item[0].lower())]
+        return 0, {"plugin_dir": self.plugin_dir, "installed": installed, "available": available,
+                   "offline": self.catalog.offline}
+
+    def cmd_search(self):
+        index = SearchIndex()
+        index.replace(INSTALLED, ((plugin["name"], plugin["metadata"]) for plugin in self.installed().values()))
+        if self.args.available:
+            index.replace(CATALOG, self.catalog.fetch().items())
+        query = " ".join(self.args.names)
+        matches = [{"name": hit.name, "source": hit.source, "score": round(hit.score, 2),
+                    "version": hit.metadata.get("version", "N/A") if isinstance(hit.metadata, dict) else "N/A",
+                    "description": hit.metadata.get("description", "") if isinstance(hit.metadata, dict) else ""}
+                   for hit in index.search(query, limit=self.args.limit)]
+        result = {"query": query, "matches": matches}
+        if self.args.available:
+            result["offline"] = self.catalog.offline
+        return (0 if matches else 1), result
+
+    def cmd_info(self):
+        name = self.args.names[0]
+        plugin = self.plugin_manager.get_plugin(name) or self.installed().get(name)
+        result = {"name": name, "installed": plugin is not None}
+        if plugin is not None:
+            result.update(path=plugin["path"], version=plugin["version"], metadata=plugin["metadata"])
+        if self.args.remote or plugin is None:
+            result["remote"] = self.catalog.fetch_metadata(name)
+            if self.catalog.cache is not None:
+                self.catalog.cache.save()
+        if plugin is None and result["remote"] is None:
+            return 1, result
+        return 0, result
+
+    def install(self, names, metadata):
+        """Install ``names`` concurrently. Returns a list of per-plugin result dicts."""
+        manager = self.plugin_manager
+
+        def install_one(name):
+            report = manager.fetch_plugin(self.catalog.api_url, name, metadata.get(name))
+            return {"name": name, "ok": report.ok, "method": report.method, "bytes": report.bytes_transferred,
+                    "seconds": round(report.elapsed, 3),
+                    "error": None if report.ok else (report.error or "file checks failed")}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.args.workers)) as executor:
+            results = list(executor.map(install_one, names))
+        manager.discover_plugins()
+        return results
+
+    def cmd_install(self):
+        names = self.requested_names()
+        if not names:
+            raise ValueError("no plugins given; name them or pass --manifest")
+        installed = self.installed()
+        skipped = [name for name in names if name in installed and not self.args.force]
+        todo = [name for name in names if name not in skipped]
+        results = self.install(todo, self.remote_metadata(todo)) if todo else []
+        results += [{"name": name, "ok": True, "skipped": "already installed"} for name in skipped]
+        return (0 if all(result["ok"] for result in results) else 1), {"results": results}
+
+    def cmd_update(self):
+        installed = self.installed()
+        names = self.requested_names() or sorted(installed)
+        missing = [name for name in names if name not in installed]
+        names = [name for name in names if name in installed]
+        results = [{"name": name, "ok": False, "error": "not installed"} for name in missing]
+        if self.args.force:
+            remote = self.remote_metadata(names)
+            todo = [name for name in names if remote[name] is not None]
+            results += [{"name": name, "ok": False, "error": "not in the catalog"}
+                        for name in names if name not in todo]
+            if todo and not self.args.dry_run:
+                results += self.install(todo, remote)
+            else:
+                results += [{"name": name, "ok": True, "update": "full reinstall"} for name in todo]
+            return (0 if all(result["ok"] for result in results) else 1), {"results": results}
+
+        # Compare each plugin's installed blob SHAs with its listing; only changed files are fetched.
+        plans = self.plugin_manager.check_updates(self.catalog.api_url, names)
+        todo = []
+        for name in names:
+            plan = plans[name]
+            if isinstance(plan, str):
+                results.append({"name": name, "ok": False, "error": plan})
+            elif plan.up_to_date:
+                results.append({"name": name, "ok": True, "skipped": f"up to date ({installed[name]['version']})"})
+            else:
+                todo.append(plan)
+        if self.args.dry_run:
+            results += [{"name": plan.plugin_name, "ok": True, "update": f"{len(plan.changed)} file(s), "
+                         f"{plan.download_bytes} bytes, {len(plan.removed)} removed"} for plan in todo]
+        elif todo:
+            results += self.apply_updates(todo)
+        return (0 if all(result["ok"] for result in results) else 1), {"results": results}
+
+    def apply_updates(self, plans):
+        """Apply UpdatePlans concurrently. Returns a list of per-plugin result dicts."""
+        reports = self.plugin_manager.update_plugins(self.catalog.api_url, plans, max(1, self.args.workers))
+        return [{"name": name, "ok": report.ok, "method": report.method, "bytes": report.bytes_transferred,
+                 "seconds": round(report.elapsed, 3), "files": len(report.files), "removed": len(report.removed),
+                 "error": None if report.ok else (report.error or "file checks failed")}
+                for name, report in reports.items()]
+
+    def cmd_remove(self):
+        names = self.requested_names()
+        if not names:
+            raise ValueError("no plugins given")
+        results = [{"name": name, "ok": self.plugin_manager.remove_plugin(name)} for name in names]
+        for result in results:
+            if not result["ok"]:
+                result["error"] = "not installed"
+        return (0 if all(result["ok"] for result in results) else 1), {"results": results}
+
+    def cmd_store(self):
+        store = self.plugin_manager.package_store
+        linked = store.link_all(self.plugin_dir) if self.args.link else 0
+        removed = store.collect_garbage()
+        result = {"store": store.root, "newly_linked": linked, "garbage_collected": removed}
+        result.update(store.report().as_dict())
+        return 0, result
+
+    def run(self):
+        try:
+            return getattr(self, "cmd_" + self.args.command)()
+        except (CatalogError, OSError, ValueError) as e:
+            return 1, {"error": str(e)}
+        finally:
+            self.catalog.close()
+            if self._plugin_manager is not None:
+                self._plugin_manager.downloader.close()
+
+
+def format_text(command, result):
+    """Render a command result for humans."""
+    if "error" in result and "results" not in result:
+        return f"Error: {result['error']}"
+    lines = []
+    if command == "list":
+        lines.append(f"Installed plugins ({result['plugin_dir']}):")
+        lines += [f"  {p['name']:<32}{p['version']:<12}{p['author']}" for p in result["installed"]] or ["  (none)"]
+        if "available" in result:
+            lines.append("Available plugins" + (" (offline, from cache):" if result["offline"] else ":"))
+            lines += [f"  {p['name']:<32}{p['version']:<12}{'installed' if p['installed'] else ''}"
+                      for p in result["available"]] or ["  (none)"]
+    elif command == "search":
+        offline = " (offline, from cache)" if result.get("offline") else ""
+        lines.append(f"Plugins matching '{result['query']}'{offline}:")
+        lines += [f"  {m['name']:<32}{m['version']:<12}{m['source']:<11}{m['description']}"
+                  for m in result["matches"]] or ["  (none)"]
+    elif command == "store":
+        lines.append(f"Package store ({result['store']}):")
+        lines.append(f"  {result['objects']} stored files, {result['store_bytes']} bytes, "
+                     f"linked from {result['linked_files']} plugin files")
+        lines.append(f"  {result['bytes_saved']} bytes saved")
+        if result["newly_linked"] or result["garbage_collected"]:
+            lines.append(f"  {result['newly_linked']} files newly linked, "
+                         f"{result['garbage_collected']} unused files removed")
+    elif command == "info":
+        lines.append(f"{result['name']}: {'installed at ' + result['path'] if result['installed'] else 'not installed'}")
+        for key, metadata in (("local", result.get("metadata")), ("remote", result.get("remote"))):
+            if metadata:
+                lines.append(f"  {key}:")
+                lines += [f"    {k}: {v}" for k, v in metadata.items()]
+        if not result["installed"] and result.get("remote") is None:
+            lines.append("  not found in the catalog")
+    else:
+        for item in result["results"]:
+            if not item["ok"]:
+                lines.append(f"  {item['name']}: FAILED ({item['error']})")
+            elif "skipped" in item:
+                lines.append(f"  {item['name']}: skipped, {item['skipped']}")
+            elif "update" in item:
+                lines.append(f"  {item['name']}: update available ({item['update']})")
+            elif item.get("method") == "update":
+                lines.append(f"  {item['name']}: updated ({item['files']} file(s), {item['removed']} removed, "
+                             f"{item['bytes']} bytes, {item['seconds']} s)")
+            elif "method" in item:
+                lines.append(f"  {item['name']}: ok ({item['method']}, {item['bytes']} bytes, {item['seconds']} s)")
+            else:
+                lines.append(f"  {item['name']}: ok")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="simpletoolsuite", description="Manage SimpleToolSuite plugins. "
+                                     "Run without a command to start the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--plugin-dir", help="plugin directory (default: the one in config.json)")
+    common.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    common.add_argument("-v", "--verbose", action="store_true", help="log progress to stderr")
+    common.add_argument("--api-url", default=GITHUB_API_URL, help=argparse.SUPPRESS)
+    common.add_argument("--raw-url", default=GITHUB_RAW_URL, help=argparse.SUPPRESS)
+    subparsers = parser.add_subparsers(dest="command")
+
+    sub = subparsers.add_parser("list", parents=[common], help="list installed plugins")
+    sub.add_argument("--available", action="store_true", help="also list the plugins in the remote catalog")
+
+    sub = subparsers.add_parser("search", parents=[common], help="search installed (and catalog) plugins")
+    sub.add_argument("names", nargs="+", metavar="word")
+    sub.add_argument("--available", action="store_true", help="also search the remote catalog")
+    sub.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT,
+                     help=f"most matches to show (default {DEFAULT_SEARCH_LIMIT})")
+
+    sub = subparsers.add_parser("info", parents=[common], help="show a plugin's metadata")
+    sub.add_argument("names", nargs=1, metavar="name")
+    sub.add_argument("--remote", action="store_true", help="also fetch the catalog's metadata")
+
+    for command, help_text in (("install", "install plugins"), ("update", "update installed plugins")):
+        sub = subparsers.add_parser(command, parents=[common], help=help_text)
+        sub.add_argument("names", nargs="*", metavar="name")
+        sub.add_argument("--manifest", help="file listing plugins: JSON list, {\"plugins\": [...]} or one per line")
+        sub.add_argument("--workers", type=int, default=DEFAULT_INSTALL_WORKERS,
+                         help=f"plugins installed at once (default {DEFAULT_INSTALL_WORKERS})")
+        sub.add_argument("--force", action="store_true", help="reinstall even if installed or up to date")
+    sub.add_argument("--dry-run", action="store_true", help="only report which plugins have updates and their size")
+
+    sub = subparsers.add_parser("remove", parents=[common], help="remove installed plugins")
+    sub.add_argument("names", nargs="+", metavar="name")
+
+    sub = subparsers.add_parser("store", parents=[common], help="report disk space saved by shared plugin packages")
+    sub.add_argument("--link", action="store_true", help="first share the packages of every installed plugin")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        from .simpletoolsuite import main as gui_main
+        return gui_main(argv)
+
+    args = build_parser().parse_args(argv)
+    # Log records go to stderr so stdout holds only the result.
+    configure_logging("INFO" if args.verbose else os.environ.get(LOG_LEVEL_ENV, "WARNING"))
+    status, result = Cli(args).run()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(format_text(args.command, result))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import platform
+import tempfile
+import threading
+from collections.abc import MutableMapping
+
+CONFIG_VERSION = 1
+DEFAULT_SAVE_DELAY = 0.5  # seconds changes are batched before config.json is written
+
+log = logging.getLogger(__name__)
+
+
+def get_default_config_path():
+    """Determine the default configuration and plugin directory paths based on the operating system."""
+    home = os.path.expanduser("~")
+    system = platform.system()
+
+    # Config: Base Path.
+    if system == "Windows":
+        config_base_dir = os.path.join(home, "AppData", "Local", "SimpleToolSuite")
+    elif system == "Darwin":  # macOS
+        config_base_dir = os.path.join(home, "Library", "Application Support", "SimpleToolSuite")
+    else:  # Assuming Linux and other UNIX-like systems
+        config_base_dir = os.path.join(home, ".config", "SimpleToolSuite")
+
+    #plugin: Base Path.
+    if system == "Windows":
+            plugin_base_dir = os.path.join(home, "AppData", "Local", "SimpleToolSuite", "Plugins")
+    elif system == "Darwin":  # macOS
+        plugin_base_dir = os.path.join(home, "Library", "Application Support", "SimpleToolSuite", "Plugins")
+    else:  # Assuming Linux and other UNIX-like systems
+        plugin_base_dir = os.path.join(home, ".local", "share", "SimpleToolSuite", "Plugins")
+
+    config_path = os.path.join(config_base_dir, "config.json")
+    return config_path, plugin_base_dir
+
+
+def default_config(plugin_dir):
+    return {
+        "config_version": CONFIG_VERSION,
+        "dark_mode": False,
+        "plugin_location": plugin_dir,
+    }
+
+
+def _migrate_0_to_1(config, plugin_dir):
+    """Unversioned configs from 1.0.x: fill in any missing keys."""
+    for key, value in default_config(plugin_dir).items():
+        config.setdefault(key, value)
+    return config
+
+
+# config_version -> function upgrading a config dict from that version to the next
+MIGRATIONS = {
+    0: _migrate_0_to_1,
+}
+
+
+def migrate_config(config, plugin_dir):
+    """Upgrade a loaded config dict to CONFIG_VERSION. Returns (config, changed)."""
+    version = config.get("config_version", 0)
+    changed = False
+    while version < CONFIG_VERSION:
+        config = MIGRATIONS[version](config, plugin_dir)
+        version += 1
+        config["config_version"] = version
+        changed = True
+    return config, changed
+
+
+def write_json_atomic(path, data):
+    """Write JSON to ``path`` via a temp file, fsync and rename, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class ConfigStore(MutableMapping):
+    """The app configuration, backed by config.json with write-behind saving.
+
+    ``save()`` does not write immediately: it (re)arms a short debounce timer,
+    so a burst of changes becomes one atomic write. Writes are also skipped
+    when nothing changed since the last one. ``writes`` and
+    ``writes_avoided`` count what happened. Call ``flush()`` before exit.
+    """
+
+    def __init__(self, path, plugin_dir, save_delay=DEFAULT_SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.writes = 0
+        self.writes_avoided = 0
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._data = {}
+        self._written = None
+        self.load(plugin_dir)
+
+    def load(self, plugin_dir):
+        """Load config.json, creating or migrating it as needed."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("config is not a JSON object")
+            except (OSError, ValueError) as e:
+                backup = self.path + ".corrupt"
+                log.warning("Config file %s is unreadable (%s); moved to %s and using defaults.", self.path, e, backup)
+                try:
+                    os.replace(self.path, backup)
+                except OSError:
+                    pass
+                data = None
+
+        with self._lock:
+            if data is None:
+                self._data = default_config(plugin_dir)
+                changed = True
+            else:
+                self._data, changed = migrate_config(data, plugin_dir)
+                self._written = json.dumps(data, sort_keys=True) if not changed else None
+        if changed:
+            self.flush(force=True)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._data)
+
+    def save(self):
+        """Schedule a write of the current configuration after the debounce delay."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self.writes_avoided += 1
+            if self.save_delay <= 0:
+                self._timer = None
+            else:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def flush(self, force=False):
+        """Write pending changes now. Returns True if the file was written."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                snapshot = json.dumps(self._data, sort_keys=True)
+                if not force and snapshot == self._written:
+                    self.writes_avoided += 1
+                    return False
+                data = dict(self._data)
+            try:
+                write_json_atomic(self.path, data)
+            except OSError as e:
+                log.error("Failed to save config: %s", e)
+                return False
+            with self._lock:
+                self._written = snapshot
+                self.writes += 1
+            return True
@@ -0,0 +1,143 @@
+import glob
+import logging
+import os
+import sys
+import sysconfig
+import threading
+
+from .tracing import span
+
+VENV_DIR_NAME = ".venv"
+
+log = logging.getLogger(__name__)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class DependencyResolver:
+    """Resolve and scope the sys.path entries a plugin's bundled .venv needs.
+
+    Site-packages directories are discovered for the running interpreter
+    (``lib/pythonX.Y``, ``lib64`` and Windows' ``Lib`` layouts) without
+    executing any activation script, and cached per plugin until the venv's
+    pyvenv.cfg changes. Path entries are reference counted across plugins so
+    each directory is inserted once and removed again by ``deactivate``.
+    """
+
+    def __init__(self):
+        self._cache = {}  # plugin path -> (venv stamp, [paths])
+        self._refcounts = {}  # sys.path entry -> number of active plugins using it
+        self._owned = set()  # entries we inserted (and may therefore remove)
+        self._active = {}  # plugin path -> [paths]
+        self.import_costs = {}  # plugin path -> {"seconds": float, "modules": int}
+        self._lock = threading.RLock()
+
+    def _candidate_dirs(self, venv):
+        version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+        candidates = []
+        for key in ("purelib", "platlib"):
+            candidates.append(sysconfig.get_path(key, vars={"base": venv, "platbase": venv}))
+        for lib in ("lib", "lib64"):
+            candidates.append(os.path.join(venv, lib, version, "site-packages"))
+        candidates.append(os.path.join(venv, "Lib", "site-packages"))
+        found = [path for path in candidates if os.path.isdir(path)]
+        if not found:
+            # A venv built for another interpreter version: take the newest one rather than nothing.
+            others = sorted(glob.glob(os.path.join(venv, "lib*", "python3*", "site-packages")), reverse=True)
+            if others:
+                log.warning("No site-packages for %s in %s, using %s", version, venv, others[0])
+                found = others[:1]
+        return found
+
+    def _pth_dirs(self, site_dir):
+        """Directories listed in a site dir's .pth files (import lines are not executed)."""
+        paths = []
+        for pth in sorted(glob.glob(os.path.join(site_dir, "*.pth"))):
+            try:
+                with open(pth, "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith(("#", "import ", "import\t")):
+                            path = os.path.normpath(os.path.join(site_dir, line))
+                            if os.path.isdir(path):
+                                paths.append(path)
+            except OSError:
+                pass
+        return paths
+
+    def site_packages(self, plugin_path):
+        """Return the (cached) sys.path entries for a plugin's .venv; empty if it has none."""
+        venv = os.path.join(plugin_path, VENV_DIR_NAME)
+        stamp = _stamp(os.path.join(venv, "pyvenv.cfg")) or _stamp(venv)
+        with self._lock:
+            cached = self._cache.get(plugin_path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        paths = []
+        if stamp is not None:
+            seen = set()
+            for site_dir in self._candidate_dirs(venv):
+                for path in [site_dir] + self._pth_dirs(site_dir):
+                    real = os.path.realpath(path)
+                    if real not in seen:
+                        seen.add(real)
+                        paths.append(path)
+        with self._lock:
+            self._cache[plugin_path] = (stamp, paths)
+        return paths
+
+    def activate(self, plugin_path):
+        """Put a plugin's dependency paths at the front of sys.path. Returns the paths."""
+        with span("activate_dependencies", "plugins", plugin=os.path.basename(plugin_path)) as activate_span, \
+                self._lock:
+            if plugin_path in self._active:
+                return self._active[plugin_path]
+            paths = self.site_packages(plugin_path)
+            activate_span.set(paths=len(paths))
+            for path in reversed(paths):
+                if self._refcounts.get(path, 0) == 0 and path not in sys.path:
+                    sys.path.insert(0, path)
+                    self._owned.add(path)
+                self._refcounts[path] = self._refcounts.get(path, 0) + 1
+            self._active[plugin_path] = paths
+            return paths
+
+    def deactivate(self, plugin_path):
+        """Remove the sys.path entries ``activate`` added for a plugin, once no other plugin needs them.
+
+        Returns the entries released, i.e. those no other active plugin still uses.
+        """
+        with self._lock:
+            released = []
+            for path in self._active.pop(plugin_path, []):
+                count = self._refcounts.get(path, 0) - 1
+                if count > 0:
+                    self._refcounts[path] = count
+                    continue
+                self._refcounts.pop(path, None)
+                released.append(path)
+                if path in self._owned:
+                    self._owned.discard(path)
+                    while path in sys.path:
+                        sys.path.remove(path)
+            return released
+
+    def active_paths(self, plugin_path):
+        with self._lock:
+            return list(self._active.get(plugin_path, []))
+
+    def record_import_cost(self, plugin_path, seconds, modules):
+        with self._lock:
+            self.import_costs[plugin_path] = {"seconds": seconds, "modules": modules}
+
+    def import_cost_report(self):
+        """Per-plugin import cost, most expensive first."""
+        with self._lock:
+            return sorted(((path, dict(cost)) for path, cost in self.import_costs.items()),
+                          key=lambda item: item[1]["seconds"], reverse=True)
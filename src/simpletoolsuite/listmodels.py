@@ -0,0 +1,151 @@
+from PyQt5 import QtCore
+
+DEFAULT_BATCH_SIZE = 200  # rows handed to the view per fetchMore()
+
+NameRole = QtCore.Qt.UserRole  # the plugin's name: catalog folder name or installed plugin name
+MetadataRole = QtCore.Qt.UserRole + 1  # the plugin's metadata.json contents
+
+
+class PluginListModel(QtCore.QAbstractListModel):
+    """A list of (name, metadata) plugin entries for a QListView.
+
+    Rows are exposed to the view in batches through ``canFetchMore`` and
+    ``fetchMore``, so a catalog of thousands of plugins only creates rows
+    as the user scrolls. Entries appended while the view has not yet been
+    given a first full batch appear immediately.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._entries = []
+        self._rows = {}  # name -> index into _entries
+        self._visible = 0
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._visible:
+            return None
+        name, metadata = self._entries[index.row()]
+        if role in (QtCore.Qt.DisplayRole, NameRole):
+            return name
+        if role == MetadataRole:
+            return metadata
+        if role == QtCore.Qt.ToolTipRole and isinstance(metadata, dict):
+            return metadata.get("description")
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._visible < len(self._entries)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._entries) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def set_entries(self, entries):
+        """Replace every entry with ``entries``, an iterable of (name, metadata) pairs."""
+        self.beginResetModel()
+        self._entries = []
+        self._rows = {}
+        self._visible = 0
+        self._add(entries)
+        self._visible = min(self.batch_size, len(self._entries))
+        self.endResetModel()
+
+    def extend(self, entries):
+        """Append (name, metadata) pairs; an existing name has its metadata replaced in place."""
+        visible_before = self._visible
+        for row in self._add(entries):
+            if row < visible_before:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+        if self._visible < self.batch_size and self._visible < len(self._entries):
+            self.fetchMore()
+
+    def _add(self, entries):
+        """Store entries, returning the rows of names that were already present."""
+        replaced = []
+        for name, metadata in entries:
+            row = self._rows.get(name)
+            if row is None:
+                self._rows[name] = len(self._entries)
+                self._entries.append((name, metadata))
+            else:
+                self._entries[row] = (name, metadata)
+                replaced.append(row)
+        return replaced
+
+    def clear(self):
+        self.set_entries([])
+
+    def metadata(self, name):
+        row = self._rows.get(name)
+        return None if row is None else self._entries[row][1]
+
+    def names(self):
+        return [name for name, _ in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PluginDetailsModel(QtCore.QAbstractListModel):
+    """The detail pane: a plugin's metadata rendered as lines, followed by any status messages."""
+
+    FIELDS = (
+        ("name", "Name"),
+        ("version", "Version"),
+        ("author", "Author"),
+        ("description", "Description"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lines = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.isValid() and role == QtCore.Qt.DisplayRole and index.row() < len(self._lines):
+            return self._lines[index.row()]
+        return None
+
+    def _set_lines(self, lines):
+        self.beginResetModel()
+        self._lines = lines
+        self.endResetModel()
+
+    def clear(self):
+        self._set_lines([])
+
+    def show_metadata(self, metadata):
+        """Replace the pane's contents with ``metadata``."""
+        if not isinstance(metadata, dict):
+            self._set_lines(["No metadata available or improperly formatted."])
+            return
+        lines = [f"{label}: {metadata[key]}" for key, label in self.FIELDS if key in metadata]
+        features = metadata.get("features")
+        if isinstance(features, list):
+            lines += ["", "Features:"] + [f"  - {feature}" for feature in features]
+        else:
+            lines.append("No metadata available or improperly formatted.")
+        self._set_lines(lines)
+
+    def add_message(self, text):
+        """Append a status line below whatever is shown."""
+        row = len(self._lines)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._lines.append(text)
+        self.endInsertRows()
+
+    def lines(self):
+        return list(self._lines)
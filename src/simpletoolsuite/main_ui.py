@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'main.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(800, 500)
+        MainWindow.setMinimumSize(QtCore.QSize(500, 300))
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        self.tabWidget.setMinimumSize(QtCore.QSize(0, 0))
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab_plugins = QtWidgets.QWidget()
+        self.tab_plugins.setObjectName("tab_plugins")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.tab_plugins)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.widget = QtWidgets.QWidget(self.tab_plugins)
+        self.widget.setObjectName("widget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.widget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.widget_12 = QtWidgets.QWidget(self.widget)
+        self.widget_12.setObjectName("widget_12")
+        self.horizontalLayout_12 = QtWidgets.QHBoxLayout(self.widget_12)
+        self.horizontalLayout_12.setObjectName("horizontalLayout_12")
+        self.widget_10 = QtWidgets.QWidget(self.widget_12)
+        self.widget_10.setObjectName("widget_10")
+        self.horizontalLayout_10 = QtWidgets.QHBoxLayout(self.widget_10)
+        self.horizontalLayout_10.setObjectName("horizontalLayout_10")
+        self.label_plugin_mode = QtWidgets.QLabel(self.widget_10)
+        font = QtGui.QFont()
+        font.setPointSize(15)
+        self.label_plugin_mode.setFont(font)
+        self.label_plugin_mode.setObjectName("label_plugin_mode")
+        self.horizontalLayout_10.addWidget(self.label_plugin_mode)
+        self.horizontalLayout_12.addWidget(self.widget_10)
+        self.widget_11 = QtWidgets.QWidget(self.widget_12)
+        self.widget_11.setObjectName("widget_11")
+        self.horizontalLayout_11 = QtWidgets.QHBoxLayout(self.widget_11)
+        self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        spacerItem = QtWidgets.QSpacerItem(20, 28, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Maximum)
+        self.horizontalLayout_11.addItem(spacerItem)
+        self.horizontalLayout_12.addWidget(self.widget_11)
+        self.verticalLayout.addWidget(self.widget_12)
+        self.lineEdit_search = QtWidgets.QLineEdit(self.widget)
+        self.lineEdit_search.setClearButtonEnabled(True)
+        self.lineEdit_search.setObjectName("lineEdit_search")
+        self.verticalLayout.addWidget(self.lineEdit_search)
+        self.list_plugin_widget = QtWidgets.QListView(self.widget)
+        self.list_plugin_widget.setUniformItemSizes(True)
+        self.list_plugin_widget.setObjectName("list_plugin_widget")
+        self.verticalLayout.addWidget(self.list_plugin_widget)
+        self.widget_3 = QtWidgets.QWidget(self.widget)
+        self.widget_3.setObjectName("widget_3")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.widget_3)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.button_load_plugin = QtWidgets.QPushButton(self.widget_3)
+        self.button_load_plugin.setObjectName("button_load_plugin")
+        self.horizontalLayout_3.addWidget(self.button_load_plugin)
+        self.button_download_plugin = QtWidgets.QPushButton(self.widget_3)
+        self.button_download_plugin.setObjectName("button_download_plugin")
+        self.horizontalLayout_3.addWidget(self.button_download_plugin)
+        self.button_check_updates = QtWidgets.QPushButton(self.widget_3)
+        self.button_check_updates.setObjectName("button_check_updates")
+        self.horizontalLayout_3.addWidget(self.button_check_updates)
+        self.verticalLayout.addWidget(self.widget_3)
+        self.horizontalLayout_2.addWidget(self.widget)
+        self.widget_2 = QtWidgets.QWidget(self.tab_plugins)
+        self.widget_2.setObjectName("widget_2")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.widget_2)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.widget_13 = QtWidgets.QWidget(self.widget_2)
+        self.widget_13.setObjectName("widget_13")
+        self.horizontalLayout_13 = QtWidgets.QHBoxLayout(self.widget_13)
+        self.horizontalLayout_13.setObjectName("horizontalLayout_13")
+        self.widget_14 = QtWidgets.QWidget(self.widget_13)
+        self.widget_14.setObjectName("widget_14")
+        self.horizontalLayout_14 = QtWidgets.QHBoxLayout(self.widget_14)
+        self.horizontalLayout_14.setObjectName("horizontalLayout_14")
+        self.label_plugin_desc = QtWidgets.QLabel(self.widget_14)
+        font = QtGui.QFont()
+        font.setPointSize(15)
+        self.label_plugin_desc.setFont(font)
+        self.label_plugin_desc.setObjectName("label_plugin_desc")
+        self.horizontalLayout_14.addWidget(self.label_plugin_desc)
+        self.horizontalLayout_13.addWidget(self.widget_14)
+        self.widget_15 = QtWidgets.QWidget(self.widget_13)
+        self.widget_15.setObjectName("widget_15")
+        self.horizontalLayout_15 = QtWidgets.QHBoxLayout(self.widget_15)
+        self.horizontalLayout_15.setObjectName("horizontalLayout_15")
+        spacerItem1 = QtWidgets.QSpacerItem(20, 28, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Maximum)
+        self.horizontalLayout_15.addItem(spacerItem1)
+        self.horizontalLayout_13.addWidget(self.widget_15)
+        self.verticalLayout_3.addWidget(self.widget_13)
+        self.list_desc = QtWidgets.QListView(self.widget_2)
+        self.list_desc.setUniformItemSizes(True)
+        self.list_desc.setObjectName("list_desc")
+        self.verticalLayout_3.addWidget(self.list_desc)
+        self.button_launch_plugin = QtWidgets.QPushButton(self.widget_2)
+        self.button_launch_plugin.setObjectName("button_launch_plugin")
+        self.verticalLayout_3.addWidget(self.button_launch_plugin)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_3.addItem(spacerItem2)
+        self.horizontalLayout_2.addWidget(self.widget_2)
+        self.tabWidget.addTab(self.tab_plugins, "")
+        self.tab_settings = QtWidgets.QWidget()
+        self.tab_settings.setObjectName("tab_settings")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.tab_settings)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.widget_17 = QtWidgets.QWidget(self.tab_settings)
+        self.widget_17.setObjectName("widget_17")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_17)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.widget_18 = QtWidgets.QWidget(self.widget_17)
+        self.widget_18.setObjectName("widget_18")
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout(self.widget_18)
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.widget_8 = QtWidgets.QWidget(self.widget_18)
+        self.widget_8.setMinimumSize(QtCore.QSize(110, 30))
+        self.widget_8.setObjectName("widget_8")
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout(self.widget_8)
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        self.label_plugin_loc = QtWidgets.QLabel(self.widget_8)
+        self.label_plugin_loc.setMinimumSize(QtCore.QSize(120, 0))
+        self.label_plugin_loc.setObjectName("label_plugin_loc")
+        self.horizontalLayout_8.addWidget(self.label_plugin_loc)
+        self.horizontalLayout_6.addWidget(self.widget_8)
+        self.widget_5 = QtWidgets.QWidget(self.widget_18)
+        self.widget_5.setObjectName("widget_5")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.widget_5)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.button_plugin_loc = QtWidgets.QPushButton(self.widget_5)
+        self.button_plugin_loc.setMinimumSize(QtCore.QSize(121, 25))
+        self.button_plugin_loc.setObjectName("button_plugin_loc")
+        self.horizontalLayout_5.addWidget(self.button_plugin_loc)
+        self.lineEdit_plugin_loc = QtWidgets.QLineEdit(self.widget_5)
+        self.lineEdit_plugin_loc.setObjectName("lineEdit_plugin_loc")
+        self.horizontalLayout_5.addWidget(self.lineEdit_plugin_loc)
+        self.button_open_plugin = QtWidgets.QPushButton(self.widget_5)
+        self.button_open_plugin.setMinimumSize(QtCore.QSize(80, 25))
+        self.button_open_plugin.setObjectName("button_open_plugin")
+        self.horizontalLayout_5.addWidget(self.button_open_plugin)
+        self.horizontalLayout_6.addWidget(self.widget_5)
+        self.verticalLayout_2.addWidget(self.widget_18)
+        self.widget_19 = QtWidgets.QWidget(self.widget_17)
+        self.widget_19.setObjectName("widget_19")
+        self.horizontalLayout_17 = QtWidgets.QHBoxLayout(self.widget_19)
+        self.horizontalLayout_17.setObjectName("horizontalLayout_17")
+        self.widget_7 = QtWidgets.QWidget(self.widget_19)
+        self.widget_7.setMinimumSize(QtCore.QSize(120, 30))
+        self.widget_7.setObjectName("widget_7")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.widget_7)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label_config_loc = QtWidgets.QLabel(self.widget_7)
+        self.label_config_loc.setMinimumSize(QtCore.QSize(120, 20))
+        self.label_config_loc.setObjectName("label_config_loc")
+        self.horizontalLayout.addWidget(self.label_config_loc)
+        self.horizontalLayout_17.addWidget(self.widget_7)
+        self.widget_4 = QtWidgets.QWidget(self.widget_19)
+        self.widget_4.setObjectName("widget_4")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(self.widget_4)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.button_open_config = QtWidgets.QPushButton(self.widget_4)
+        self.button_open_config.setObjectName("button_open_config")
+        self.horizontalLayout_4.addWidget(self.button_open_config)
+        self.horizontalLayout_17.addWidget(self.widget_4)
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_17.addItem(spacerItem3)
+        self.verticalLayout_2.addWidget(self.widget_19)
+        self.verticalLayout_5.addWidget(self.widget_17)
+        self.widget_6 = QtWidgets.QWidget(self.tab_settings)
+        self.widget_6.setObjectName("widget_6")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout(self.widget_6)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.checkbox_darkmode = QtWidgets.QCheckBox(self.widget_6)
+        self.checkbox_darkmode.setLayoutDirection(QtCore.Qt.RightToLeft)
+        self.checkbox_darkmode.setTristate(False)
+        self.checkbox_darkmode.setObjectName("checkbox_darkmode")
+        self.horizontalLayout_7.addWidget(self.checkbox_darkmode)
+        spacerItem4 = QtWidgets.QSpacerItem(549, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem4)
+        self.verticalLayout_5.addWidget(self.widget_6)
+        self.group_performance = QtWidgets.QGroupBox(self.tab_settings)
+        self.group_performance.setObjectName("group_performance")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.group_performance)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.table_performance = QtWidgets.QTableWidget(self.group_performance)
+        self.table_performance.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table_performance.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.table_performance.setColumnCount(12)
+        self.table_performance.setObjectName("table_performance")
+        self.table_performance.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(5, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(6, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(7, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(8, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(9, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(10, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table_performance.setHorizontalHeaderItem(11, item)
+        self.table_performance.horizontalHeader().setStretchLastSection(True)
+        self.table_performance.verticalHeader().setVisible(False)
+        self.verticalLayout_6.addWidget(self.table_performance)
+        self.widget_20 = QtWidgets.QWidget(self.group_performance)
+        self.widget_20.setObjectName("widget_20")
+        self.horizontalLayout_18 = QtWidgets.QHBoxLayout(self.widget_20)
+        self.horizontalLayout_18.setObjectName("horizontalLayout_18")
+        self.checkbox_trace = QtWidgets.QCheckBox(self.widget_20)
+        self.checkbox_trace.setObjectName("checkbox_trace")
+        self.horizontalLayout_18.addWidget(self.checkbox_trace)
+        self.checkbox_memory = QtWidgets.QCheckBox(self.widget_20)
+        self.checkbox_memory.setObjectName("checkbox_memory")
+        self.horizontalLayout_18.addWidget(self.checkbox_memory)
+        spacerItem5 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_18.addItem(spacerItem5)
+        self.button_refresh_performance = QtWidgets.QPushButton(self.widget_20)
+        self.button_refresh_performance.setObjectName("button_refresh_performance")
+        self.horizontalLayout_18.addWidget(self.button_refresh_performance)
+        self.button_export_trace = QtWidgets.QPushButton(self.widget_20)
+        self.button_export_trace.setObjectName("button_export_trace")
+        self.horizontalLayout_18.addWidget(self.button_export_trace)
+        self.verticalLayout_6.addWidget(self.widget_20)
+        self.verticalLayout_5.addWidget(self.group_performance)
+        self.widget_16 = QtWidgets.QWidget(self.tab_settings)
+        self.widget_16.setObjectName("widget_16")
+        self.horizontalLayout_16 = QtWidgets.QHBoxLayout(self.widget_16)
+        self.horizontalLayout_16.setObjectName("horizontalLayout_16")
+        self.button_save_settings = QtWidgets.QPushButton(self.widget_16)
+        self.button_save_settings.setObjectName("button_save_settings")
+        self.horizontalLayout_16.addWidget(self.button_save_settings)
+        self.verticalLayout_5.addWidget(self.widget_16)
+        self.tabWidget.addTab(self.tab_settings, "")
+        self.verticalLayout_4.addWidget(self.tabWidget)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        self.tabWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.label_plugin_mode.setText(_translate("MainWindow", "Your Plugins"))
+        self.lineEdit_search.setPlaceholderText(_translate("MainWindow", "Search plugins"))
+        self.button_load_plugin.setText(_translate("MainWindow", "Load Plugin"))
+        self.button_download_plugin.setText(_translate("MainWindow", "Download Plugin"))
+        self.button_check_updates.setText(_translate("MainWindow", "Check for Updates"))
+        self.label_plugin_desc.setText(_translate("MainWindow", "Description:"))
+        self.button_launch_plugin.setText(_translate("MainWindow", "Launch Plugin"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_plugins), _translate("MainWindow", "Plugins"))
+        self.label_plugin_loc.setText(_translate("MainWindow", "Plugin Location:"))
+        self.button_plugin_loc.setText(_translate("MainWindow", "Browse Directory"))
+        self.button_open_plugin.setText(_translate("MainWindow", "Open"))
+        self.label_config_loc.setText(_translate("MainWindow", "Config Location:"))
+        self.button_open_config.setText(_translate("MainWindow", "Open"))
+        self.checkbox_darkmode.setText(_translate("MainWindow", "Enable Dark Mode"))
+        self.group_performance.setTitle(_translate("MainWindow", "Performance"))
+        item = self.table_performance.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "Plugin"))
+        item = self.table_performance.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "Folder"))
+        item = self.table_performance.horizontalHeaderItem(2)
+        item.setText(_translate("MainWindow", "Loads"))
+        item = self.table_performance.horizontalHeaderItem(3)
+        item.setText(_translate("MainWindow", "Load p50 (ms)"))
+        item = self.table_performance.horizontalHeaderItem(4)
+        item.setText(_translate("MainWindow", "Load p90 (ms)"))
+        item = self.table_performance.horizontalHeaderItem(5)
+        item.setText(_translate("MainWindow", "Import (ms)"))
+        item = self.table_performance.horizontalHeaderItem(6)
+        item.setText(_translate("MainWindow", "Modules Imported"))
+        item = self.table_performance.horizontalHeaderItem(7)
+        item.setText(_translate("MainWindow", "Launches"))
+        item = self.table_performance.horizontalHeaderItem(8)
+        item.setText(_translate("MainWindow", "Launch p50 (ms)"))
+        item = self.table_performance.horizontalHeaderItem(9)
+        item.setText(_translate("MainWindow", "Launch p90 (ms)"))
+        item = self.table_performance.horizontalHeaderItem(10)
+        item.setText(_translate("MainWindow", "Memory (KB)"))
+        item = self.table_performance.horizontalHeaderItem(11)
+        item.setText(_translate("MainWindow", "Kept After Close (KB)"))
+        self.checkbox_trace.setText(_translate("MainWindow", "Record Trace"))
+        self.checkbox_memory.setText(_translate("MainWindow", "Track Memory"))
+        self.button_refresh_performance.setText(_translate("MainWindow", "Refresh"))
+        self.button_export_trace.setText(_translate("MainWindow", "Export Trace..."))
+        self.button_save_settings.setText(_translate("MainWindow", "Save Settings"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_settings), _translate("MainWindow", "Settings"))
@@ -0,0 +1,134 @@
+"""Worker side of the compute pool that plugins offload CPU-heavy work to.
+
+Jobs name the function to run by path, ``"module:function"``, so nothing of a
+plugin has to be pickled. The worker puts the plugin's dependency paths on
+sys.path for the duration of the call and imports the module: a module file in
+the plugin's own folder is loaded under a name private to that plugin, so two
+plugins that both ship a ``worker.py`` do not collide in the shared workers;
+anything else is imported normally.
+
+Arguments and results are pickled. Large inputs should be put in a
+``SharedBuffer`` instead, which crosses to the worker by name only.
+
+Every worker process imports this module, so it must not import Qt.
+"""
+import importlib
+import importlib.util
+import os
+import re
+import sys
+from multiprocessing import shared_memory
+
+_local_modules = {}  # module file -> (mtime_ns, module), per worker process
+
+
+class SharedBuffer:
+    """A block of shared memory that is handed to a worker by name instead of by copy.
+
+    ``buf`` returns a memoryview on the block in whichever process holds the
+    buffer, so a worker can read (and write) the caller's data in place, e.g.
+    ``numpy.ndarray(shape, dtype, buffer=shared.buf)``. Only the process that
+    created the buffer frees it, with ``release()``.
+    """
+
+    def __init__(self, shm, size, owner):
+        self._shm = shm
+        self.size = size
+        self.owner = owner
+
+    @classmethod
+    def create(cls, size):
+        return cls(shared_memory.SharedMemory(create=True, size=max(size, 1)), size, True)
+
+    @classmethod
+    def from_bytes(cls, data):
+        view = memoryview(data).cast("B")
+        shared = cls.create(view.nbytes)
+        shared._shm.buf[:view.nbytes] = view
+        return shared
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def buf(self):
+        return self._shm.buf[:self.size]
+
+    def tobytes(self):
+        return bytes(self._shm.buf[:self.size])
+
+    def close(self):
+        """Detach from the block; views still held on it keep it mapped until they go."""
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    def release(self):
+        """Detach and, in the creating process, free the block."""
+        self.close()
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.owner = False
+
+    def __reduce__(self):
+        return _attach, (self.name, self.size)
+
+
+def _attach(name, size):
+    return SharedBuffer(shared_memory.SharedMemory(name=name), size, False)
+
+
+def _load_local(plugin_path, module_name, module_file):
+    mtime = os.stat(module_file).st_mtime_ns
+    cached = _local_modules.get(module_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    plugin = re.sub(r"\W", "_", os.path.basename(os.path.normpath(plugin_path)))
+    private_name = f"_plugin_{plugin}__{module_name.replace('.', '__')}"
+    spec = importlib.util.spec_from_file_location(private_name, module_file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[private_name] = module  # classes defined in it must be findable by name
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(private_name, None)
+        raise
+    _local_modules[module_file] = (mtime, module)
+    return module
+
+
+def resolve_target(plugin_path, target):
+    """Return the callable named by ``"module:function"``, preferring a module file in ``plugin_path``."""
+    module_name, _, attr = target.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Callable path must look like 'module:function', got {target!r}")
+    module_file = os.path.join(plugin_path, *module_name.split(".")) + ".py" if plugin_path else None
+    if module_file and os.path.isfile(module_file):
+        obj = _load_local(plugin_path, module_name, module_file)
+    else:
+        obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    if not callable(obj):
+        raise TypeError(f"{target} is not callable")
+    return obj
+
+
+def run_target(plugin_path, target, paths, args, kwargs):
+    """Entry point of a job in a worker: call ``target`` with the plugin's dependency paths importable."""
+    added = [path for path in paths if path not in sys.path]
+    sys.path[:0] = added
+    try:
+        return resolve_target(plugin_path, target)(*args, **kwargs)
+    finally:
+        for path in added:
+            if path in sys.path:
+                sys.path.remove(path)
+        for value in (*args, *kwargs.values()):
+            if isinstance(value, SharedBuffer):
+                value.close()
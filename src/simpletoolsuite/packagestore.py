@@ -0,0 +1,195 @@
+"""Content-addressed store that deduplicates files across plugin .venv directories.
+
+Every sufficiently large regular file in a plugin's ``.venv`` is hashed and
+hardlinked to ``objects/<aa>/<sha256>-<mode>`` in the store; a file whose
+object already exists is replaced by a link to it, so identical packages
+bundled by several plugins share one copy on disk. Reference counting is the
+filesystem's own link count: an object with no links besides the store's is
+garbage and ``collect_garbage`` removes it.
+
+Hardlinks only work within one filesystem. When a plugin folder lives on a
+different one than the store its files are left as they are.
+
+A linked file *is* the store object, so writing to it in place would change
+it for every plugin that shares it. Tools that replace files (pip removes and
+rewrites what it upgrades) break the link and are safe. To make an in-place
+write fail loudly instead, objects are made read-only on POSIX systems, where
+deleting or replacing a file does not need write permission on the file
+itself; on Windows that would stop plugin folders from being deleted, so
+objects stay writable there.
+"""
+import errno
+import hashlib
+import logging
+import os
+import stat
+import threading
+
+from .config import get_default_config_path
+from .dependencies import VENV_DIR_NAME
+
+STORE_DIR_NAME = "PackageStore"
+OBJECTS_DIR_NAME = "objects"
+MIN_LINK_SIZE = 4096  # smaller files are not worth a lookup and a link
+HASH_CHUNK_SIZE = 1024 * 1024
+READ_ONLY_OBJECTS = os.name == "posix"
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+log = logging.getLogger(__name__)
+
+
+def get_default_store_path():
+    """The shared store, beside the default plugin directory so both are on the same filesystem."""
+    _, plugin_base_dir = get_default_config_path()
+    return os.path.join(os.path.dirname(plugin_base_dir), STORE_DIR_NAME)
+
+
+def _make_read_only(path, st):
+    if READ_ONLY_OBJECTS and st.st_mode & WRITE_BITS:
+        os.chmod(path, stat.S_IMODE(st.st_mode) & ~WRITE_BITS)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StoreReport:
+    """Store usage: how many objects, how many venv files link to them and the bytes that saves."""
+
+    def __init__(self):
+        self.objects = 0
+        self.store_bytes = 0  # one copy of every object
+        self.linked_files = 0  # venv files that are links to an object
+        self.linked_bytes = 0  # what those files would take as separate copies
+        self.bytes_saved = 0  # every copy beyond the first of each object in use
+
+    def as_dict(self):
+        return {"objects": self.objects, "store_bytes": self.store_bytes, "linked_files": self.linked_files,
+                "linked_bytes": self.linked_bytes, "bytes_saved": self.bytes_saved}
+
+    def summary(self):
+        return (f"{self.objects} stored files ({self.store_bytes} bytes) linked from {self.linked_files} plugin files, "
+                f"{self.bytes_saved} bytes saved")
+
+
+class PackageStore:
+    """Hardlink-based deduplication of plugin .venv files, keyed by content hash and file mode."""
+
+    def __init__(self, root=None, min_size=MIN_LINK_SIZE):
+        self.root = root or get_default_store_path()
+        self.objects_dir = os.path.join(self.root, OBJECTS_DIR_NAME)
+        self.min_size = min_size
+        self._lock = threading.Lock()
+
+    def object_path(self, digest, mode):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}-{stat.S_IMODE(mode):o}")
+
+    def _objects(self):
+        """Yield (path, lstat) for every object in the store."""
+        try:
+            buckets = list(os.scandir(self.objects_dir))
+        except FileNotFoundError:
+            return
+        for bucket in buckets:
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(bucket.path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                        yield entry.path, entry.stat(follow_symlinks=False)
+
+    def _same_filesystem(self, path):
+        try:
+            return os.stat(path).st_dev == os.stat(self.root).st_dev
+        except OSError:
+            return False
+
+    def link_venv(self, plugin_path):
+        """Deduplicate a plugin's .venv against the store. Returns the number of files newly linked."""
+        venv = os.path.join(plugin_path, VENV_DIR_NAME)
+        if not os.path.isdir(venv):
+            return 0
+        os.makedirs(self.objects_dir, exist_ok=True)
+        if not self._same_filesystem(venv):
+            log.info("Not sharing packages of %s: it is on a different filesystem than %s", plugin_path, self.root)
+            return 0
+        with self._lock:
+            known = {(st.st_dev, st.st_ino) for _, st in self._objects()}
+            linked = 0
+            for dirpath, _, filenames in os.walk(venv):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        if self._link_file(path, known):
+                            linked += 1
+                    except OSError as e:
+                        if e.errno == errno.EXDEV:
+                            return linked
+                        log.warning("Could not share %s: %s", path, e)
+        if linked:
+            log.info("Shared %d package files of %s", linked, os.path.basename(plugin_path))
+        return linked
+
+    def _link_file(self, path, known):
+        """Point ``path`` at the store object for its contents. Returns True if it was linked or adopted."""
+        st = os.lstat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_size < self.min_size or (st.st_dev, st.st_ino) in known:
+            return False
+        target = self.object_path(_file_digest(path), st.st_mode)
+        try:
+            object_st = os.lstat(target)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.link(path, target)  # adopt this copy as the shared one
+            _make_read_only(target, st)
+            known.add((st.st_dev, st.st_ino))
+            return True
+        if object_st.st_size != st.st_size:
+            log.warning("Store object %s does not match its name; leaving %s alone", target, path)
+            return False
+        _make_read_only(target, object_st)  # objects stored before they were made read-only
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.link")
+        os.link(target, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+
+    def link_all(self, plugin_dir):
+        """Deduplicate the .venv of every plugin folder in ``plugin_dir``. Returns the files newly linked."""
+        linked = 0
+        with os.scandir(plugin_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                    linked += self.link_venv(entry.path)
+        return linked
+
+    def collect_garbage(self):
+        """Remove objects that no plugin links to any more. Returns how many were removed."""
+        removed = 0
+        with self._lock:
+            for path, st in self._objects():
+                if st.st_nlink <= 1:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except OSError as e:
+                        log.warning("Could not remove unused store object %s: %s", path, e)
+        if removed:
+            log.info("Removed %d unused package store objects", removed)
+        return removed
+
+    def report(self):
+        """Measure the store: objects, their size and the bytes saved by sharing them."""
+        report = StoreReport()
+        with self._lock:
+            for _, st in self._objects():
+                users = st.st_nlink - 1
+                report.objects += 1
+                report.store_bytes += st.st_size
+                report.linked_files += users
+                report.linked_bytes += st.st_size * users
+                report.bytes_saved += st.st_size * max(users - 1, 0)
+        return report
@@ -1,113 +1,560 @@
+import concurrent.futures
+import gc
+import importlib.machinery
 import os
 import json
-import requests
+import logging
+import shutil
 import sys
+import threading
+import time
+from urllib.parse import quote
+
+from .dependencies import DependencyResolver
+from .downloader import DownloadError, DownloadReport, PluginDownloader
+from .memory import PluginMemoryTracker
+from .packagestore import PackageStore
+from .tracing import span, tracer
+
+INDEX_FILE_NAME = ".plugin_index.json"
+INDEX_VERSION = 1
+
+log = logging.getLogger(__name__)
+
+
+def _is_extension_module(module):
+    module_file = getattr(module, "__file__", None) or ""
+    return module_file.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+
+
+def _threads_running_from(root):
+    """Names of live threads whose run function is defined in a file under ``root``."""
+    names = []
+    for thread in threading.enumerate():
+        target = getattr(thread, "_target", None) or type(thread).run
+        code = getattr(getattr(target, "__func__", target), "__code__", None)
+        if code is not None and os.path.abspath(code.co_filename).startswith(root):
+            names.append(thread.name)
+    return names
+
+
+def _stat_stamp(path):
+    """Return an (mtime_ns, size) stamp for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
 
 class PluginManager:
-    def __init__(self, plugin_dir):
+    def __init__(self, plugin_dir, store_dir=None, compute=None):
         self.plugin_dir = plugin_dir
+        # Metadata index: folder name -> {"stamp": [mtime_ns, size] | None, "plugin": dict | None}
+        self._index = {}
+        self._by_name = {}
+        self._index_dir = None
+        self._dir_stamp = None
+        self._index_lock = threading.RLock()
+        self.downloader = PluginDownloader()
+        self.last_download_report = None
+        # Loaded plugin modules: module path -> (source signature, module)
+        self._modules = {}
+        self._load_lock = threading.RLock()  # serializes changes to the registry, sys.modules and sys.path
+        self.module_cache_stats = {"hits": 0, "misses": 0}
+        self.dependencies = DependencyResolver()
+        self.package_store = PackageStore(store_dir)
+        self.memory = PluginMemoryTracker()
+        self.compute = compute  # ComputePool handed to plugins as ``module.compute``, if any
 
-    def discover_plugins(self):
-        """Discover available plugins within the designated plugin directory."""
-        plugins = []
-        if not os.path.exists(self.plugin_dir):
-            os.makedirs(self.plugin_dir)
-
-        for folder in os.listdir(self.plugin_dir):
-            plugin_path = os.path.join(self.plugin_dir, folder)
-            if os.path.isdir(plugin_path):
-                metadata_path = os.path.join(plugin_path, "metadata.json")
-                if os.path.exists(metadata_path):
-                    try:
-                        with open(metadata_path, "r") as meta_file:
-                            metadata = json.load(meta_file)
-                            plugins.append({
-                                "name": metadata.get("name", folder),
-                                "author": metadata.get("author", "Unknown"),
-                                "path": plugin_path,
-                                "main": metadata.get("main", "main.py"),
-                                "version": metadata.get("version", "N/A"),
-                                "description": metadata.get("description", "No description available."),
-                            })
-                    except json.JSONDecodeError:
-                        print(f"Invalid JSON in metadata.json for {folder}")
-        return plugins
-
-    def load_plugin(self, plugin_path, main_file):
-        """Load the main module of a plugin."""
+    def _index_path(self):
+        return os.path.join(self.plugin_dir, INDEX_FILE_NAME)
+
+    def _load_index(self):
+        """Load the persisted metadata index for the current plugin directory."""
+        self._index = {}
+        self._by_name = {}
+        self._dir_stamp = None
+        self._index_dir = self.plugin_dir
         try:
-            # Activate the plugin's virtual environment before loading
-            self.load_plugin_dependencies(plugin_path)
+            with open(self._index_path(), "r") as index_file:
+                data = json.load(index_file)
+            if data.get("version") == INDEX_VERSION:
+                self._index = data.get("entries", {})
+                self._dir_stamp = data.get("dir_stamp")
+        except (OSError, ValueError, AttributeError):
+            pass
+        # Paths are not stored: the index moves with the plugin directory.
+        for folder, entry in self._index.items():
+            if entry.get("plugin"):
+                entry["plugin"]["path"] = os.path.join(self.plugin_dir, folder)
+        self._rebuild_name_map()
 
-            main_module = os.path.splitext(main_file)[0]
-            module_path = os.path.join(plugin_path, main_file)
-            print(f"Attempting to load module: {module_path}")
-
-            if os.path.exists(module_path):
-                import importlib.util
-                spec = importlib.util.spec_from_file_location(main_module, module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                print(f"Module loaded: {module}")
-                return module
+    def _save_index(self):
+        """Persist the metadata index, ignoring failures on read-only locations."""
+        entries = {folder: {"stamp": entry["stamp"], "plugin": entry["plugin"] and
+                            {key: value for key, value in entry["plugin"].items() if key != "path"}}
+                   for folder, entry in self._index.items()}
+        data = {"version": INDEX_VERSION, "dir_stamp": self._dir_stamp, "entries": entries}
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, "w") as index_file:
+                json.dump(data, index_file)
+            os.replace(tmp_path, self._index_path())
+        except OSError as e:
+            log.warning("Could not save plugin index: %s", e)
+
+    def _rebuild_name_map(self):
+        self._by_name = {}
+        for folder in sorted(self._index):
+            plugin = self._index[folder].get("plugin")
+            if plugin:
+                self._by_name.setdefault(plugin["name"], folder)
+
+    def _read_metadata(self, folder):
+        """Parse a plugin folder's metadata.json into a plugin entry."""
+        plugin_path = os.path.join(self.plugin_dir, folder)
+        metadata_path = os.path.join(plugin_path, "metadata.json")
+        try:
+            with open(metadata_path, "r") as meta_file:
+                metadata = json.load(meta_file)
+        except json.JSONDecodeError:
+            log.warning("Invalid JSON in metadata.json for %s", folder)
+            return None
+        except OSError:
+            return None
+        if not isinstance(metadata, dict):
+            log.warning("Invalid metadata.json for %s", folder)
+            return None
+        return {
+            "name": metadata.get("name", folder),
+            "author": metadata.get("author", "Unknown"),
+            "path": plugin_path,
+            "main": metadata.get("main", "main.py"),
+            "version": metadata.get("version", "N/A"),
+            "description": metadata.get("description", "No description available."),
+            "metadata": metadata,
+        }
+
+    def _revalidate(self, folder):
+        """Re-stat a folder's metadata.json and re-parse it only if it changed. Returns True on change."""
+        metadata_path = os.path.join(self.plugin_dir, folder, "metadata.json")
+        stamp = _stat_stamp(metadata_path)
+        entry = self._index.get(folder)
+        if entry is not None and entry.get("stamp") == stamp:
+            return False
+        plugin = self._read_metadata(folder) if stamp is not None else None
+        self._index[folder] = {"stamp": stamp, "plugin": plugin}
+        return True
+
+    def discover_plugins(self):
+        """Discover available plugins within the designated plugin directory.
+
+        Results come from an on-disk index that is revalidated with stat calls only;
+        a metadata.json is re-parsed only when its mtime or size changes, and the
+        directory is only re-listed when its own mtime changes.
+        """
+        with span("discover_plugins", "plugins") as discover_span, self._index_lock:
+            if not os.path.exists(self.plugin_dir):
+                os.makedirs(self.plugin_dir)
+            if self._index_dir != self.plugin_dir:
+                self._load_index()
+
+            changed = False
+            dir_stamp = _stat_stamp(self.plugin_dir)
+            if dir_stamp != self._dir_stamp:
+                folders = set()
+                with os.scandir(self.plugin_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and not entry.name.startswith("."):
+                            folders.add(entry.name)
+                for folder in set(self._index) - folders:
+                    del self._index[folder]
+                    changed = True
+                self._dir_stamp = dir_stamp
             else:
-                print(f"Main file not found at: {module_path}")
-        except Exception as e:
-            print(f"Failed to load plugin: {e}")
-        return None
+                folders = set(self._index)
 
-    def load_plugin_dependencies(self, plugin_path):
+            for folder in folders:
+                if self._revalidate(folder):
+                    changed = True
+
+            if changed:
+                # Keep the stamp taken before listing. Replacing the index file bumps the directory's mtime, so the
+                # next call lists it once more, rather than a plugin added meanwhile hiding behind the new stamp.
+                self._rebuild_name_map()
+                self._save_index()
+
+            plugins = [self._index[folder]["plugin"] for folder in sorted(self._index)
+                       if self._index[folder].get("plugin")]
+            discover_span.set(plugins=len(plugins), changed=changed)
+            return plugins
+
+    def get_plugin(self, name):
+        """Return the installed plugin entry with the given name, or None.
+
+        Lookup is a dictionary hit on the metadata index followed by a single stat
+        of the plugin's metadata.json; a full discovery only runs on a miss.
         """
-        Activates the virtual environment for the specified plugin and ensures its site-packages is added to sys.path.
+        with self._index_lock:
+            if self._index_dir != self.plugin_dir or not self._index:
+                self.discover_plugins()
+            folder = self._by_name.get(name)
+            if folder is not None:
+                if self._revalidate(folder):
+                    self._rebuild_name_map()
+                    self._save_index()
+                plugin = self._index.get(folder, {}).get("plugin")
+                if plugin and plugin["name"] == name:
+                    return plugin
+            self.discover_plugins()
+            folder = self._by_name.get(name)
+            return self._index[folder]["plugin"] if folder is not None else None
+
+    def performance_report(self):
+        """One row per plugin for the Performance view, merging every metric by plugin folder name.
+
+        Each row is {"folder", "name", "load", "launch", "imports", "memory"}:
+        the display name (the folder name once the plugin is gone), the
+        tracer's load and launch summaries, the last recorded import cost and
+        the memory record. Missing values are None.
+        """
+        names = {os.path.basename(plugin["path"]): plugin["name"] for plugin in self.discover_plugins()}
+        loads = tracer.summary("load")
+        launches = tracer.summary("launch")
+        imports = {os.path.basename(os.path.normpath(path)): cost
+                   for path, cost in self.dependencies.import_cost_report()}
+        memory = self.memory.summary()
+        folders = set(loads) | set(launches) | set(imports) | set(memory)
+        return [{"folder": folder, "name": names.get(folder, folder), "load": loads.get(folder),
+                 "launch": launches.get(folder), "imports": imports.get(folder), "memory": memory.get(folder)}
+                for folder in sorted(folders, key=lambda folder: (names.get(folder, folder).lower(), folder))]
+
+    def _source_signature(self, plugin_path):
+        """Stamp every Python source in a plugin (outside its .venv) so edits can be detected."""
+        stamps = []
+        for dirpath, dirnames, filenames in os.walk(plugin_path):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    path = os.path.join(dirpath, filename)
+                    stamp = _stat_stamp(path)
+                    if stamp is not None:
+                        stamps.append((os.path.relpath(path, plugin_path), *stamp))
+        return tuple(sorted(stamps))
+
+    def _purge_plugin_modules(self, plugin_path, dependency_paths=()):
+        """Drop a plugin's own helper modules from sys.modules so a reload re-imports them.
+
+        Modules imported from ``dependency_paths`` are dropped too, except whole
+        top-level packages that contain an extension module: those cannot be
+        imported a second time in one process. Returns the number dropped.
         """
-        venv_path = os.path.join(plugin_path, ".venv", "bin", "activate_this.py")
-        venv_lib_site_packages = os.path.join(plugin_path, ".venv", "lib", "python3.12", "site-packages")
-        venv_lib64_site_packages = os.path.join(plugin_path, ".venv", "lib64", "python3.12", "site-packages")
+        plugin_root = os.path.join(os.path.abspath(plugin_path), "")
+        venv_root = os.path.join(plugin_root, ".venv", "")
+        dependency_roots = tuple(os.path.join(os.path.abspath(path), "") for path in dependency_paths)
+        doomed = []
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None)
+            if module_file:
+                module_file = os.path.abspath(module_file)
+                if module_file.startswith(plugin_root) and not module_file.startswith(venv_root):
+                    doomed.append(name)
+                elif dependency_roots and module_file.startswith(dependency_roots):
+                    doomed.append(name)
+        pinned = {name.split(".", 1)[0] for name in doomed if _is_extension_module(sys.modules[name])}
+        purged = 0
+        for name in doomed:
+            if name.split(".", 1)[0] not in pinned:
+                del sys.modules[name]
+                purged += 1
+        if pinned:
+            log.debug("Keeping packages with extension modules loaded: %s", ", ".join(sorted(pinned)))
+        return purged
+
+    def prepare_plugin(self, plugin_path, main_file):
+        """Do the blocking file work of loading a plugin; safe to run off the GUI thread.
+
+        Stamps the plugin's sources, resolves its dependency paths into the
+        resolver's cache and, unless the loaded module is still current, reads
+        and compiles the main module. Nothing is executed and sys.path and
+        sys.modules are left alone. Pass the result to ``load_plugin``.
+        """
+        plugin_name = os.path.basename(plugin_path)
+        with span("prepare_plugin", "plugins", plugin=plugin_name):
+            signature = self._source_signature(plugin_path)
+            self.dependencies.site_packages(plugin_path)
+            module_path = os.path.join(plugin_path, main_file)
+            with self._load_lock:
+                cached = self._modules.get(module_path)
+            code = None
+            if (cached is None or cached[0] != signature) and os.path.exists(module_path):
+                loader = importlib.machinery.SourceFileLoader(os.path.splitext(main_file)[0], module_path)
+                code = loader.get_code(loader.name)
+            return signature, code
 
-        if os.path.exists(venv_path):
+    def load_plugin(self, plugin_path, main_file, prepared=None):
+        """Load the main module of a plugin.
+
+        Loaded modules are kept in a registry keyed by path; a relaunch returns
+        the cached module unless one of the plugin's sources has changed since,
+        in which case it is executed again. Hits and misses are counted in
+        ``module_cache_stats``. With a compute pool, the module gets a
+        ``compute`` executor bound to the plugin before it runs.
+
+        The module runs on the calling thread, which in the app must be the
+        GUI thread: plugins may create QObjects when imported. ``prepared`` is
+        what ``prepare_plugin`` returned on a worker thread, if it was called.
+        """
+        plugin_name = os.path.basename(plugin_path)
+        signature, code = prepared if prepared is not None else (None, None)
+        with span("load_plugin", "plugins", metric=("load", plugin_name), plugin=plugin_name) as load_span, \
+                self._load_lock:
             try:
-                print(f"Activating virtual environment: {venv_path}")
-                exec(open(venv_path).read(), {'__file__': venv_path})
-                print(f"Virtual environment activated for plugin: {plugin_path}")
-
-                # Add lib/site-packages to sys.path if it exists and is not already present
-                if os.path.exists(venv_lib_site_packages) and venv_lib_site_packages not in sys.path:
-                    print(f"Adding lib site-packages to sys.path: {venv_lib_site_packages}")
-                    sys.path.insert(0, venv_lib_site_packages)
-
-                # Add lib64/site-packages to sys.path if it exists and is not already present
-                if os.path.exists(venv_lib64_site_packages) and venv_lib64_site_packages not in sys.path:
-                    print(f"Adding lib64 site-packages to sys.path: {venv_lib64_site_packages}")
-                    sys.path.insert(0, venv_lib64_site_packages)
-
-            except Exception as e:
-                print(f"Failed to activate virtual environment for plugin: {plugin_path}. Error: {e}")
-        else:
-            print(f"Virtual environment not found at: {venv_path}")
+                main_module = os.path.splitext(main_file)[0]
+                module_path = os.path.join(plugin_path, main_file)
+
+                if signature is None:
+                    signature = self._source_signature(plugin_path)
+                cached = self._modules.get(module_path)
+                if cached is not None and cached[0] == signature:
+                    self.module_cache_stats["hits"] += 1
+                    load_span.set(cached=True)
+                    return cached[1]
+                self.module_cache_stats["misses"] += 1
+
+                # Activate the plugin's virtual environment before loading
+                self.load_plugin_dependencies(plugin_path)
+                log.debug("Loading module: %s", module_path)
+
+                if os.path.exists(module_path):
+                    import importlib.util
+                    if cached is not None:
+                        log.info("Plugin sources changed, reloading: %s", module_path)
+                        self._purge_plugin_modules(plugin_path)
+                    spec = importlib.util.spec_from_file_location(main_module, module_path)
+                    module = importlib.util.module_from_spec(spec)
+                    if self.compute is not None:
+                        module.compute = self.compute.executor(plugin_path, self.dependencies.site_packages(plugin_path))
+                    modules_before = len(sys.modules)
+                    with span("exec_module", "plugins", plugin=plugin_name) as exec_span:
+                        start = time.perf_counter()
+                        if code is None:
+                            code = spec.loader.get_code(main_module)
+                        exec(code, module.__dict__)
+                        elapsed = time.perf_counter() - start
+                        new_modules = len(sys.modules) - modules_before
+                        exec_span.set(new_modules=new_modules)
+                    self.dependencies.record_import_cost(plugin_path, elapsed, new_modules)
+                    self._modules[module_path] = (signature, module)
+                    log.info("Loaded plugin %s in %.1f ms (%d new modules imported)",
+                             plugin_name, elapsed * 1000, new_modules)
+                    return module
+                self._modules.pop(module_path, None)
+                log.error("Main file not found at: %s", module_path)
+            except Exception:
+                log.exception("Failed to load plugin %s", plugin_name)
+        return None
+
+    def unload_plugin(self, plugin_path):
+        """Release everything a loaded plugin holds once its UI is gone.
+
+        Calls the main module's optional ``shutdown()`` hook, cancels its queued
+        compute jobs, drops the module from the registry, removes the plugin's
+        sys.path entries that no other plugin uses and the modules imported from
+        them and from the plugin itself, then collects garbage. Returns a dict with the number of
+        modules dropped, the paths released, any threads the plugin left
+        running and the bytes still attributed to it (None unless memory
+        tracking is on).
+        """
+        plugin_root = os.path.join(os.path.abspath(plugin_path), "")
+        plugin_name = os.path.basename(os.path.normpath(plugin_path))
+        with span("unload_plugin", "plugins", plugin=plugin_name) as unload_span, self._load_lock:
+            for module_path in [path for path in self._modules if os.path.abspath(path).startswith(plugin_root)]:
+                module = self._modules.pop(module_path)[1]
+                shutdown = getattr(module, "shutdown", None)
+                if callable(shutdown):
+                    try:
+                        shutdown()
+                    except Exception:
+                        log.exception("Plugin %s failed to shut down cleanly", plugin_name)
+            if self.compute is not None:
+                self.compute.cancel(plugin_path)
+            released = self.dependencies.deactivate(plugin_path)
+            purged = self._purge_plugin_modules(plugin_path, released)
+            module = shutdown = None  # drop the last local references before collecting
+            gc.collect()
+            threads = _threads_running_from(plugin_root)
+            if threads:
+                log.warning("Plugin %s left %d thread(s) running: %s", plugin_name, len(threads), ", ".join(threads))
+            retained = self.memory.record_unload(plugin_path)
+            unload_span.set(modules=purged, paths=len(released), threads=len(threads), retained=retained)
+        (log.info if purged or released else log.debug)("Unloaded plugin %s (%d modules, %d paths released)",
+                                                         plugin_name, purged, len(released))
+        return {"modules": purged, "paths": released, "threads": threads, "retained": retained}
+
+    def load_plugin_dependencies(self, plugin_path):
+        """
+        Adds the site-packages of the plugin's virtual environment to sys.path.
 
+        Paths are resolved for the running interpreter and cached by the
+        DependencyResolver; no activation script is executed, and entries are
+        deduplicated and removable with ``unload_plugin_dependencies``.
+        """
+        paths = self.dependencies.activate(plugin_path)
+        if paths:
+            log.debug("Dependency paths for plugin %s: %s", plugin_path, paths)
+        else:
+            log.debug("Virtual environment not found for plugin: %s", plugin_path)
+        return paths
 
+    def unload_plugin_dependencies(self, plugin_path):
+        """Remove the sys.path entries added for a plugin."""
+        return self.dependencies.deactivate(plugin_path)
 
+    def _download_files(self, repo_url, plugin_name):
+        plugin_url = f"{repo_url}/{quote(plugin_name)}"
+        plugin_dir = os.path.join(self.plugin_dir, plugin_name)
+        with span("download_plugin", "download", plugin=plugin_name) as download_span:
+            report = self.downloader.download(plugin_url, plugin_dir, plugin_name)
+            download_span.set(ok=report.ok, files=len(report.files), bytes=report.bytes_transferred)
+        if report.ok:
+            log.info("Plugin '%s' downloaded successfully.", plugin_name)
+            return report
+        for file_report in report.failed_files():
+            log.error("Failed to download %s: %s", file_report["path"], file_report["error"])
+        log.error("Error downloading plugin '%s': %s", plugin_name, report.error or "file checks failed")
+        return report
 
     def download_plugin(self, repo_url, plugin_name):
-        """Download a plugin from a given repository URL."""
-        plugin_url = f"{repo_url}/{plugin_name}"
-        try:
-            response = requests.get(plugin_url)
-            if response.status_code == 200:
-                plugin_dir = os.path.join(self.plugin_dir, plugin_name)
-                os.makedirs(plugin_dir, exist_ok=True)
-                for entry in response.json():
-                    if entry["type"] == "file":
-                        file_url = entry["download_url"]
-                        file_response = requests.get(file_url)
-                        if file_response.status_code == 200:
-                            file_path = os.path.join(plugin_dir, entry["name"])
-                            with open(file_path, "wb") as file:
-                                file.write(file_response.content)
-                print(f"Plugin '{plugin_name}' downloaded successfully.")
-                return True
+        """Download a plugin from a given repository URL.
+
+        Files are streamed in parallel into a staging directory, verified against
+        the listing's sizes and hashes, and atomically renamed into place. The
+        full DownloadReport is kept in ``last_download_report``.
+        """
+        report = self._download_files(repo_url, plugin_name)
+        self.last_download_report = report
+        return report.ok
+
+    def fetch_plugin(self, repo_url, plugin_name, metadata=None):
+        """Install a plugin, preferring the single archive published in its catalog metadata.
+
+        If ``metadata`` has an ``"archive": {"url": ..., "sha256": ...}`` entry the
+        plugin is fetched and extracted in one request. An archive without a
+        checksum is not used, since nothing would verify it; then, or if the
+        archive install fails, it falls back to the verified per-file download. Files of a bundled .venv are
+        then shared through the package store. Returns the DownloadReport.
+        """
+        report = self._fetch_plugin(repo_url, plugin_name, metadata)
+        if report.ok:
+            self.share_packages(os.path.join(self.plugin_dir, plugin_name))
+        return report
+
+    def _fetch_plugin(self, repo_url, plugin_name, metadata):
+        archive = (metadata or {}).get("archive")
+        if isinstance(archive, dict) and archive.get("url") and not archive.get("sha256"):
+            log.info("Archive for '%s' has no checksum; downloading its files individually.", plugin_name)
+        elif isinstance(archive, dict) and archive.get("url"):
+            plugin_dir = os.path.join(self.plugin_dir, plugin_name)
+            with span("download_archive", "download", plugin=plugin_name) as archive_span:
+                report = self.downloader.download_archive(archive["url"], plugin_dir, archive["sha256"], plugin_name)
+                archive_span.set(ok=report.ok, bytes=report.bytes_transferred)
+            if report.ok:
+                log.info("Plugin '%s' installed from archive.", plugin_name)
+                return report
+            log.warning("Archive install failed for '%s' (%s), falling back to per-file download.",
+                        plugin_name, report.error)
+        return self._download_files(repo_url, plugin_name)
+
+    def install_plugin(self, repo_url, plugin_name, metadata=None):
+        """Install a plugin via ``fetch_plugin``; returns True on success and keeps the report in ``last_download_report``."""
+        report = self.fetch_plugin(repo_url, plugin_name, metadata)
+        self.last_download_report = report
+        return report.ok
+
+    def plan_update(self, repo_url, plugin_name):
+        """Compare an installed plugin (by folder name) with its remote listing. Returns an UpdatePlan."""
+        return self.downloader.plan_update(f"{repo_url}/{quote(plugin_name)}",
+                                           os.path.join(self.plugin_dir, plugin_name), plugin_name)
+
+    def check_updates(self, repo_url, names=None):
+        """Plan updates for installed plugins concurrently.
+
+        ``names`` are folder names and default to every installed plugin.
+        Returns {name: UpdatePlan, or an error message if the listing failed}.
+        """
+        if names is None:
+            names = [os.path.basename(plugin["path"]) for plugin in self.discover_plugins()]
+
+        def plan(name):
+            try:
+                return self.plan_update(repo_url, name)
+            except (DownloadError, OSError) as e:
+                return str(e)
+
+        with span("check_updates", "download", plugins=len(names)):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.downloader.max_workers) as executor:
+                return dict(zip(names, executor.map(plan, names)))
+
+    def update_plugin(self, repo_url, plugin_name, plan=None):
+        """Bring an installed plugin up to date, downloading only files whose blob SHA changed.
+
+        ``plan`` is an UpdatePlan from ``plan_update``/``check_updates``; one is
+        made if it is not given. Returns the DownloadReport, also kept in
+        ``last_download_report``.
+        """
+        plugin_path = os.path.join(self.plugin_dir, plugin_name)
+        with span("update_plugin", "download", plugin=plugin_name) as update_span:
+            try:
+                plan = plan or self.plan_update(repo_url, plugin_name)
+            except (DownloadError, OSError) as e:
+                report = DownloadReport(plugin_name, "update")
+                report.error = str(e)
             else:
-                print(f"Failed to download plugin: {response.status_code}")
-        except Exception as e:
-            print(f"Error downloading plugin '{plugin_name}': {e}")
-        return False
+                report = self.downloader.update(plan, plugin_path)
+            update_span.set(ok=report.ok, files=len(report.files), bytes=report.bytes_transferred)
+        if report.ok and report.files:
+            self.share_packages(plugin_path)
+            log.info("Plugin '%s' updated: %d file(s), %d bytes.", plugin_name, len(report.files),
+                     report.bytes_transferred)
+        elif not report.ok:
+            log.error("Error updating plugin '%s': %s", plugin_name, report.error or "file checks failed")
+        self.last_download_report = report
+        return report
+
+    def update_plugins(self, repo_url, plans, max_workers=None):
+        """Apply several UpdatePlans concurrently. Returns {name: DownloadReport}."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or self.downloader.max_workers) as executor:
+            reports = executor.map(lambda plan: self.update_plugin(repo_url, plan.plugin_name, plan), plans)
+            results = {plan.plugin_name: report for plan, report in zip(plans, reports)}
+        self.discover_plugins()
+        return results
+
+    def share_packages(self, plugin_path):
+        """Hardlink a plugin's .venv files to identical ones in the shared package store."""
+        with span("share_packages", "plugins", plugin=os.path.basename(plugin_path)) as share_span:
+            try:
+                linked = self.package_store.link_venv(plugin_path)
+            except OSError as e:
+                log.warning("Could not share packages of %s: %s", plugin_path, e)
+                linked = 0
+            share_span.set(linked=linked)
+        return linked
+
+    def remove_plugin(self, plugin_name):
+        """Delete an installed plugin, looked up by name or folder. Returns True if it was removed."""
+        plugin = self.get_plugin(plugin_name)
+        plugin_path = plugin["path"] if plugin else os.path.join(self.plugin_dir, plugin_name)
+        if not os.path.isdir(plugin_path) or os.path.dirname(os.path.abspath(plugin_path)) != os.path.abspath(self.plugin_dir):
+            return False
+        self.unload_plugin(plugin_path)
+        # Rename first so a half-deleted folder is never mistaken for a plugin.
+        doomed = os.path.join(self.plugin_dir, f".removing-{os.path.basename(plugin_path)}")
+        shutil.rmtree(doomed, ignore_errors=True)
+        os.rename(plugin_path, doomed)
+        shutil.rmtree(doomed, ignore_errors=True)
+        self.package_store.collect_garbage()
+        self.discover_plugins()
+        log.info("Plugin '%s' removed.", plugin_name)
+        return True
@@ -0,0 +1,169 @@
+import gc
+import logging
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+from .tracing import span
+
+DEFAULT_SUSPEND_AFTER = 600  # seconds a plugin tab may stay hidden before it is suspended
+
+log = logging.getLogger(__name__)
+
+
+class PluginTab:
+    """Bookkeeping for one plugin tab: the module, its scroll area and the live (or suspended) widget."""
+
+    def __init__(self, name, module, scroll_area, folder=None):
+        self.name = name
+        self.folder = folder or name  # the plugin's folder name, which keys its performance metrics
+        self.module = module
+        self.scroll_area = scroll_area
+        self.content = None  # container widget handed to module.main(), None until built or while suspended
+        self.widget = None  # what module.main() returned, or the container itself
+        self.state = None
+        self.hidden_since = None
+
+    @property
+    def built(self):
+        return self.content is not None
+
+    @property
+    def suspendable(self):
+        """Only plugins that can hand their state back and take it again are suspended."""
+        return hasattr(self.module, "save_state") and hasattr(self.module, "restore_state")
+
+
+class PluginTabManager(QtCore.QObject):
+    """Gives every launched plugin its own tab in ``tab_widget``.
+
+    A plugin's widgets are built by ``module.main(parent)`` the first time its
+    tab is shown. If the module defines ``save_state(widget)`` and
+    ``restore_state(widget, state)``, a tab hidden for longer than
+    ``suspend_after`` seconds is suspended: the saved state is kept, the
+    widgets are destroyed, and on the next show the UI is rebuilt and handed
+    the state back. Tabs of other plugins are never suspended, so they keep
+    whatever the user had entered.
+    """
+
+    def __init__(self, tab_widget, suspend_after=DEFAULT_SUSPEND_AFTER, parent=None):
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self.suspend_after = suspend_after
+        self.tabs = {}  # scroll area -> PluginTab
+        self._current = None
+        self.tab_widget.currentChanged.connect(self._on_current_changed)
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.timeout.connect(self.suspend_idle_tabs)
+        if suspend_after:
+            self._idle_timer.start(int(max(1, min(suspend_after / 4, 60)) * 1000))
+
+    def find(self, name):
+        return next((tab for tab in self.tabs.values() if tab.name == name), None)
+
+    def tab_at(self, index):
+        return self.tabs.get(self.tab_widget.widget(index))
+
+    def open(self, name, module, folder=None):
+        """Show the tab for ``name``, creating it if this plugin has no tab yet. ``folder`` keys its launch metric."""
+        tab = self.find(name)
+        if tab is None or tab.module is not module:
+            if tab is not None:
+                self.close(self.tab_widget.indexOf(tab.scroll_area))
+            scroll_area = QtWidgets.QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            tab = PluginTab(name, module, scroll_area, folder)
+            self.tabs[scroll_area] = tab
+            self.tab_widget.addTab(scroll_area, name)
+        self.tab_widget.setCurrentWidget(tab.scroll_area)
+        self._ensure_built(tab)
+        return tab
+
+    def close(self, index):
+        """Tear down and remove the plugin tab at ``index``."""
+        tab = self.tab_at(index)
+        if tab is None:
+            return None
+        self._teardown(tab)
+        del self.tabs[tab.scroll_area]
+        if self._current is tab:
+            self._current = None
+        self.tab_widget.removeTab(index)
+        tab.scroll_area.deleteLater()
+        return tab
+
+    def _ensure_built(self, tab):
+        if tab.built:
+            return
+        content = QtWidgets.QWidget()
+        content.setLayout(QtWidgets.QVBoxLayout())
+        tab.scroll_area.setWidget(content)
+        tab.content = content
+
+        # Instantiate and place the plugin UI
+        with span("build_plugin_ui", "ui", metric=("launch", tab.folder), plugin=tab.name,
+                  restoring=tab.state is not None):
+            try:
+                widget = tab.module.main(content)
+            except Exception as e:
+                log.exception("Plugin %s failed to build its UI", tab.name)
+                widget = QtWidgets.QLabel(f"Plugin failed to start: {e}")
+        if isinstance(widget, QtWidgets.QWidget):
+            content.layout().addWidget(widget)
+        else:
+            widget = content
+        tab.widget = widget
+
+        if tab.state is not None and hasattr(tab.module, "restore_state"):
+            try:
+                tab.module.restore_state(widget, tab.state)
+            except Exception as e:
+                log.warning("Failed to restore state for plugin %s: %s", tab.name, e)
+        tab.state = None
+
+    def _teardown(self, tab):
+        if not tab.built:
+            return
+        taken = tab.scroll_area.takeWidget()
+        if taken is not None:
+            taken.deleteLater()
+        tab.content = None
+        tab.widget = None
+
+    def suspend(self, tab):
+        """Save the plugin's state and destroy its widgets. Does nothing for plugins without the state hooks."""
+        if not tab.built or not tab.suspendable:
+            return False
+        try:
+            tab.state = tab.module.save_state(tab.widget)
+        except Exception as e:
+            log.warning("Failed to save state for plugin %s: %s", tab.name, e)
+            return False
+        self._teardown(tab)
+        log.info("Suspended idle plugin tab: %s", tab.name)
+        return True
+
+    def suspend_idle_tabs(self):
+        """Suspend every built tab that has been hidden for longer than ``suspend_after``."""
+        if not self.suspend_after:
+            return
+        now = time.monotonic()
+        suspended = False
+        for tab in self.tabs.values():
+            if tab is not self._current and tab.built and tab.hidden_since is not None \
+                    and now - tab.hidden_since >= self.suspend_after:
+                suspended = self.suspend(tab) or suspended
+        if suspended:
+            # deleteLater()'d widgets go once control returns to the event loop;
+            # collect the Python side of any reference cycles they anchored afterwards.
+            QtCore.QTimer.singleShot(0, gc.collect)
+
+    def _on_current_changed(self, index):
+        if self._current is not None:
+            self._current.hidden_since = time.monotonic()
+        tab = self.tab_at(index)
+        self._current = tab
+        if tab is not None:
+            tab.hidden_since = None
+            self._ensure_built(tab)
@@ -0,0 +1,281 @@
+import concurrent.futures
+import errno
+import json
+import os
+import shutil
+import threading
+
+JOURNAL_NAME = ".relocation-journal.json"
+TEMP_PREFIX = ".relocating-"
+REMOVING_PREFIX = ".removing-"
+SKIPPED_PREFIXES = (".staging-", ".replaced-", REMOVING_PREFIX, TEMP_PREFIX)
+DEFAULT_MAX_WORKERS = 8
+
+PENDING, COPYING, COPIED, DONE = "pending", "copying", "copied", "done"
+
+
+class RelocationError(Exception):
+    """Raised when plugins cannot be relocated."""
+
+
+class RelocationCancelled(RelocationError):
+    """Raised when a relocation is cancelled between files; it can be resumed or rolled back."""
+
+
+def _clone_file(src, dst):
+    """Copy one file, sharing blocks (reflink) or linking when the filesystem allows it."""
+    try:
+        import fcntl
+        FICLONE = 0x40049409  # Linux ioctl: share extents between files on btrfs/xfs/etc.
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return "reflink"
+    except (ImportError, OSError):
+        pass
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    shutil.copy2(src, dst)  # uses copy_file_range/sendfile where available
+    return "copy"
+
+
+class PluginRelocator:
+    """Move every plugin folder from ``source_dir`` to ``dest_dir``.
+
+    On one filesystem each plugin is simply renamed. Across filesystems the
+    files of all plugins are copied in parallel (reflinked or hardlinked when
+    possible) into a temporary folder per plugin, which is renamed into place
+    once complete before the source is removed.
+
+    Progress is written to a journal in ``source_dir`` after every step, so an
+    interrupted relocation can be finished with ``run()`` or undone with
+    ``rollback()``; ``pending()`` finds such a journal. Each state is written
+    just after the rename it records, so both first reconcile the journal with
+    what is on disk.
+    """
+
+    def __init__(self, source_dir, dest_dir, max_workers=DEFAULT_MAX_WORKERS, progress=None, is_cancelled=None):
+        self.source_dir = os.path.abspath(source_dir)
+        self.dest_dir = os.path.abspath(dest_dir)
+        self.max_workers = max_workers
+        self.progress = progress or (lambda done, total, message: None)
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.journal_path = os.path.join(self.source_dir, JOURNAL_NAME)
+        self.errors = {}
+        self.methods = {}
+        self._lock = threading.Lock()
+        self._journal = None
+
+    @classmethod
+    def pending(cls, plugin_dir):
+        """Return the destination of an interrupted relocation out of ``plugin_dir``, or None."""
+        try:
+            with open(os.path.join(plugin_dir, JOURNAL_NAME), "r") as f:
+                return json.load(f).get("dest")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _load_journal(self):
+        try:
+            with open(self.journal_path, "r") as f:
+                journal = json.load(f)
+            if journal.get("dest") == self.dest_dir:
+                return journal
+        except (OSError, ValueError, AttributeError):
+            pass
+        plugins = {name: PENDING for name in sorted(os.listdir(self.source_dir))
+                   if os.path.isdir(os.path.join(self.source_dir, name)) and not name.startswith(SKIPPED_PREFIXES)}
+        return {"source": self.source_dir, "dest": self.dest_dir, "plugins": plugins}
+
+    def _save_journal(self):
+        with self._lock:
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._journal, f)
+            os.replace(tmp_path, self.journal_path)
+
+    def _set_state(self, name, state):
+        self._journal["plugins"][name] = state
+        self._save_journal()
+
+    def _paths(self, name):
+        """(source, destination, temporary copy) folders of a plugin."""
+        return (os.path.join(self.source_dir, name), os.path.join(self.dest_dir, name),
+                os.path.join(self.dest_dir, TEMP_PREFIX + name))
+
+    def _reconcile(self):
+        """Catch up journal states that a crash left one rename behind the filesystem."""
+        changed = False
+        for name, state in self._journal["plugins"].items():
+            source, dest, temp_dir = self._paths(name)
+            if state == PENDING and os.path.exists(dest) and not os.path.exists(source):
+                state = DONE  # renamed on one filesystem
+            elif state == COPYING and os.path.exists(dest) and not os.path.exists(temp_dir):
+                state = COPIED  # the complete copy was renamed into place
+            elif state == COPIED and not os.path.exists(source):
+                state = DONE  # the source was already moved aside for removal
+            else:
+                continue
+            self._journal["plugins"][name] = state
+            changed = True
+        if changed:
+            self._save_journal()
+
+    def _same_filesystem(self):
+        return os.stat(self.source_dir).st_dev == os.stat(self.dest_dir).st_dev
+
+    def _check_cancelled(self):
+        if self.is_cancelled():
+            raise RelocationCancelled("Plugin relocation cancelled")
+
+    def run(self):
+        """Relocate (or finish relocating) every plugin. Returns the names moved."""
+        if self.source_dir == self.dest_dir:
+            return []
+        os.makedirs(self.dest_dir, exist_ok=True)
+        self._journal = self._load_journal()
+        self._save_journal()
+        self._reconcile()
+        plugins = self._journal["plugins"]
+
+        for name, state in list(plugins.items()):
+            if os.path.exists(os.path.join(self.dest_dir, name)) and state in (PENDING, COPYING):
+                self.errors[name] = "a folder with this name already exists at the destination"
+
+        todo = [name for name, state in plugins.items() if state != DONE and name not in self.errors]
+        if self._same_filesystem():
+            resumed_copies = [name for name in todo if plugins[name] != PENDING]  # from the EXDEV fallback
+            self._rename_all([name for name in todo if plugins[name] == PENDING])
+            self._copy_all(resumed_copies)
+        else:
+            self._copy_all(todo)
+
+        for name, state in plugins.items():
+            if state == DONE:
+                shutil.rmtree(os.path.join(self.source_dir, REMOVING_PREFIX + name), ignore_errors=True)
+        if self.errors:
+            raise RelocationError("Could not move: " + ", ".join(f"{n} ({e})" for n, e in self.errors.items()))
+        os.remove(self.journal_path)
+        return [name for name, state in plugins.items() if state == DONE]
+
+    def _rename_all(self, names):
+        for count, name in enumerate(names, 1):
+            self._check_cancelled()
+            try:
+                os.rename(os.path.join(self.source_dir, name), os.path.join(self.dest_dir, name))
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    self.errors[name] = str(e)
+                    continue
+                self._copy_all([name])  # e.g. bind mounts that share st_dev but refuse rename
+                continue
+            self.methods[name] = "rename"
+            self._set_state(name, DONE)
+            self.progress(count, len(names), f"Moved {name}")
+
+    def _plan_copy(self, name):
+        """List (kind, source, target, size) operations to recreate a plugin under its temporary name."""
+        src_root = os.path.join(self.source_dir, name)
+        dst_root = os.path.join(self.dest_dir, TEMP_PREFIX + name)
+        dirs, files = [dst_root], []
+        for dirpath, dirnames, filenames in os.walk(src_root):
+            rel = os.path.relpath(dirpath, src_root)
+            target_dir = os.path.normpath(os.path.join(dst_root, rel))
+            for dirname in list(dirnames):
+                src = os.path.join(dirpath, dirname)
+                if os.path.islink(src):
+                    dirnames.remove(dirname)
+                    files.append(("symlink", src, os.path.join(target_dir, dirname), 0))
+                else:
+                    dirs.append(os.path.join(target_dir, dirname))
+            for filename in filenames:
+                src = os.path.join(dirpath, filename)
+                if os.path.islink(src):
+                    files.append(("symlink", src, os.path.join(target_dir, filename), 0))
+                else:
+                    files.append(("file", src, os.path.join(target_dir, filename), os.lstat(src).st_size))
+        return dirs, files
+
+    def _copy_all(self, names):
+        plans = {}
+        for name in names:
+            shutil.rmtree(os.path.join(self.dest_dir, TEMP_PREFIX + name), ignore_errors=True)
+            if self._journal["plugins"][name] == COPIED:
+                continue  # already complete at the destination, only the source is left to remove
+            plans[name] = self._plan_copy(name)
+            for directory in plans[name][0]:
+                os.makedirs(directory, exist_ok=True)
+            self._set_state(name, COPYING)
+
+        total = sum(size for dirs, files in plans.values() for _, _, _, size in files) or 1
+        done = 0
+        remaining = {name: len(files) for name, (dirs, files) in plans.items()}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for name, (dirs, files) in plans.items():
+                for kind, src, dst, size in files:
+                    futures[executor.submit(self._copy_one, kind, src, dst)] = (name, size)
+            for name in [n for n, count in remaining.items() if count == 0]:
+                self._finish_copy(name)
+            for future in concurrent.futures.as_completed(futures):
+                name, size = futures[future]
+                if self.is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                try:
+                    method = future.result()
+                    self.methods.setdefault(name, method)
+                except OSError as e:
+                    self.errors.setdefault(name, str(e))
+                done += size
+                remaining[name] -= 1
+                self.progress(done, total, f"Copying {name}")
+                if remaining[name] == 0 and name not in self.errors:
+                    self._finish_copy(name)
+        self._check_cancelled()
+
+        for name in names:
+            if self._journal["plugins"][name] == COPIED:
+                # Move the source aside first so a crash mid-delete never leaves a partial plugin behind.
+                doomed = os.path.join(self.source_dir, REMOVING_PREFIX + name)
+                os.rename(os.path.join(self.source_dir, name), doomed)
+                self._set_state(name, DONE)
+                shutil.rmtree(doomed, ignore_errors=True)
+
+    def _copy_one(self, kind, src, dst):
+        if kind == "symlink":
+            os.symlink(os.readlink(src), dst)
+            return "symlink"
+        return _clone_file(src, dst)
+
+    def _finish_copy(self, name):
+        os.rename(os.path.join(self.dest_dir, TEMP_PREFIX + name), os.path.join(self.dest_dir, name))
+        self._set_state(name, COPIED)
+
+    def rollback(self):
+        """Undo an interrupted relocation, putting every plugin back in ``source_dir``."""
+        self._journal = self._load_journal()
+        self._reconcile()
+        for name, state in self._journal["plugins"].items():
+            source, dest, temp_dir = self._paths(name)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if state == COPIED:
+                shutil.rmtree(dest, ignore_errors=True)
+            elif state == DONE and os.path.exists(dest) and not os.path.exists(source):
+                try:
+                    os.rename(dest, source)
+                except OSError:
+                    shutil.copytree(dest, source, symlinks=True)
+                    shutil.rmtree(dest)
+                shutil.rmtree(os.path.join(self.source_dir, REMOVING_PREFIX + name), ignore_errors=True)
+            self._journal["plugins"][name] = PENDING
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
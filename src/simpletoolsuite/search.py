@@ -0,0 +1,173 @@
+"""In-process search over installed and catalog plugin metadata.
+
+``SearchIndex`` keeps an inverted index from lowercased word tokens to the
+plugins whose ``name``, ``author``, ``description`` or ``features`` contain
+them. A query matches a plugin when every query word matches one of its
+tokens exactly, as a prefix, or (for words of ``MIN_FUZZY_LENGTH`` or more)
+within one edit. Fuzzy candidates come from a table of single-character
+deletions, so a lookup never scans the whole vocabulary.
+
+Entries are added, replaced and removed one plugin at a time, so the index
+follows installs, removals and streamed catalog results without a rebuild.
+"""
+import bisect
+import collections
+import heapq
+import re
+import threading
+
+INSTALLED = "installed"
+CATALOG = "catalog"
+FIELD_WEIGHTS = {"name": 4.0, "author": 2.0, "features": 1.5, "description": 1.0}
+PREFIX_FACTOR = 0.8  # score multiplier for a prefix match
+FUZZY_FACTOR = 0.5  # score multiplier for a match within one edit
+MIN_FUZZY_LENGTH = 4
+DEFAULT_LIMIT = 500
+
+_WORD = re.compile(r"[^\W_]+")
+
+SearchHit = collections.namedtuple("SearchHit", "source name metadata score")
+
+
+def tokenize(text):
+    """Lowercased words in ``text``; punctuation and underscores separate words."""
+    return _WORD.findall(text.lower()) if isinstance(text, str) else []
+
+
+def _deletions(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _field_tokens(name, metadata):
+    """Map each token of a plugin to the weight of the best field it appears in."""
+    weights = {}
+
+    def add(text, weight):
+        for token in tokenize(text):
+            if weights.get(token, 0) < weight:
+                weights[token] = weight
+
+    add(name, FIELD_WEIGHTS["name"])
+    if isinstance(metadata, dict):
+        for field, weight in FIELD_WEIGHTS.items():
+            value = metadata.get(field)
+            for text in value if isinstance(value, list) else [value]:
+                add(text, weight)
+    return weights
+
+
+class SearchIndex:
+    """Inverted index of plugins keyed by (source, name); ``source`` is INSTALLED or CATALOG."""
+
+    def __init__(self):
+        self._entries = {}  # (source, name) -> (metadata, {token: weight})
+        self._postings = {}  # token -> {(source, name): weight}
+        self._vocabulary = []  # sorted tokens, for prefix ranges
+        self._deleted = collections.defaultdict(set)  # token with one character deleted -> tokens
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, source, name, metadata):
+        """Index a plugin, replacing any earlier entry with the same source and name."""
+        with self._lock:
+            self._add(source, name, metadata)
+
+    def remove(self, source, name):
+        """Drop a plugin from the index. Returns False if it was not indexed."""
+        with self._lock:
+            return self._remove((source, name))
+
+    def replace(self, source, entries):
+        """Make ``source`` hold exactly ``entries`` (name, metadata pairs), touching only what changed."""
+        entries = dict(entries)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == source and key[1] not in entries]:
+                self._remove(key)
+            for name, metadata in entries.items():
+                current = self._entries.get((source, name))
+                if current is None or current[0] != metadata:
+                    self._add(source, name, metadata)
+
+    def names(self, source):
+        with self._lock:
+            return [name for entry_source, name in self._entries if entry_source == source]
+
+    def _add(self, source, name, metadata):
+        key = (source, name)
+        self._remove(key)
+        tokens = _field_tokens(name, metadata)
+        self._entries[key] = (metadata, tokens)
+        for token, weight in tokens.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+                for deleted in _deletions(token):
+                    self._deleted[deleted].add(token)
+            posting[key] = weight
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for token in entry[1]:
+            posting = self._postings[token]
+            del posting[key]
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                for deleted in _deletions(token):
+                    tokens = self._deleted[deleted]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._deleted[deleted]
+        return True
+
+    def _matches(self, word):
+        """Yield (token, factor) for every indexed token ``word`` matches."""
+        vocabulary = self._vocabulary
+        # Walk by index from the insertion point: slicing would copy the rest of the vocabulary per word.
+        for i in range(bisect.bisect_left(vocabulary, word), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(word):
+                break
+            yield token, 1.0 if token == word else PREFIX_FACTOR
+        if len(word) < MIN_FUZZY_LENGTH:
+            return
+        fuzzy = set(self._deleted.get(word, ()))  # one character inserted
+        for deleted in _deletions(word):
+            if deleted in self._postings:  # one character dropped
+                fuzzy.add(deleted)
+            fuzzy.update(self._deleted.get(deleted, ()))  # one character substituted (or swapped in place)
+        for token in fuzzy:
+            if not token.startswith(word):
+                yield token, FUZZY_FACTOR
+
+    def search(self, query, source=None, limit=DEFAULT_LIMIT):
+        """Return up to ``limit`` SearchHits for ``query``, best first, optionally only from ``source``."""
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            scores = None
+            for word in dict.fromkeys(words):
+                word_scores = {}
+                for token, factor in self._matches(word):
+                    for key, weight in self._postings[token].items():
+                        if source is not None and key[0] != source:
+                            continue
+                        if scores is not None and key not in scores:
+                            continue
+                        score = weight * factor
+                        if word_scores.get(key, 0) < score:
+                            word_scores[key] = score
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {key: scores[key] + score for key, score in word_scores.items()}
+                if not scores:
+                    return []
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0][1].lower()))
+            return [SearchHit(key[0], key[1], self._entries[key][0], score) for key, score in ranked]
@@ -1,74 +1,121 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+import logging
 import os, sys
-import json
-import platform
-import requests
-import shutil
-from PyQt5 import QtWidgets, uic, QtGui, QtCore
+from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtWidgets import QCheckBox
+from .config import ConfigStore, get_default_config_path
 from .pluginmanager import PluginManager
+from .catalog import (CatalogCache, CatalogClient, CACHE_FILE_NAME, DEFAULT_CACHE_TTL, GITHUB_API_URL,
+                      GITHUB_RAW_URL)
+from .listmodels import PluginListModel, PluginDetailsModel, NameRole, MetadataRole
+from .relocate import PluginRelocator
+from .search import SearchIndex, INSTALLED, CATALOG
+from .plugintabs import PluginTabManager, DEFAULT_SUSPEND_AFTER
+from .tasks import ComputePool, TaskScheduler
+from .tracing import configure_logging, tracer, TRACE_ENV
+
+log = logging.getLogger(__name__)
 
 # Constants
 VERSION = "1.0.4"
 DEFAULT_CONFIG_NAME = "config.json"
 DARK_MODE_STYLE = "dark_mode.css"
-GITHUB_API_URL = "https://api.github.com/repos/MaxTheSpy/SimpleToolSuite/contents/Available%20Plugins"
+SEARCH_REFRESH_MS = 150  # delay before re-running a search after the plugin lists change
+
+class StartupProfile:
+    """Collects a per-phase timing breakdown for --profile-startup."""
+
+    def __init__(self, start):
+        self.start = start
+        self.phases = []
+        self._last = start
 
-def get_default_config_path():
-    """Determine the default configuration and plugin directory paths based on the operating system."""
-    home = os.path.expanduser("~")
-    system = platform.system()
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
 
-    # Config: Base Path.
-    if system == "Windows":
-        config_base_dir = os.path.join(home, "AppData", "Local", "SimpleToolSuite")
-    elif system == "Darwin":  # macOS
-        config_base_dir = os.path.join(home, "Library", "Application Support", "SimpleToolSuite")
-    else:  # Assuming Linux and other UNIX-like systems
-        config_base_dir = os.path.join(home, ".config", "SimpleToolSuite")
+    def report(self):
+        print("Startup profile:")
+        for phase, elapsed in self.phases:
+            print(f"  {phase:<24}{elapsed * 1000:8.1f} ms")
+        print(f"  {'total':<24}{(self._last - self.start) * 1000:8.1f} ms")
 
-    #plugin: Base Path.
-    if system == "Windows":
-            plugin_base_dir = os.path.join(home, "AppData", "Local", "SimpleToolSuite", "Plugins")
-    elif system == "Darwin":  # macOS
-        plugin_base_dir = os.path.join(home, "Library", "Application Support", "SimpleToolSuite", "Plugins")
-    else:  # Assuming Linux and other UNIX-like systems
-        plugin_base_dir = os.path.join(home, ".local", "share", "SimpleToolSuite", "Plugins")
 
-    config_path = os.path.join(config_base_dir, "config.json")
-    return config_path, plugin_base_dir
+def load_main_ui(window, app_root):
+    """Build the main window UI, preferring the precompiled main_ui module over parsing main.ui."""
+    try:
+        from .main_ui import Ui_MainWindow
+    except ImportError:
+        from PyQt5 import uic  # only needed, and only paid for, without the precompiled module
+        uic.loadUi(os.path.join(app_root, "main.ui"), window)
+        return None
+    ui = Ui_MainWindow()
+    ui.setupUi(window)
+    return ui
 
 
 class SimpleToolSuite(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, profile=None):
         super().__init__()
+        mark = profile.mark if profile is not None else (lambda phase: None)
         self.config_path = get_default_config_path()  # Initialize config_path
         self.config = self.load_config()  # Load config first
         self.app_root = getattr(sys, '_MEIPASS', os.path.dirname(os.path.realpath(__file__)))
-        
-        # Load UI
-        uic.loadUi(os.path.join(self.app_root, "main.ui"), self)
+        self._stylesheets = {}  # stylesheet path -> contents, read once
+        mark("load config")
+
+        # Load UI (precompiled when available, main.ui otherwise)
+        self.ui = load_main_ui(self, self.app_root)
+        mark("build UI")
 
         # Now self.config is available, so we can initialize PluginManager
-        self.plugin_manager = PluginManager(self.config.get('plugin_location', os.path.join(os.getcwd(), "plugins")))
+        self.compute = ComputePool(self, self.config.get('compute_workers'))  # worker processes start on first use
+        self.plugin_manager = PluginManager(self.config.get('plugin_location', os.path.join(os.getcwd(), "plugins")),
+                                            compute=self.compute)
 
         self.download_mode = False
+        self.pending_updates = []  # UpdatePlans found by the last update check
+        self.installed_model = PluginListModel(parent=self)
+        self.catalog_model = PluginListModel(parent=self)
+        self.details_model = PluginDetailsModel(self)
+        self.search_model = PluginListModel(parent=self)
+        self.search_index = SearchIndex()
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_REFRESH_MS)
+        catalog_cache = CatalogCache(os.path.join(os.path.dirname(self.config_path), CACHE_FILE_NAME),
+                                     ttl=self.config.get('catalog_ttl', DEFAULT_CACHE_TTL))
+        self.catalog_client = CatalogClient(GITHUB_API_URL, GITHUB_RAW_URL, cache=catalog_cache)
+        self.tasks = TaskScheduler(self)
+
+        mark("create managers")
 
         self.init_ui_components()
+        self.plugin_tabs = PluginTabManager(self.tab_widget, self.config.get('plugin_suspend_after', DEFAULT_SUSPEND_AFTER), self)
         self.connect_signals()
         self.apply_config()
+        mark("apply config and style")
         self.setup_ui()
+        mark("set up UI")
 
     def init_ui_components(self):
             """Initialize UI components."""
             self.tab_widget = self.findChild(QtWidgets.QTabWidget, "tabWidget")
-            self.plugin_list = self.findChild(QtWidgets.QListWidget, "list_plugin_widget")
-            self.description_list = self.findChild(QtWidgets.QListWidget, "list_desc")
+            self.plugin_list = self.findChild(QtWidgets.QListView, "list_plugin_widget")
+            self.description_list = self.findChild(QtWidgets.QListView, "list_desc")
+            self.line_edit_search = self.findChild(QtWidgets.QLineEdit, "lineEdit_search")
+            self.plugin_list.setModel(self.installed_model)
+            self.description_list.setModel(self.details_model)
             self.load_button = self.findChild(QtWidgets.QPushButton, "button_load_plugin")
             self.launch_button = self.findChild(QtWidgets.QPushButton, "button_launch_plugin")
             self.download_button = self.findChild(QtWidgets.QPushButton, "button_download_plugin")
+            self.button_check_updates = self.findChild(QtWidgets.QPushButton, "button_check_updates")
             self.button_save_settings = self.findChild(QtWidgets.QPushButton, "button_save_settings")
             self.button_open_plugin = self.findChild(QtWidgets.QPushButton, "button_open_plugin")
             self.line_edit_plugin_loc = self.findChild(QtWidgets.QLineEdit, "lineEdit_plugin_loc")
@@ -76,6 +123,12 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
             self.checkbox_darkmode = self.findChild(QCheckBox, "checkbox_darkmode")
             self.label_plugin_mode = self.findChild(QtWidgets.QLabel, "label_plugin_mode")
             self.button_open_config = self.findChild(QtWidgets.QPushButton, "button_open_config")
+            self.tab_settings = self.findChild(QtWidgets.QWidget, "tab_settings")
+            self.table_performance = self.findChild(QtWidgets.QTableWidget, "table_performance")
+            self.checkbox_trace = self.findChild(QCheckBox, "checkbox_trace")
+            self.checkbox_memory = self.findChild(QCheckBox, "checkbox_memory")
+            self.button_refresh_performance = self.findChild(QtWidgets.QPushButton, "button_refresh_performance")
+            self.button_export_trace = self.findChild(QtWidgets.QPushButton, "button_export_trace")
             self.tab_widget.setTabsClosable(True)
 
     def connect_signals(self):
@@ -83,60 +136,59 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
             self.load_button.clicked.connect(self.reset_plugin_list)
             self.launch_button.clicked.connect(self.handle_launch_or_download)
             self.download_button.clicked.connect(self.handle_download_mode)
-            self.plugin_list.itemClicked.connect(self.show_metadata)
+            self.button_check_updates.clicked.connect(self.handle_updates)
+            self.plugin_list.clicked.connect(self.show_metadata)
+            self.line_edit_search.textChanged.connect(self.apply_search)
+            self.search_timer.timeout.connect(self.apply_search)
             self.button_plugin_loc.clicked.connect(self.browse_plugin_location)
             self.button_open_plugin.clicked.connect(self.open_plugin_location)  # Connection here
             self.button_save_settings.clicked.connect(self.save_config_and_plugins)
             self.checkbox_darkmode.stateChanged.connect(self.toggle_dark_mode)
             self.button_open_config.clicked.connect(self.open_config_location)
+            self.checkbox_trace.stateChanged.connect(self.toggle_tracing)
+            self.checkbox_memory.stateChanged.connect(self.toggle_memory_tracking)
+            self.button_refresh_performance.clicked.connect(self.refresh_performance)
+            self.button_export_trace.clicked.connect(self.export_trace)
+            self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
     def load_config(self):
-        """Load the configuration from a file, creating defaults if necessary."""
+        """Load the configuration from a file, creating or migrating it as necessary."""
         self.config_path, default_plugin_dir = get_default_config_path()
-        config_dir = os.path.dirname(self.config_path)
-
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-
-        if not os.path.exists(self.config_path):
-            default_config = {
-                "dark_mode": False,
-                "plugin_location": default_plugin_dir  # Use the default plugin directory
-            }
-            with open(self.config_path, 'w') as f:
-                json.dump(default_config, f, indent=4)
-            return default_config
-
-        with open(self.config_path, 'r') as f:
-            return json.load(f)
+        return ConfigStore(self.config_path, default_plugin_dir)
 
     def save_config(self):
-        """Save the current configuration to the default path."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        """Save the current configuration; the write is batched and done atomically in the background."""
+        self.config.save()
 
     def apply_config(self):
         """Apply the loaded configuration settings to the UI."""
         self.line_edit_plugin_loc.setText(self.config.get('plugin_location', os.path.join(os.getcwd(), "plugins")))
         dark_mode_enabled = self.config.get('dark_mode', False)
         self.checkbox_darkmode.setChecked(dark_mode_enabled)
+        self.checkbox_trace.setChecked(tracer.enabled)
+        self.checkbox_memory.setChecked(self.plugin_manager.memory.enabled)
         self.apply_style(dark_mode_enabled)
 
     def apply_style(self, dark_mode_enabled):
         """Apply the appropriate stylesheet based on dark mode setting."""
         style_sheet = os.path.join(self.app_root, 'dark_mode.css') if dark_mode_enabled else os.path.join(self.app_root, 'light_mode.css')
-        if os.path.exists(style_sheet):
+        if style_sheet not in self._stylesheets:
+            if not os.path.exists(style_sheet):
+                log.warning("Stylesheet %s not found.", style_sheet)
+                return
             try:
                 with open(style_sheet, "r") as file:
-                    self.setStyleSheet(file.read())
+                    self._stylesheets[style_sheet] = file.read()
             except Exception as e:
-                print(f"Error applying stylesheet: {e}")
-        else:
-            print(f"Stylesheet {style_sheet} not found.")
+                log.error("Error applying stylesheet: %s", e)
+                return
+        self.setStyleSheet(self._stylesheets[style_sheet])
 
     def setup_ui(self):
         """Initial UI setup."""
-        self.populate_plugins()
+        # Discover plugins once the window has been shown, not before the first paint
+        QtCore.QTimer.singleShot(0, self.populate_plugins)
+        QtCore.QTimer.singleShot(0, self.check_interrupted_plugin_move)
         self.tab_widget.setTabText(0, "Plugins")  # Ensure Tab 1 name is set
         self.tab_widget.setTabText(1, "Settings")  # Ensure Tab 2 name is set
         self.tab_widget.setTabsClosable(True)
@@ -145,22 +197,27 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
         self.tab_widget.tabBar().setTabButton(0, QtWidgets.QTabBar.RightSide, None)
         self.tab_widget.tabBar().setTabButton(1, QtWidgets.QTabBar.RightSide, None)
         self.tab_widget.setCurrentIndex(0) #Set Plugins Tab as the active tab on startup.
-        self.tab_widget.setTabVisible(2, False)# Ensure the plugin execution tab is initially hidden
         self.tab_widget.tabCloseRequested.connect(self.handle_tab_close)
-        self.load_button.clicked.connect(self.reset_plugin_list)
-        self.launch_button.clicked.connect(self.launch_plugin)
-        self.download_button.clicked.connect(self.handle_download_mode)
 
     def populate_plugins(self):
-        """Populate the plugin list with installed plugins."""
-        plugins = self.plugin_manager.discover_plugins()
-        self.plugin_list.clear()
-        for plugin in plugins:
-            self.plugin_list.addItem(plugin["name"])
+        """Populate the plugin list with installed plugins, discovering them in the background."""
+        self.tasks.submit("discover", lambda task: self.plugin_manager.discover_plugins(),
+                          on_finished=self.show_installed_plugins,
+                          on_failed=lambda error: self.details_model.add_message(f"Error loading plugins: {error}"))
+
+    def show_installed_plugins(self, plugins):
+        if self.download_mode:
+            return
+        entries = [(plugin["name"], plugin["metadata"]) for plugin in plugins]
+        self.search_index.replace(INSTALLED, entries)
+        self.installed_model.set_entries(entries)
+        self.refresh_search()
 
     def reset_plugin_list(self):
         """Reset to show user-installed plugins."""
         self.download_mode = False
+        self.tasks.cancel("catalog")
+        self.apply_search()
         self.label_plugin_mode.setText("Your Plugins:")
         self.populate_plugins()
         self.launch_button.setText("Launch Plugin")
@@ -191,80 +248,91 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
         self.download_mode = True
         self.label_plugin_mode.setText("Download Plugin:")
         self.launch_button.setText("Download Plugin")
+        self.apply_search()
         self.fetch_available_plugins()
 
+    def show_model(self, model):
+        """Point the plugin list at ``model``; switching modes swaps models instead of rebuilding rows."""
+        if self.plugin_list.model() is not model:
+            self.plugin_list.setModel(model)
+            self.details_model.clear()
+
+    def apply_search(self):
+        """Show the current mode's plugins, narrowed to those matching the search box."""
+        self.search_timer.stop()
+        query = self.line_edit_search.text().strip()
+        if not query:
+            self.show_model(self.catalog_model if self.download_mode else self.installed_model)
+            return
+        hits = self.search_index.search(query, source=CATALOG if self.download_mode else INSTALLED)
+        self.search_model.set_entries((hit.name, hit.metadata) for hit in hits)
+        self.show_model(self.search_model)
+
+    def refresh_search(self):
+        """Re-run an active search shortly, so results follow plugins being installed or fetched."""
+        if self.line_edit_search.text().strip() and not self.search_timer.isActive():
+            self.search_timer.start()
+
     def fetch_available_plugins(self):
-        """Fetch the list of available plugins and their metadata from the GitHub repository."""
-        try:
-            response = requests.get(GITHUB_API_URL)
-            if response.status_code == 200:
-                available_entries = response.json()
-                self.available_plugins = {}
-
-                for entry in available_entries:
-                    if entry["type"] == "dir":
-                        plugin_name = entry["name"]
-                        metadata_url = f"https://raw.githubusercontent.com/MaxTheSpy/SimpleToolSuite/main/Available%20Plugins/{plugin_name}/metadata.json"
-                        metadata_response = requests.get(metadata_url)
-                        if metadata_response.status_code == 200:
-                            # Parse the metadata.json fetched from the URL correctly
-                            metadata_content = metadata_response.json()
-                            self.available_plugins[plugin_name] = metadata_content
-                        else:
-                            print(f"Failed to fetch metadata for {plugin_name}: {metadata_response.status_code}")
-
-                self.plugin_list.clear()
-                for plugin_name in self.available_plugins.keys():
-                    self.plugin_list.addItem(plugin_name)
-            else:
-                self.description_list.addItem(f"Failed to fetch plugins: {response.status_code}")
-        except Exception as e:
-            self.description_list.addItem(f"Error fetching plugins: {e}")
+        """Fetch the list of available plugins and their metadata in the background.
 
-    def show_metadata(self, item):
-        """Display metadata content for the selected plugin, either installed or downloadable."""
-        self.description_list.clear()
-        plugin_name = item.text()
-        print(f"Selected plugin: {plugin_name}")
+        Metadata requests run concurrently over a pooled session and each plugin
+        is added to the list as soon as its metadata arrives.
+        """
+        if self.tasks.is_running("catalog"):
+            return
+        self.catalog_model.clear()
+        self.label_plugin_mode.setText("Download Plugin: (loading...)")
+        self.tasks.submit("catalog", self._fetch_catalog,
+                          on_progress=self.add_available_plugin,
+                          on_finished=self.on_catalog_fetched,
+                          on_failed=self.on_catalog_fetch_failed,
+                          on_cancelled=self.on_catalog_fetch_cancelled)
+
+    def _fetch_catalog(self, task):
+        """Worker side of fetch_available_plugins."""
+        self.catalog_client.fetch(on_result=lambda name, metadata: task.progress((name, metadata)),
+                                  is_cancelled=lambda: task.cancelled)
+        return self.catalog_client.offline
+
+    def add_available_plugin(self, result):
+        """Add a fetched catalog entry to the list while in download mode."""
+        plugin_name, metadata = result
+        self.search_index.add(CATALOG, plugin_name, metadata)
+        self.catalog_model.extend([result])
+        if self.download_mode:
+            self.refresh_search()
 
-        metadata = None
+    def on_catalog_fetched(self, offline):
+        # Drop plugins that have left the catalog since the last fetch.
+        self.search_index.replace(CATALOG, ((name, self.catalog_model.metadata(name))
+                                            for name in self.catalog_model.names()))
+        if self.download_mode:
+            self.refresh_search()
+            self.label_plugin_mode.setText("Download Plugin:")
+            if offline:
+                self.details_model.add_message("Offline: showing cached plugin catalog.")
 
+    def on_catalog_fetch_failed(self, error=None):
         if self.download_mode:
-            # Fetch from available_plugins dictionary if in download mode
-            metadata = self.available_plugins.get(plugin_name)
-        else:
-            # Fetch metadata for installed plugins
-            plugins = self.plugin_manager.discover_plugins()
-            selected_plugin = next((p for p in plugins if p["name"] == plugin_name), None)
-
-            if selected_plugin:
-                metadata_path = os.path.join(selected_plugin["path"], "metadata.json")
-                if os.path.exists(metadata_path):
-                    with open(metadata_path, "r") as meta_file:
-                        metadata = json.load(meta_file)
-
-        # Define which metadata fields to display and their labels
-        fields_to_display = {
-            "name": "Name",
-            "version": "Version",
-            "author": "Author",
-            "description": "Description"
-        }
-
-        if metadata and isinstance(metadata, dict):
-            for key, display_name in fields_to_display.items():
-                if key in metadata:
-                    value = metadata[key]
-                    self.description_list.addItem(f"{display_name}: {value}")  # Capitalized labels
-
-            # Display features if they exist
-            if "features" in metadata:
-                self.description_list.addItem("")  # Add an empty line for spacing
-                self.description_list.addItem("Features:")  # Features header
-                for feature in metadata["features"]:
-                    self.description_list.addItem(f"  - {feature}")  # List each feature with a bullet point
-            else:
-                self.description_list.addItem("No metadata available or improperly formatted.")
+            self.label_plugin_mode.setText("Download Plugin:")
+            if error:
+                self.details_model.add_message(error)
+
+    def on_catalog_fetch_cancelled(self):
+        # A fetch cancelled on leaving download mode may only end after the next one has been submitted.
+        if not self.tasks.is_running("catalog"):
+            self.on_catalog_fetch_failed()
+
+    def show_metadata(self, index):
+        """Display metadata content for the selected plugin, either installed or downloadable."""
+        log.debug("Selected plugin: %s", index.data(NameRole))
+        self.details_model.show_metadata(index.data(MetadataRole))
+
+    def selected_plugin_name(self):
+        """Return the name of the plugin selected in the list, or None."""
+        index = self.plugin_list.currentIndex()
+        return index.data(NameRole) if index.isValid() else None
 
     def handle_launch_or_download(self):
         """Launch the selected plugin or download depending on the mode."""
@@ -275,86 +343,127 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
 
     def download_selected_plugin(self):
         """Download the selected plugin."""
-        selected_item = self.plugin_list.currentItem()
-        if not selected_item:
-            self.description_list.addItem("No plugin selected.")
+        plugin_name = self.selected_plugin_name()
+        if plugin_name is None:
+            self.details_model.add_message("No plugin selected.")
             return
 
-        plugin_name = selected_item.text()
-        success = self.plugin_manager.download_plugin(GITHUB_API_URL, plugin_name)
+        if self.tasks.is_running(f"download:{plugin_name}"):
+            return
+        self.details_model.add_message(f"Downloading '{plugin_name}'...")
+        self.tasks.submit(f"download:{plugin_name}",
+                          lambda task: self.plugin_manager.install_plugin(
+                              GITHUB_API_URL, plugin_name, self.catalog_model.metadata(plugin_name)),
+                          on_finished=lambda success: self.on_plugin_downloaded(plugin_name, success),
+                          on_failed=lambda error: self.on_plugin_downloaded(plugin_name, False))
+
+    def on_plugin_downloaded(self, plugin_name, success):
         message = f"Plugin '{plugin_name}' installed successfully." if success else f"Failed to download plugin '{plugin_name}'."
-        self.description_list.addItem(message)
+        self.details_model.add_message(message)
         if success:
             self.reset_plugin_list()
 
+    def handle_updates(self):
+        """Check installed plugins for updates, or apply the updates the last check found."""
+        if self.tasks.is_running("updates"):
+            return
+        self.button_check_updates.setEnabled(False)
+        if self.pending_updates:
+            plans, self.pending_updates = self.pending_updates, []
+            self.button_check_updates.setText("Updating...")
+            self.tasks.submit("updates", lambda task: self.plugin_manager.update_plugins(GITHUB_API_URL, plans),
+                              on_finished=self.on_plugins_updated,
+                              on_failed=self.on_update_check_failed)
+        else:
+            self.button_check_updates.setText("Checking...")
+            self.tasks.submit("updates", lambda task: self.plugin_manager.check_updates(GITHUB_API_URL),
+                              on_finished=self.show_update_plans,
+                              on_failed=self.on_update_check_failed)
+
+    def show_update_plans(self, plans):
+        """List the plugins whose files differ from the catalog and offer to update them."""
+        self.details_model.clear()
+        self.pending_updates = []
+        for name, plan in sorted(plans.items(), key=lambda item: item[0].lower()):
+            if isinstance(plan, str):
+                self.details_model.add_message(f"{name}: could not check ({plan})")
+            elif not plan.up_to_date:
+                self.pending_updates.append(plan)
+                self.details_model.add_message(plan.summary())
+        self.button_check_updates.setEnabled(True)
+        if self.pending_updates:
+            self.button_check_updates.setText(f"Update {len(self.pending_updates)} Plugin(s)")
+        else:
+            self.details_model.add_message("All plugins are up to date.")
+            self.button_check_updates.setText("Check for Updates")
+
+    def on_plugins_updated(self, reports):
+        for report in reports.values():
+            self.details_model.add_message(report.summary())
+        self.button_check_updates.setText("Check for Updates")
+        self.button_check_updates.setEnabled(True)
+        if not self.download_mode:
+            self.populate_plugins()
+
+    def on_update_check_failed(self, error):
+        self.details_model.add_message(f"Update failed: {error}")
+        self.button_check_updates.setText("Check for Updates")
+        self.button_check_updates.setEnabled(True)
+
     def launch_plugin(self):
         """Launch the selected plugin."""
-        selected_item = self.plugin_list.currentItem()
-        if not selected_item:
-            self.description_list.addItem("No plugin selected.")
+        plugin_name = self.selected_plugin_name()
+        if plugin_name is None:
+            self.details_model.add_message("No plugin selected.")
             return
 
-        plugin_name = selected_item.text()
-        plugins = self.plugin_manager.discover_plugins()
-        selected_plugin = next((p for p in plugins if p["name"] == plugin_name), None)
+        selected_plugin = self.plugin_manager.get_plugin(plugin_name)
         if not selected_plugin:
-            self.description_list.addItem("Plugin not found.")
+            self.details_model.add_message("Plugin not found.")
             return
 
-        # Load and activate the plugin's virtual environment and module
-        module = self.plugin_manager.load_plugin(selected_plugin["path"], selected_plugin["main"])
+        # Stat the sources, resolve the virtual environment and compile the main module off the GUI
+        # thread; the module itself runs on the GUI thread since plugins may create QObjects on import.
+        path, main_file = selected_plugin["path"], selected_plugin["main"]
+        self.tasks.submit(f"load:{plugin_name}",
+                          lambda task: self.plugin_manager.prepare_plugin(path, main_file),
+                          on_finished=lambda prepared: self.show_plugin(
+                              plugin_name, self.plugin_manager.load_plugin(path, main_file, prepared), path),
+                          on_failed=lambda error: self.details_model.add_message(f"Failed to load plugin: {error}"))
+
+    def show_plugin(self, plugin_name, module, plugin_path):
+        """Open (or switch to) the loaded plugin's own tab."""
         if module and hasattr(module, "main"):
-            scroll_area = self.findChild(QtWidgets.QScrollArea, "scroll_plugin_container")
-            if scroll_area:
-                # Clear existing content
-                previous_widget = scroll_area.takeWidget()
-                if previous_widget:
-                    previous_widget.deleteLater()
-
-                scroll_area_widget = QtWidgets.QWidget()
-                scroll_area_widget.setLayout(QtWidgets.QVBoxLayout())
-                scroll_area.setWidget(scroll_area_widget)
-
-                # Instantiate and place the plugin UI
-                widget = module.main(scroll_area_widget)
-
-                # Ensure the correct hierarchy
-                if isinstance(widget, QtWidgets.QWidget):
-                    scroll_area_widget.layout().addWidget(widget)
-
-                self.tab_widget.setTabText(2, plugin_name)
-                self.tab_widget.setTabVisible(2, True)
-                self.tab_widget.setCurrentIndex(2)
+            self.plugin_tabs.open(plugin_name, module, os.path.basename(os.path.normpath(plugin_path)))
+            self.plugin_manager.memory.record_load(plugin_path)
         else:
-            self.description_list.addItem("Plugin does not have a main function.")
+            self.details_model.add_message("Plugin does not have a main function.")
 
     def handle_tab_close(self, index):
-        """Handle tab closing by clearing and hiding tab 2."""
-        if index == 2:  # Check if it's the plugin execution tab
-            self.clear_and_hide_tab(index)
+        """Handle tab closing by tearing down the plugin tab."""
+        if self.plugin_tabs.tab_at(index) is None:
+            return
+        if index == self.tab_widget.currentIndex():
             self.tab_widget.setCurrentIndex(0)  # Set the active tab back to the Plugins tab
-
-
-    def clear_and_hide_tab(self, index):
-        """Clear tab contents and hide the tab."""
-        scroll_area = self.findChild(QtWidgets.QScrollArea, "scroll_plugin_container")
-        if scroll_area:
-            scroll_area_widget = scroll_area.findChild(QtWidgets.QWidget, "scrollAreaWidgetContents")
-            if scroll_area_widget:
-                # Clear all widgets inside the scroll area
-                layout = scroll_area_widget.layout()
-                if layout:
-                    self.clear_layout(layout)
-        self.tab_widget.setTabVisible(index, False)  # Hide the tab
-
-    def clear_layout(self, layout):
-        """Remove all widgets from a layout."""
-        if layout is not None:
-            while layout.count():
-                child = layout.takeAt(0)
-                if child.widget() is not None:
-                    child.widget().deleteLater()
-
+        tab = self.plugin_tabs.close(index)
+        # Unload once the event loop has deleted the tab's widgets.
+        QtCore.QTimer.singleShot(0, lambda: self.unload_closed_plugin(tab.name))
+
+    def unload_closed_plugin(self, plugin_name):
+        """Reclaim a closed plugin's modules and paths, and report anything it left behind."""
+        if self.plugin_tabs.find(plugin_name) is not None:
+            return  # reopened in the meantime
+        plugin = self.plugin_manager.get_plugin(plugin_name)
+        if plugin is None:
+            return
+        result = self.plugin_manager.unload_plugin(plugin["path"])
+        leftovers = []
+        if result["retained"]:
+            leftovers.append(f"{result['retained'] / 1024:.0f} KB still allocated")
+        if result["threads"]:
+            leftovers.append(f"{len(result['threads'])} thread(s) still running")
+        if leftovers:
+            self.statusBar().showMessage(f"Closed {plugin_name}: {', '.join(leftovers)}", 10000)
 
     def browse_plugin_location(self):
         """Open a dialog to select a new plugin directory."""
@@ -371,36 +480,164 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
         if new_plugin_location:
             if not os.path.exists(new_plugin_location):
                 os.makedirs(new_plugin_location)
-            
-            # Move plugins to the new location
-            self.move_plugins(new_plugin_location)
-            
-            # Update the PluginManager to use the new directory
-            self.plugin_manager.plugin_dir = new_plugin_location
-            
-            # Update the configuration
-            self.config['plugin_location'] = new_plugin_location
-            self.save_config()
-            
-            # Repopulate the plugin list from the new location
-            self.populate_plugins()
+
+            if os.path.abspath(new_plugin_location) == os.path.abspath(self.plugin_manager.plugin_dir):
+                self.config['plugin_location'] = new_plugin_location
+                self.save_config()
+                return
+            self.start_plugin_move(new_plugin_location)
         else:
             QtWidgets.QMessageBox.warning(self, "Invalid Directory", "Please specify a valid plugin directory.")
 
+    def start_plugin_move(self, new_plugin_location):
+        """Move plugins to the new location in the background."""
+        self.button_save_settings.setEnabled(False)
+        self.tasks.submit("move", self.move_plugins, new_plugin_location,
+                          on_progress=self.button_save_settings.setText,
+                          on_finished=lambda result: self.on_plugins_moved(new_plugin_location),
+                          on_failed=lambda error: self.on_plugin_move_failed(new_plugin_location, error),
+                          on_cancelled=self.reset_save_button)
+
+    def reset_save_button(self):
+        self.button_save_settings.setText("Save Settings")
+        self.button_save_settings.setEnabled(True)
+
+    def on_plugins_moved(self, new_plugin_location):
+        """Point the app at the new plugin location once the move task is done."""
+        self.reset_save_button()
+
+        # Update the PluginManager to use the new directory
+        self.plugin_manager.plugin_dir = new_plugin_location
+
+        # Update the configuration
+        self.config['plugin_location'] = new_plugin_location
+        self.save_config()
+
+        # Repopulate the plugin list from the new location
+        self.populate_plugins()
+
+    def on_plugin_move_failed(self, new_plugin_location, error):
+        """Roll a failed move back so plugins are not left split between two locations."""
+        log.error("Failed to move plugins: %s", error)
+        self.button_save_settings.setText("Rolling back...")
+        relocator = PluginRelocator(self.plugin_manager.plugin_dir, new_plugin_location)
+        self.tasks.submit("move-rollback", lambda task: relocator.rollback(),
+                          on_finished=lambda result: self.on_plugin_move_rolled_back(error),
+                          on_failed=lambda rollback_error: self.on_plugin_move_rolled_back(f"{error}; rollback failed: {rollback_error}"))
+
+    def on_plugin_move_rolled_back(self, error):
+        self.reset_save_button()
+        self.line_edit_plugin_loc.setText(self.plugin_manager.plugin_dir)
+        QtWidgets.QMessageBox.warning(self, "Plugin Move Failed",
+                                      f"Plugins were kept in {self.plugin_manager.plugin_dir}.\n\n{error}")
+
+    def check_interrupted_plugin_move(self):
+        """Offer to resume or roll back a plugin move that was interrupted in a previous session."""
+        dest = PluginRelocator.pending(self.plugin_manager.plugin_dir)
+        if dest is None:
+            return
+        answer = QtWidgets.QMessageBox.question(
+            self, "Interrupted Plugin Move",
+            f"Moving plugins to {dest} did not finish.\n\nResume the move? Choosing No moves them back.")
+        if answer == QtWidgets.QMessageBox.Yes:
+            self.line_edit_plugin_loc.setText(dest)
+            self.start_plugin_move(dest)
+        else:
+            self.on_plugin_move_failed(dest, "Plugin move was interrupted.")
+
+    def move_plugins(self, task, new_plugin_location):
+        """Move plugins to a new directory location. Runs as a background task."""
+        last_percent = [-1]
+
+        def progress(done, total, message):
+            percent = done * 100 // total
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                task.progress(f"Moving plugins ({percent}%)...")
+
+        relocator = PluginRelocator(self.plugin_manager.plugin_dir, new_plugin_location,
+                                    progress=progress, is_cancelled=lambda: task.cancelled)
+        moved = relocator.run()
+        for name in moved:
+            log.info("Moved %s to new location.", name)
+        # A copy to another filesystem breaks links into the package store: relink what can be, drop the rest.
+        task.progress("Sharing packages...")
+        self.plugin_manager.package_store.link_all(new_plugin_location)
+        self.plugin_manager.package_store.collect_garbage()
+        return moved
+
+    def on_tab_changed(self, index):
+        if self.tab_widget.widget(index) is self.tab_settings:
+            self.refresh_performance()
+
+    @staticmethod
+    def _percentile_cells(stats):
+        if stats is None:
+            return ["0", "", ""]
+        return [str(stats["count"]), f"{stats['p50'] * 1000:.1f}", f"{stats['p90'] * 1000:.1f}"]
+
+    def refresh_performance(self):
+        """Fill the Performance table with per-plugin load and launch percentiles, import cost and memory use."""
+        table = self.table_performance
+        table.setRowCount(0)
+        for row, report in enumerate(self.plugin_manager.performance_report()):
+            table.insertRow(row)
+            cost, record = report["imports"], report["memory"]
+            cells = ([report["name"], report["folder"]] + self._percentile_cells(report["load"])
+                     + (["", ""] if cost is None else [f"{cost['seconds'] * 1000:.1f}", str(cost["modules"])])
+                     + self._percentile_cells(report["launch"]))
+            if record is None:
+                cells += ["", ""]
+            else:
+                cells += [f"{record['loaded'] / 1024:.0f}",
+                          "" if record["retained"] is None else f"{record['retained'] / 1024:.0f}"]
+            for column, text in enumerate(cells):
+                table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+        table.resizeColumnsToContents()
+
+    def toggle_tracing(self, state):
+        """Start or stop recording spans for the trace export."""
+        if state == QtCore.Qt.Checked:
+            tracer.start()
+        else:
+            tracer.stop()
 
-    def move_plugins(self, new_plugin_location):
-        """Move plugins to a new directory location."""
-        current_plugin_location = self.plugin_manager.plugin_dir
-        if os.path.exists(current_plugin_location):
-            for plugin in os.listdir(current_plugin_location):
-                plugin_path = os.path.join(current_plugin_location, plugin)
-                new_path = os.path.join(new_plugin_location, plugin)
-                if os.path.isdir(plugin_path):
-                    try:
-                        shutil.move(plugin_path, new_path)
-                        print(f"Moved {plugin} to new location.")
-                    except Exception as e:
-                        print(f"Failed to move {plugin}: {e}")
+    def toggle_memory_tracking(self, state):
+        """Start or stop attributing memory to plugins (allocations are slower while on)."""
+        if state == QtCore.Qt.Checked:
+            self.plugin_manager.memory.start()
+        else:
+            self.plugin_manager.memory.stop()
+
+    def export_trace(self):
+        """Save the recorded spans as a Chrome trace-event file (open in chrome://tracing or Perfetto)."""
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Trace", "simpletoolsuite-trace.json",
+                                                        "Trace files (*.json)")
+        if not path:
+            return
+        try:
+            count = tracer.export_chrome_trace(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Export Trace", f"Could not write {path}:\n{e}")
+            return
+        self.statusBar().showMessage(f"Exported {count} spans to {path}", 5000)
+
+    def closeEvent(self, event):
+        """Stop background work and give open plugins their shutdown() call before the window goes away."""
+        self.tasks.shutdown()
+        for tab in list(self.plugin_tabs.tabs.values()):
+            plugin = self.plugin_manager.get_plugin(tab.name)
+            if plugin is not None:
+                self.plugin_manager.unload_plugin(plugin["path"])
+        self.compute.shutdown()
+        self.config.flush()
+        trace_path = os.environ.get(TRACE_ENV)
+        if trace_path:
+            try:
+                tracer.export_chrome_trace(trace_path)
+            except OSError as e:
+                log.error("Could not write trace to %s: %s", trace_path, e)
+        super().closeEvent(event)
 
     def toggle_dark_mode(self, state):
         """Toggle the application's dark mode setting."""
@@ -410,10 +647,27 @@ class SimpleToolSuite(QtWidgets.QMainWindow):
         self.apply_style(enabled)
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    configure_logging()
+    if os.environ.get(TRACE_ENV):
+        tracer.start()
+    profile = StartupProfile(_IMPORT_START) if "--profile-startup" in argv else None
+    if profile is not None:
+        profile.mark("imports")
+
     app = QtWidgets.QApplication([])
-    window = SimpleToolSuite()
+    if profile is not None:
+        profile.mark("QApplication")
+    window = SimpleToolSuite(profile=profile)
     window.show()
+    if profile is not None:
+        profile.mark("show")
+
+        def first_paint():
+            profile.mark("first event loop pass")
+            profile.report()
+        QtCore.QTimer.singleShot(0, first_paint)
     app.exec_()
 
 if __name__ == "__main__":
@@ -0,0 +1,308 @@
+import logging
+import os
+import threading
+import time
+
+from PyQt5 import QtCore
+
+log = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task function by Task.check_cancelled() once the task is cancelled."""
+
+
+class TaskSignals(QtCore.QObject):
+    """Signals a Task emits back to the GUI thread."""
+    progress = QtCore.pyqtSignal(object)
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+    done = QtCore.pyqtSignal()
+
+
+class Task(QtCore.QRunnable):
+    """A unit of blocking work run on the scheduler's thread pool.
+
+    The task function is called as ``fn(task, *args, **kwargs)`` on a worker
+    thread; it may call ``task.progress(value)`` to report back to the GUI and
+    should poll ``task.cancelled`` or call ``task.check_cancelled()`` between
+    steps of long work.
+    """
+
+    def __init__(self, key, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.signals = TaskSignals()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled(self.key)
+
+    def progress(self, value):
+        self.signals.progress.emit(value)
+
+    def run(self):
+        try:
+            result = self._fn(self, *self._args, **self._kwargs)
+            if self.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            self.signals.done.emit()
+
+
+class TaskScheduler(QtCore.QObject):
+    """Runs blocking work off the GUI thread on a QThreadPool.
+
+    Tasks are identified by a key; submitting a key that is already running
+    returns the running task instead of starting a duplicate, so repeated
+    clicks coalesce into one job. A cancelled task keeps its key until its
+    function returns, so two tasks under one key never run at once: the same
+    work submitted meanwhile is held and started as soon as it is released.
+    Progress a task reports after being cancelled is dropped.
+    """
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._active = {}
+        self._deferred = {}  # key -> task waiting for the cancelled one under its key to return
+
+    def _current(self, key):
+        return self._deferred.get(key) or self._active.get(key)
+
+    def submit(self, key, fn, *args, on_finished=None, on_progress=None, on_failed=None, on_cancelled=None,
+               **kwargs):
+        """Start ``fn`` under ``key`` unless a task with that key is already running."""
+        task = self._current(key)
+        if task is not None and not task.cancelled:
+            return task
+        task = Task(key, fn, args, kwargs)
+        for signal, slot in ((task.signals.finished, on_finished), (task.signals.failed, on_failed),
+                             (task.signals.cancelled, on_cancelled)):
+            if slot is not None:
+                signal.connect(slot)
+        if on_progress is not None:
+            task.signals.progress.connect(lambda value: None if task.cancelled else on_progress(value))
+        task.signals.done.connect(lambda: self._release(key, task))
+        if key in self._active:
+            self._deferred[key] = task
+        else:
+            self._active[key] = task
+            self.pool.start(task)
+        return task
+
+    def _release(self, key, task):
+        if self._active.get(key) is not task:
+            return
+        del self._active[key]
+        task = self._deferred.pop(key, None)
+        if task is not None:
+            self._active[key] = task
+            self.pool.start(task)
+
+    def is_running(self, key):
+        """True while a task under ``key`` is running or waiting to, and has not been cancelled."""
+        task = self._current(key)
+        return task is not None and not task.cancelled
+
+    def cancel(self, key):
+        """Cancel the work under ``key``. Returns True if there was any."""
+        found = False
+        deferred = self._deferred.pop(key, None)
+        if deferred is not None:
+            deferred.cancel()
+            deferred.signals.cancelled.emit()  # it never ran, so nothing else will report it
+            found = True
+        task = self._active.get(key)
+        if task is not None and not task.cancelled:
+            task.cancel()
+            found = True
+        return found
+
+    def cancel_all(self):
+        for key in set(self._active) | set(self._deferred):
+            self.cancel(key)
+
+    def shutdown(self, timeout_ms=5000):
+        """Cancel everything and wait for running tasks to return."""
+        self.cancel_all()
+        self.pool.clear()
+        return self.pool.waitForDone(timeout_ms)
+
+
+class ComputeJob(QtCore.QObject):
+    """A call running in the compute pool; its outcome arrives as signals on the GUI thread."""
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+    done = QtCore.pyqtSignal()
+
+    def __init__(self, plugin_path, target, buffers):
+        super().__init__()
+        self.plugin_path = plugin_path
+        self.target = target
+        self.future = None
+        self._buffers = buffers  # SharedBuffers passed in, released once the job is over
+        self._started = time.perf_counter()
+        # Queued like the other slots, so buffers are still readable in on_finished.
+        self.done.connect(self._release_buffers)
+
+    def cancel(self):
+        """Cancel the job if a worker has not picked it up yet. Returns True if it was cancelled."""
+        return self.future.cancel()
+
+    def running(self):
+        return not self.future.done()
+
+    def _on_done(self, future):
+        # Called on the pool's management thread; the signals are queued to the GUI thread.
+        if future.cancelled():
+            self.cancelled.emit()
+        else:
+            error = future.exception()
+            if error is None:
+                log.debug("Compute job %s finished in %.1f ms", self.target, (time.perf_counter() - self._started) * 1000)
+                self.finished.emit(future.result())
+            else:
+                log.debug("Compute job %s failed: %r", self.target, error)
+                self.failed.emit(str(error) or type(error).__name__)
+        self.done.emit()
+
+    def _release_buffers(self):
+        for buffer in self._buffers:
+            buffer.release()
+        self._buffers = []
+
+
+class ComputePool(QtCore.QObject):
+    """A process pool shared by all plugins for CPU-bound work.
+
+    Workers are spawned (never forked from the GUI process) on the first
+    submit, and each job runs in its own interpreter without holding the GUI's
+    GIL. multiprocessing and the offload module are only imported then too,
+    so a session in which no plugin offloads work does not pay for them.
+    Plugins reach it through the ``PluginExecutor`` set as their main
+    module's ``compute``.
+    """
+
+    def __init__(self, parent=None, max_workers=None):
+        super().__init__(parent)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = set()
+
+    @property
+    def started(self):
+        return self._executor is not None
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            import concurrent.futures
+            import multiprocessing
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            log.info("Started compute pool with %d worker processes", self.max_workers)
+        return self._executor
+
+    def submit(self, target, *args, plugin_path=None, paths=(), on_finished=None, on_failed=None,
+               on_cancelled=None, **kwargs):
+        """Run ``target`` (``"module:function"``) in a worker process with ``args`` and ``kwargs``."""
+        from concurrent.futures.process import BrokenProcessPool
+        from .offload import SharedBuffer, run_target
+        buffers = [value for value in (*args, *kwargs.values()) if isinstance(value, SharedBuffer) and value.owner]
+        job = ComputeJob(plugin_path, target, buffers)
+        for signal, slot in ((job.finished, on_finished), (job.failed, on_failed), (job.cancelled, on_cancelled)):
+            if slot is not None:
+                signal.connect(slot)
+        job.done.connect(lambda: self._forget(job))
+        call = (run_target, plugin_path, target, list(paths), args, kwargs)
+        with self._lock:
+            try:
+                job.future = self._ensure_executor().submit(*call)
+            except BrokenProcessPool:
+                log.warning("A compute worker died; restarting the compute pool")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                job.future = self._ensure_executor().submit(*call)
+            self._jobs.add(job)
+        job.future.add_done_callback(job._on_done)
+        return job
+
+    def _forget(self, job):
+        with self._lock:
+            self._jobs.discard(job)
+
+    def executor(self, plugin_path, paths=()):
+        """The plugin-facing handle for the plugin at ``plugin_path`` with its dependency ``paths``."""
+        return PluginExecutor(self, plugin_path, paths)
+
+    def cancel(self, plugin_path=None):
+        """Cancel the queued jobs of one plugin, or of all plugins. Running jobs are left to finish."""
+        with self._lock:
+            jobs = [job for job in self._jobs if plugin_path is None or job.plugin_path == plugin_path]
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self, wait=False):
+        """Cancel queued jobs and stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class PluginExecutor:
+    """What a plugin sees of the compute pool.
+
+    ``submit("module:function", *args, on_finished=...)`` runs the function in
+    a worker process, with ``module`` looked up in the plugin's folder first and
+    the plugin's .venv packages importable, and calls ``on_finished(result)`` or
+    ``on_failed(message)`` on the GUI thread. ``share(data)`` copies a large
+    input into shared memory once, ``share(size=n)`` makes room for a large
+    output; pass the buffer as an argument and it stays readable until the
+    job's ``on_finished`` has returned, then it is freed.
+    """
+
+    def __init__(self, pool, plugin_path, paths=()):
+        self._pool = pool
+        self.plugin_path = plugin_path
+        self.paths = list(paths)
+
+    @property
+    def max_workers(self):
+        return self._pool.max_workers
+
+    def submit(self, target, *args, on_finished=None, on_failed=None, on_cancelled=None, **kwargs):
+        return self._pool.submit(target, *args, plugin_path=self.plugin_path, paths=self.paths,
+                                 on_finished=on_finished, on_failed=on_failed, on_cancelled=on_cancelled, **kwargs)
+
+    def share(self, data=None, size=None):
+        """A SharedBuffer holding a copy of ``data``, or ``size`` zeroed bytes for a worker to fill."""
+        from .offload import SharedBuffer
+        if data is not None:
+            return SharedBuffer.from_bytes(data)
+        return SharedBuffer.create(size or 0)
+
+    def cancel_all(self):
+        self._pool.cancel(self.plugin_path)
@@ -0,0 +1,168 @@
+"""Logging setup, timing spans and Chrome trace export.
+
+``span(name, category, **args)`` times a block of work::
+
+    with tracing.span("discover_plugins", "plugins"):
+        ...
+
+While recording is off (the default) ``span`` returns a shared do-nothing
+context manager, so instrumented code pays for one call and one attribute
+check. Spans given a ``metric=(kind, key)`` are always timed, because they
+feed the per-plugin load and launch percentiles shown under Settings.
+"""
+import collections
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+LOG_LEVEL_ENV = "SIMPLETOOLSUITE_LOG_LEVEL"
+TRACE_ENV = "SIMPLETOOLSUITE_TRACE"  # a path: record from startup and write the trace there on exit
+DEFAULT_MAX_EVENTS = 200000
+DEFAULT_MAX_SAMPLES = 500  # samples kept per (kind, key) metric
+
+log = logging.getLogger("simpletoolsuite")
+
+
+def configure_logging(level=None):
+    """Send the package's log records to stderr at ``level`` (a name or number), or $SIMPLETOOLSUITE_LOG_LEVEL."""
+    level = level or os.environ.get(LOG_LEVEL_ENV) or "INFO"
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(level)
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    return sorted_samples[max(0, math.ceil(fraction * len(sorted_samples)) - 1)]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed block; ``set(**args)`` attaches values discovered while it runs."""
+    __slots__ = ("tracer", "name", "category", "args", "metric", "start", "duration")
+
+    def __init__(self, tracer, name, category, args, metric):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.metric = metric
+        self.start = None
+        self.duration = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.args["error"] = repr(exc)
+        self.tracer._finish(self)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects finished spans as Chrome trace events plus per-key duration samples."""
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS, max_samples=DEFAULT_MAX_SAMPLES):
+        self.enabled = False
+        self.max_samples = max_samples
+        self.events = collections.deque(maxlen=max_events)
+        self.metrics = {}  # (kind, key) -> deque of seconds
+        self._origin = time.perf_counter()
+        self._threads = {}  # thread ident -> name
+        self._lock = threading.Lock()
+
+    def span(self, name, category="app", metric=None, **args):
+        if not self.enabled and metric is None:
+            return NULL_SPAN
+        return Span(self, name, category, args, metric)
+
+    def start(self):
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.metrics.clear()
+
+    def _finish(self, span):
+        with self._lock:
+            if span.metric is not None:
+                samples = self.metrics.get(span.metric)
+                if samples is None:
+                    samples = self.metrics[span.metric] = collections.deque(maxlen=self.max_samples)
+                samples.append(span.duration)
+            if self.enabled:
+                thread = threading.current_thread()
+                self._threads.setdefault(thread.ident, thread.name)
+                self.events.append({
+                    "name": span.name, "cat": span.category, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+                    "ts": round((span.start - self._origin) * 1e6, 1), "dur": round(span.duration * 1e6, 1),
+                    "args": span.args,
+                })
+
+    def summary(self, kind):
+        """Per-key {"count", "p50", "p90", "p99", "max"} in seconds for one metric kind (e.g. "load")."""
+        with self._lock:
+            items = [(key, sorted(samples)) for (metric_kind, key), samples in self.metrics.items()
+                     if metric_kind == kind]
+        return {key: {"count": len(samples), "p50": percentile(samples, 0.5), "p90": percentile(samples, 0.9),
+                      "p99": percentile(samples, 0.99), "max": samples[-1]}
+                for key, samples in items}
+
+    def chrome_trace(self):
+        """The recorded session as a Chrome trace-event document (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "SimpleToolSuite"}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": ident, "args": {"name": name}}
+                     for ident, name in threads.items()]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Write the recorded session to ``path``. Returns the number of spans written."""
+        trace = self.chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f, default=str)
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+tracer = Tracer()
+span = tracer.span
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from catalog_server import CatalogServer  # benchmarks/catalog_server.py, on the pytest pythonpath
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """A QApplication on the offscreen platform; tests using it are skipped without PyQt5."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def catalog_http(tmp_path):
+    """The running CatalogServer behind ``catalog_server``, for tests that change how it answers."""
+    root = tmp_path / "remote"
+    root.mkdir()
+    with CatalogServer(str(root)) as server:
+        yield server
+
+
+@pytest.fixture
+def catalog_server(catalog_http, tmp_path):
+    """The benchmarks' stand-in catalog serving ``tmp_path / "remote"``; yields (remote dir, base URL).
+
+    ``{base}/api/<path>`` is the contents-API listing and ``{base}/raw/<path>`` the file itself.
+    """
+    yield tmp_path / "remote", catalog_http.base_url
+
+
+def write_files(root, files):
+    for relpath, data in files.items():
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
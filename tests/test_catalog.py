@@ -0,0 +1,105 @@
+import json
+import shutil
+
+import pytest
+
+from simpletoolsuite.catalog import CatalogCache, CatalogClient, CatalogError
+
+from conftest import write_files
+
+
+def _publish(remote, name):
+    write_files(remote, {f"{name}/metadata.json": json.dumps({"name": name, "version": "1.0"}).encode()})
+
+
+@pytest.fixture
+def client_for(catalog_server, tmp_path):
+    remote, base = catalog_server
+    clients = []
+
+    def make(ttl=0):
+        client = CatalogClient(f"{base}/api", f"{base}/raw", cache=CatalogCache(str(tmp_path / "cache.json"), ttl))
+        clients.append(client)
+        return client
+    yield remote, make
+    for client in clients:
+        client.close()
+
+
+def _cached_urls(tmp_path):
+    with open(tmp_path / "cache.json") as f:
+        return set(json.load(f)["entries"])
+
+
+def test_fetch_returns_every_plugin(client_for):
+    remote, make = client_for
+    for name in ("Alpha", "Beta"):
+        _publish(remote, name)
+    assert make().fetch() == {"Alpha": {"name": "Alpha", "version": "1.0"}, "Beta": {"name": "Beta", "version": "1.0"}}
+
+
+def test_fresh_cache_is_served_without_requests(client_for):
+    remote, make = client_for
+    _publish(remote, "Alpha")
+    make(ttl=600).fetch()
+    client = make(ttl=600)
+    assert client.fetch() == {"Alpha": {"name": "Alpha", "version": "1.0"}}
+    assert (client.cache.hits, client.cache.misses) == (2, 0)
+
+
+def test_unreachable_catalog_is_served_from_cache(client_for, catalog_http):
+    remote, make = client_for
+    _publish(remote, "Alpha")
+    make().fetch()
+    catalog_http.shutdown()
+    catalog_http.server_close()
+
+    client = make()
+    assert client.fetch() == {"Alpha": {"name": "Alpha", "version": "1.0"}}
+    assert client.offline
+
+
+@pytest.mark.parametrize("status", [403, 429, 500, 503])
+def test_rate_limit_or_server_error_is_served_from_cache(client_for, catalog_http, status):
+    remote, make = client_for
+    _publish(remote, "Alpha")
+    make().fetch()
+    catalog_http.fail_status = status
+
+    client = make()
+    assert client.fetch() == {"Alpha": {"name": "Alpha", "version": "1.0"}}
+    assert client.offline
+
+
+def test_rate_limit_without_cache_is_an_error(client_for, catalog_http):
+    _, make = client_for
+    catalog_http.fail_status = 403
+    with pytest.raises(CatalogError, match="403"):
+        make().fetch()
+
+
+def test_missing_plugin_is_not_served_from_cache(client_for):
+    remote, make = client_for
+    _publish(remote, "Alpha")
+    client = make()
+    client.fetch()
+    shutil.rmtree(remote / "Alpha")
+    assert client.fetch_metadata("Alpha") is None
+    assert not client.offline
+
+
+def test_refresh_prunes_plugins_that_left_the_catalog(client_for, tmp_path):
+    remote, make = client_for
+    for name in ("Alpha", "Beta"):
+        _publish(remote, name)
+    client = make()
+    client.fetch()
+    client.cache.store("https://elsewhere.example/Other/metadata.json", {}, {})
+    assert any(url.endswith("/Beta/metadata.json") for url in _cached_urls(tmp_path))
+
+    shutil.rmtree(remote / "Beta")
+    assert list(client.fetch()) == ["Alpha"]
+    urls = _cached_urls(tmp_path)
+    assert not any(url.endswith("/Beta/metadata.json") for url in urls)
+    assert any(url.endswith("/Alpha/metadata.json") for url in urls)
+    assert "https://elsewhere.example/Other/metadata.json" in urls  # another catalog's entries are left alone
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from simpletoolsuite import cli
+
+from conftest import write_files
+
+
+def _publish(remote, name, version="1.0"):
+    write_files(remote / name, {"metadata.json": json.dumps({"name": name, "version": version}).encode(),
+                                "main.py": b"def main(widget):\n    return None\n"})
+
+
+@pytest.fixture
+def run(catalog_server, tmp_path, monkeypatch, capsys):
+    """Run ``cli.main`` with --json against the local catalog; returns (exit status, parsed output)."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))  # keeps config and caches out of the real home
+    remote, base = catalog_server
+    plugin_dir = tmp_path / "plugins"
+
+    def run_cli(*argv):
+        status = cli.main([*argv, "--json", "--plugin-dir", str(plugin_dir),
+                           "--api-url", f"{base}/api", "--raw-url", f"{base}/raw"])
+        return status, json.loads(capsys.readouterr().out)
+    run_cli.remote = remote
+    run_cli.plugin_dir = plugin_dir
+    return run_cli
+
+
+def test_install_and_list_print_json(run):
+    _publish(run.remote, "Alpha")
+    _publish(run.remote, "Beta", version="2.0")
+
+    status, result = run("install", "Alpha")
+    assert status == 0
+    install, = result["results"]
+    assert install["name"] == "Alpha" and install["ok"] and install["error"] is None
+    assert set(install) == {"name", "ok", "method", "bytes", "seconds", "error"}
+
+    status, result = run("list", "--available")
+    assert status == 0
+    assert result == {
+        "plugin_dir": str(run.plugin_dir),
+        "installed": [{"name": "Alpha", "version": "1.0", "author": "Unknown", "folder": "Alpha"}],
+        "available": [{"name": "Alpha", "version": "1.0", "author": "", "installed": True},
+                      {"name": "Beta", "version": "2.0", "author": "", "installed": False}],
+        "offline": False,
+    }
+
+
+def test_manifest_skips_comments_and_blank_lines(run, tmp_path):
+    for name in ("Alpha", "Beta"):
+        _publish(run.remote, name)
+    manifest = tmp_path / "plugins.txt"
+    manifest.write_text("# tools for the lab\nAlpha  # first\n\n   \nBeta\nAlpha\n")
+
+    status, result = run("install", "--manifest", str(manifest))
+    assert status == 0
+    assert [item["name"] for item in result["results"]] == ["Alpha", "Beta"]
+
+
+@pytest.mark.parametrize("text", ["Alpha\n../escape\n", '["Alpha", 3]', '{"plugins": [".hidden"]}'])
+def test_invalid_manifest_fails_without_installing(run, tmp_path, text):
+    _publish(run.remote, "Alpha")
+    manifest = tmp_path / "plugins.txt"
+    manifest.write_text(text)
+
+    status, result = run("install", "--manifest", str(manifest))
+    assert status == 1
+    assert str(manifest) in result["error"]
+    assert not (run.plugin_dir / "Alpha").exists()
+
+
+def test_invalid_manifest_line_is_named():
+    with pytest.raises(ValueError, match=r"plugins\.txt:3: '\.\./escape'"):
+        cli.check_plugin_name("../escape", "plugins.txt:3")
+
+
+def test_failed_install_and_unknown_plugin_exit_non_zero(run):
+    _publish(run.remote, "Alpha")
+
+    status, result = run("install", "Alpha", "Missing")
+    assert status == 1
+    outcome = {item["name"]: item for item in result["results"]}
+    assert outcome["Alpha"]["ok"] and not outcome["Missing"]["ok"]
+    assert outcome["Missing"]["error"]
+
+    status, result = run("info", "Missing")
+    assert status == 1
+    assert result == {"name": "Missing", "installed": False, "remote": None}
+
+    status, result = run("remove", "Missing")
+    assert status == 1
+    assert result["results"] == [{"name": "Missing", "ok": False, "error": "not installed"}]
+
+
+def test_cli_does_not_import_pyqt(tmp_path):
+    code = ("import sys\nfrom simpletoolsuite import cli\n"
+            "status = cli.main(['list', '--json', '--plugin-dir', sys.argv[1]])\n"
+            "sys.exit(3 if 'PyQt5' in sys.modules else status)\n")
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=src)
+    completed = subprocess.run([sys.executable, "-c", code, str(tmp_path / "plugins")], env=env,
+                               capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
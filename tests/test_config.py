@@ -0,0 +1,78 @@
+import json
+import time
+
+from simpletoolsuite.config import CONFIG_VERSION, ConfigStore
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_new_config_is_written_with_defaults(tmp_path):
+    path = tmp_path / "conf" / "config.json"
+    config = ConfigStore(str(path), "/plugins", save_delay=60)
+    assert _read(path) == {"config_version": CONFIG_VERSION, "dark_mode": False, "plugin_location": "/plugins"}
+    assert config.writes == 1
+
+
+def test_burst_of_saves_becomes_one_write(tmp_path):
+    path = tmp_path / "config.json"
+    config = ConfigStore(str(path), "/plugins", save_delay=60)
+    for value in (True, False, True, False, True):
+        config["dark_mode"] = value
+        config.save()
+    assert _read(path)["dark_mode"] is False  # nothing written yet
+    assert config.flush()
+    assert _read(path)["dark_mode"] is True
+    assert config.writes == 2
+    assert config.writes_avoided == 4
+    assert not config.flush()  # unchanged since the last write
+
+
+def test_debounce_timer_writes_on_its_own(tmp_path):
+    path = tmp_path / "config.json"
+    config = ConfigStore(str(path), "/plugins", save_delay=0.05)
+    config["plugin_location"] = "/elsewhere"
+    config.save()
+    deadline = time.monotonic() + 5
+    while config.writes < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _read(path)["plugin_location"] == "/elsewhere"
+
+
+def test_zero_delay_writes_immediately_and_skips_unchanged(tmp_path):
+    path = tmp_path / "config.json"
+    config = ConfigStore(str(path), "/plugins", save_delay=0)
+    config["dark_mode"] = True
+    config.save()
+    assert _read(path)["dark_mode"] is True
+    writes = config.writes
+    config.save()
+    assert config.writes == writes
+
+
+def test_unversioned_config_is_migrated_and_kept(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"dark_mode": True, "catalog_ttl": 30}))
+    config = ConfigStore(str(path), "/plugins", save_delay=60)
+    assert config.as_dict() == {"config_version": CONFIG_VERSION, "dark_mode": True, "catalog_ttl": 30,
+                                "plugin_location": "/plugins"}
+    assert _read(path) == config.as_dict()
+
+
+def test_current_config_is_not_rewritten_on_load(tmp_path):
+    path = tmp_path / "config.json"
+    ConfigStore(str(path), "/plugins", save_delay=60)
+    config = ConfigStore(str(path), "/other", save_delay=60)
+    assert config["plugin_location"] == "/plugins"
+    assert config.writes == 0
+
+
+def test_corrupt_config_is_moved_aside(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{not json")
+    config = ConfigStore(str(path), "/plugins", save_delay=60)
+    assert config["dark_mode"] is False
+    assert (tmp_path / "config.json.corrupt").read_text() == "{not json"
+    assert _read(path)["config_version"] == CONFIG_VERSION
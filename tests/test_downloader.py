@@ -0,0 +1,197 @@
+import hashlib
+import io
+import os
+import stat
+import tarfile
+
+import pytest
+
+from simpletoolsuite.downloader import MANIFEST_NAME, PluginDownloader
+from simpletoolsuite.pluginmanager import PluginManager
+
+from conftest import write_files
+
+
+@pytest.fixture
+def downloader():
+    downloader = PluginDownloader()
+    yield downloader
+    downloader.close()
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def test_download_installs_all_files(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    write_files(remote / "Demo", {"main.py": b"def main(w): pass\n", "lib/util.py": b"X = 1\n"})
+    dest = tmp_path / "plugins" / "Demo"
+    report = downloader.download(f"{base}/api/Demo", str(dest))
+    assert report.ok, report.error
+    assert (dest / "main.py").read_bytes() == b"def main(w): pass\n"
+    assert (dest / "lib" / "util.py").read_bytes() == b"X = 1\n"
+    assert (dest / MANIFEST_NAME).is_file()
+    assert not [name for name in os.listdir(dest.parent) if name.startswith(".")]
+
+
+def test_download_gives_plugin_folder_umask_permissions(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    write_files(remote / "Demo", {"main.py": b"pass\n"})
+    dest = tmp_path / "plugins" / "Demo"
+    assert downloader.download(f"{base}/api/Demo", str(dest)).ok
+    assert stat.S_IMODE(os.stat(dest).st_mode) == 0o777 & ~_umask()
+
+
+def test_update_transfers_only_changed_files(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    write_files(remote / "Demo", {"main.py": b"v1\n", "same.py": b"same\n", "old.py": b"old\n"})
+    dest = tmp_path / "plugins" / "Demo"
+    assert downloader.download(f"{base}/api/Demo", str(dest)).ok
+    (dest / "user_settings.json").write_text("{}")
+    (remote / "Demo" / "old.py").unlink()
+    write_files(remote / "Demo", {"main.py": b"v2\n", "new.py": b"new\n"})
+
+    plan = downloader.plan_update(f"{base}/api/Demo", str(dest))
+    assert sorted(entry["relpath"] for entry in plan.changed) == ["main.py", "new.py"]
+    assert plan.removed == ["old.py"]
+    report = downloader.update(plan, str(dest))
+
+    assert report.ok, report.error
+    assert report.unchanged == 1
+    assert (dest / "main.py").read_bytes() == b"v2\n"
+    assert (dest / "new.py").read_bytes() == b"new\n"
+    assert not (dest / "old.py").exists()
+    assert (dest / "user_settings.json").exists()
+    assert stat.S_IMODE(os.stat(dest).st_mode) == 0o777 & ~_umask()
+    assert downloader.plan_update(f"{base}/api/Demo", str(dest)).up_to_date
+
+
+def _add_local_files(dest):
+    (dest / "user_settings.json").write_text("{}")
+    (dest / "cache").mkdir()
+    (dest / "cache" / "thumbs.db").write_bytes(b"local")
+
+
+def _assert_local_files_kept(dest):
+    assert (dest / "user_settings.json").read_text() == "{}"
+    assert (dest / "cache" / "thumbs.db").read_bytes() == b"local"
+
+
+def test_reinstall_keeps_files_the_user_added(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    write_files(remote / "Demo", {"main.py": b"v1\n", "old.py": b"old\n"})
+    dest = tmp_path / "plugins" / "Demo"
+    assert downloader.download(f"{base}/api/Demo", str(dest)).ok
+    _add_local_files(dest)
+    (remote / "Demo" / "old.py").unlink()
+    write_files(remote / "Demo", {"main.py": b"v2\n"})
+
+    report = downloader.download(f"{base}/api/Demo", str(dest))
+    assert report.ok, report.error
+    assert (dest / "main.py").read_bytes() == b"v2\n"
+    assert not (dest / "old.py").exists()
+    _assert_local_files_kept(dest)
+
+
+def test_archive_reinstall_keeps_files_the_user_added(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    dest = tmp_path / "plugins" / "Demo"
+    sha256 = _make_archive(remote, {"main.py": b"v1\n"})
+    assert downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), sha256).ok
+    _add_local_files(dest)
+    (dest / "main.py").write_bytes(b"edited\n")
+
+    sha256 = _make_archive(remote, {"main.py": b"v2\n", "user_settings.json": b"[]"})
+    report = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), sha256)
+    assert report.ok, report.error
+    assert (dest / "main.py").read_bytes() == b"v2\n"
+    assert (dest / "user_settings.json").read_bytes() == b"[]"  # the plugin now ships it
+    assert (dest / "cache" / "thumbs.db").read_bytes() == b"local"
+
+
+def test_failed_download_leaves_no_plugin_folder(catalog_server, downloader, tmp_path):
+    _, base = catalog_server
+    dest = tmp_path / "plugins" / "Missing"
+    report = downloader.download(f"{base}/api/Missing", str(dest))
+    assert not report.ok
+    assert not dest.exists()
+
+
+def _make_archive(remote, files, links=()):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for relpath, data in files.items():
+            info = tarfile.TarInfo(f"Demo-1.0/{relpath}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        for relpath, target in links:
+            info = tarfile.TarInfo(f"Demo-1.0/{relpath}")
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            archive.addfile(info)
+    (remote / "Demo.tar.gz").write_bytes(buffer.getvalue())
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+def test_archive_install_checks_the_checksum(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    sha256 = _make_archive(remote, {"main.py": b"pass\n"})
+    dest = tmp_path / "plugins" / "Demo"
+
+    bad = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), "0" * 64)
+    assert not bad.ok and "checksum" in bad.error
+    assert not dest.exists()
+
+    report = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), sha256)
+    assert report.ok, report.error
+    assert (dest / "main.py").read_bytes() == b"pass\n"
+
+
+def test_archive_symlinks_inside_the_plugin_are_recreated(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    sha256 = _make_archive(remote, {"main.py": b"pass\n", ".venv/bin/python3": b"#!python\n"},
+                           links=[(".venv/bin/python", "python3"), ("lib", ".venv/bin")])
+    dest = tmp_path / "plugins" / "Demo"
+    report = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), sha256)
+
+    assert report.ok, report.error
+    assert os.readlink(dest / ".venv" / "bin" / "python") == "python3"
+    assert (dest / ".venv" / "bin" / "python").read_bytes() == b"#!python\n"
+    assert (dest / "lib" / "python3").is_file()
+
+
+@pytest.mark.parametrize("links", [[("escape", "../../outside")], [("abs", "/etc/passwd")],
+                                   [("here", "."), ("up", "here/..")]])
+def test_archive_symlink_leaving_the_plugin_fails_the_install(catalog_server, downloader, tmp_path, links):
+    remote, base = catalog_server
+    sha256 = _make_archive(remote, {"main.py": b"pass\n"}, links=links)
+    dest = tmp_path / "plugins" / "Demo"
+    report = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), sha256)
+
+    assert not report.ok
+    assert f"Archive member {links[-1][0]} links outside the plugin" in report.error
+    assert not dest.exists()
+
+
+def test_archive_without_checksum_is_not_installed(catalog_server, downloader, tmp_path):
+    remote, base = catalog_server
+    _make_archive(remote, {"main.py": b"pass\n"})
+    dest = tmp_path / "plugins" / "Demo"
+    report = downloader.download_archive(f"{base}/raw/Demo.tar.gz", str(dest), None)
+    assert not report.ok
+    assert report.bytes_transferred == 0
+    assert not dest.exists()
+
+
+def test_fetch_plugin_falls_back_to_verified_files_without_checksum(catalog_server, tmp_path):
+    remote, base = catalog_server
+    write_files(remote / "Demo", {"main.py": b"from files\n"})
+    _make_archive(remote, {"main.py": b"from archive\n"})
+    manager = PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store"))
+    report = manager.fetch_plugin(f"{base}/api", "Demo", {"archive": {"url": f"{base}/raw/Demo.tar.gz"}})
+    assert report.ok, report.error
+    assert report.method == "files"
+    assert (tmp_path / "plugins" / "Demo" / "main.py").read_bytes() == b"from files\n"
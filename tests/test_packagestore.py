@@ -0,0 +1,75 @@
+import os
+import shutil
+import stat
+
+import pytest
+
+from simpletoolsuite.packagestore import READ_ONLY_OBJECTS, PackageStore
+
+PACKAGE = b"x" * 8192
+MODULE = "lib/site-packages/pkg/core.py"
+
+
+def _make_venv(plugin_dir, folder, files):
+    for relpath, (data, mode) in files.items():
+        path = plugin_dir / folder / ".venv" / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        path.chmod(mode)
+    return plugin_dir / folder
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PackageStore(str(tmp_path / "store"))
+
+
+def test_identical_venvs_share_one_object(tmp_path, store):
+    files = {MODULE: (PACKAGE, 0o644), "pyvenv.cfg": (b"home = /usr\n", 0o644)}
+    first = _make_venv(tmp_path / "plugins", "First", files)
+    second = _make_venv(tmp_path / "plugins", "Second", files)
+
+    assert store.link_venv(str(first)) == 1
+    assert store.link_venv(str(second)) == 1
+    assert store.link_venv(str(second)) == 0
+    first_st, second_st = os.stat(first / ".venv" / MODULE), os.stat(second / ".venv" / MODULE)
+    assert first_st.st_ino == second_st.st_ino
+    assert os.stat(first / ".venv" / "pyvenv.cfg").st_ino != os.stat(second / ".venv" / "pyvenv.cfg").st_ino
+
+    report = store.report()
+    assert report.as_dict() == {"objects": 1, "store_bytes": len(PACKAGE), "linked_files": 2,
+                                "linked_bytes": 2 * len(PACKAGE), "bytes_saved": len(PACKAGE)}
+
+
+def test_objects_are_kept_until_no_plugin_links_them(tmp_path, store):
+    files = {MODULE: (PACKAGE, 0o644)}
+    first = _make_venv(tmp_path / "plugins", "First", files)
+    second = _make_venv(tmp_path / "plugins", "Second", files)
+    store.link_all(str(tmp_path / "plugins"))
+
+    shutil.rmtree(first)
+    assert store.collect_garbage() == 0
+    assert store.report().objects == 1
+    assert (second / ".venv" / MODULE).read_bytes() == PACKAGE
+
+    shutil.rmtree(second)
+    assert store.collect_garbage() == 1
+    assert store.report().objects == 0
+
+
+def test_files_with_different_modes_are_not_merged(tmp_path, store):
+    first = _make_venv(tmp_path / "plugins", "First", {"bin/tool": (PACKAGE, 0o644)})
+    second = _make_venv(tmp_path / "plugins", "Second", {"bin/tool": (PACKAGE, 0o755)})
+    store.link_all(str(tmp_path / "plugins"))
+
+    first_st, second_st = os.stat(first / ".venv" / "bin/tool"), os.stat(second / ".venv" / "bin/tool")
+    assert first_st.st_ino != second_st.st_ino
+    assert second_st.st_mode & stat.S_IXUSR and not first_st.st_mode & stat.S_IXUSR
+    assert store.report().objects == 2
+
+
+@pytest.mark.skipif(not READ_ONLY_OBJECTS, reason="objects stay writable where deleting needs write access")
+def test_shared_files_are_read_only(tmp_path, store):
+    plugin = _make_venv(tmp_path / "plugins", "First", {MODULE: (PACKAGE, 0o644)})
+    store.link_venv(str(plugin))
+    assert stat.S_IMODE(os.stat(plugin / ".venv" / MODULE).st_mode) == 0o444
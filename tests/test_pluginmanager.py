@@ -0,0 +1,169 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+from simpletoolsuite.pluginmanager import INDEX_FILE_NAME, PluginManager
+from simpletoolsuite.tracing import tracer
+
+
+def _make_plugin(plugin_dir, folder, name=None):
+    path = plugin_dir / folder
+    path.mkdir(parents=True)
+    (path / "main.py").write_text("def main(widget):\n    return None\n")
+    (path / "metadata.json").write_text(json.dumps({"name": name or folder, "main": "main.py", "version": "1.0"}))
+    return path
+
+
+def test_discover_reuses_index_without_relisting(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "plugins"
+    for i in range(3):
+        _make_plugin(plugin_dir, f"Plugin{i}")
+    manager = PluginManager(str(plugin_dir), store_dir=str(tmp_path / "store"))
+    assert [p["name"] for p in manager.discover_plugins()] == ["Plugin0", "Plugin1", "Plugin2"]
+    manager.discover_plugins()  # lists once more: writing the index touched the directory
+    index_stamp = os.stat(plugin_dir / INDEX_FILE_NAME).st_mtime_ns
+
+    listings = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listings.append(path) or real_scandir(path))
+    assert len(manager.discover_plugins()) == 3
+    assert listings == []
+    assert os.stat(plugin_dir / INDEX_FILE_NAME).st_mtime_ns == index_stamp
+
+
+def test_discover_picks_up_added_and_removed_plugins(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    _make_plugin(plugin_dir, "Keep")
+    gone = _make_plugin(plugin_dir, "Gone")
+    manager = PluginManager(str(plugin_dir), store_dir=str(tmp_path / "store"))
+    assert len(manager.discover_plugins()) == 2
+
+    for path in gone.iterdir():
+        path.unlink()
+    gone.rmdir()
+    _make_plugin(plugin_dir, "New", name="Brand New")
+    assert sorted(p["name"] for p in manager.discover_plugins()) == ["Brand New", "Keep"]
+    assert manager.get_plugin("Gone") is None
+
+
+def test_index_survives_a_new_manager(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    _make_plugin(plugin_dir, "Demo", name="Demo Tool")
+    PluginManager(str(plugin_dir), store_dir=str(tmp_path / "store")).discover_plugins()
+    manager = PluginManager(str(plugin_dir), store_dir=str(tmp_path / "store"))
+    assert manager.get_plugin("Demo Tool")["path"] == str(plugin_dir / "Demo")
+
+
+def test_index_follows_a_moved_plugin_directory(tmp_path):
+    _make_plugin(tmp_path / "plugins", "Demo", name="Demo Tool")
+    PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store")).discover_plugins()
+    with open(tmp_path / "plugins" / INDEX_FILE_NAME) as f:
+        assert "path" not in json.load(f)["entries"]["Demo"]["plugin"]
+
+    (tmp_path / "plugins").rename(tmp_path / "moved")
+    manager = PluginManager(str(tmp_path / "moved"), store_dir=str(tmp_path / "store"))
+    assert manager.get_plugin("Demo Tool")["path"] == str(tmp_path / "moved" / "Demo")
+    assert [p["path"] for p in manager.discover_plugins()] == [str(tmp_path / "moved" / "Demo")]
+
+
+def test_plugin_added_while_listing_is_found(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "plugins"
+    _make_plugin(plugin_dir, "First")
+    manager = PluginManager(str(plugin_dir), store_dir=str(tmp_path / "store"))
+
+    real_scandir = os.scandir
+
+    def scandir_then_install(path):
+        with real_scandir(path) as entries:
+            listed = list(entries)
+        monkeypatch.setattr(os, "scandir", real_scandir)
+        _make_plugin(plugin_dir, "Late")  # lands after the listing, before the index is saved
+        return contextlib.nullcontext(listed)
+    monkeypatch.setattr(os, "scandir", scandir_then_install)
+    assert [p["name"] for p in manager.discover_plugins()] == ["First"]
+    assert [p["name"] for p in manager.discover_plugins()] == ["First", "Late"]
+
+
+def _make_loadable_plugin(plugin_dir, folder, source):
+    path = _make_plugin(plugin_dir, folder)
+    (path / "main.py").write_text(source)
+    return path
+
+
+def test_prepare_runs_nothing_and_load_executes_on_the_calling_thread(tmp_path):
+    source = ("import threading\nEXECUTED_ON = threading.current_thread().name\n"
+              "def main(widget):\n    return None\n")
+    path = _make_loadable_plugin(tmp_path / "plugins", "Threaded", source)
+    manager = PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store"))
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(prepared=manager.prepare_plugin(str(path), "main.py")),
+                              name="worker")
+    worker.start()
+    worker.join()
+    signature, code = result["prepared"]
+    assert code is not None
+    assert manager.module_cache_stats == {"hits": 0, "misses": 0}
+
+    module = manager.load_plugin(str(path), "main.py", result["prepared"])
+    assert module.EXECUTED_ON == threading.current_thread().name
+    assert manager.prepare_plugin(str(path), "main.py") == (signature, None)
+    assert manager.load_plugin(str(path), "main.py", (signature, None)) is module
+    assert manager.module_cache_stats == {"hits": 1, "misses": 1}
+
+
+def test_changed_source_is_reloaded_and_unload_runs_shutdown(tmp_path):
+    path = _make_loadable_plugin(tmp_path / "plugins", "Changing",
+                                 "VERSION = 1\ndef main(widget):\n    return None\n")
+    manager = PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store"))
+    assert manager.load_plugin(str(path), "main.py").VERSION == 1
+
+    (path / "main.py").write_text("import sys\nVERSION = 2\ndef main(widget):\n    return None\n"
+                                  "def shutdown():\n    sys.modules[__name__ + '_shut'] = True\n")
+    os.utime(path / "main.py", ns=(1, 1))  # make sure the stamp differs even on coarse clocks
+    module = manager.load_plugin(str(path), "main.py", manager.prepare_plugin(str(path), "main.py"))
+    assert module.VERSION == 2
+
+    manager.unload_plugin(str(path))
+    assert sys.modules.pop("main_shut") is True
+    assert manager.load_plugin(str(path), "main.py") is not module
+
+
+def test_loading_records_import_cost(tmp_path):
+    path = _make_loadable_plugin(tmp_path / "plugins", "Importer",
+                                 "import colorsys\ndef main(widget):\n    return None\n")
+    manager = PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store"))
+    manager.load_plugin(str(path), "main.py")
+    (report_path, cost), = manager.dependencies.import_cost_report()
+    assert report_path == str(path)
+    assert cost["seconds"] >= 0 and cost["modules"] >= 0
+
+
+@pytest.fixture
+def clean_tracer():
+    tracer.clear()
+    yield tracer
+    tracer.clear()
+
+
+def test_loading_and_launching_a_plugin_gives_one_performance_row(tmp_path, clean_tracer, qapp):
+    from PyQt5 import QtWidgets
+    from simpletoolsuite.plugintabs import PluginTabManager
+
+    _make_plugin(tmp_path / "plugins", "img_tool", name="Image Tool")
+    manager = PluginManager(str(tmp_path / "plugins"), store_dir=str(tmp_path / "store"))
+    plugin = manager.get_plugin("Image Tool")
+    module = manager.load_plugin(plugin["path"], plugin["main"])
+    tab_widget = QtWidgets.QTabWidget()
+    tabs = PluginTabManager(tab_widget, suspend_after=0)
+    tabs.open(plugin["name"], module, os.path.basename(plugin["path"]))
+    qapp.processEvents()
+
+    row, = manager.performance_report()
+    assert (row["folder"], row["name"]) == ("img_tool", "Image Tool")
+    assert row["load"]["count"] == 1 and row["launch"]["count"] == 1
+    assert row["imports"] is not None
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from simpletoolsuite.relocate import COPIED, DONE, JOURNAL_NAME, PluginRelocator, RelocationError
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source, dest = tmp_path / "old", tmp_path / "new"
+    for name in ("Alpha", "Beta"):
+        (source / name / "pkg").mkdir(parents=True)
+        (source / name / "main.py").write_text(f"NAME = {name!r}\n")
+        (source / name / "pkg" / "data.bin").write_bytes(os.urandom(1024))
+    return source, dest
+
+
+def _force_copy(monkeypatch):
+    monkeypatch.setattr(PluginRelocator, "_same_filesystem", lambda self: False)
+
+
+@pytest.fixture(params=["rename", "copy"])
+def mode(request, monkeypatch):
+    if request.param == "copy":
+        _force_copy(monkeypatch)
+    return request.param
+
+
+# Same-filesystem renames go straight to done; copies pass through copied first.
+CRASHES = [("rename", DONE), ("copy", COPIED), ("copy", DONE)]
+
+
+def _crash_on(monkeypatch, crash_state):
+    """Make the first journal write of ``crash_state`` die, as if the process was killed just before it."""
+    real_set_state = PluginRelocator._set_state
+
+    def set_state(self, name, state):
+        if state == crash_state and not getattr(self, "crashed", False):
+            self.crashed = True
+            raise Crash(name)
+        real_set_state(self, name, state)
+    monkeypatch.setattr(PluginRelocator, "_set_state", set_state)
+
+
+def _contents(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files)
+
+
+def test_relocation_moves_every_plugin(dirs, mode):
+    source, dest = dirs
+    expected = _contents(source)
+    assert sorted(PluginRelocator(str(source), str(dest)).run()) == ["Alpha", "Beta"]
+    assert _contents(dest) == expected
+    assert os.listdir(source) == []
+
+
+@pytest.mark.parametrize("mode, crash_state", CRASHES)
+def test_resume_after_crash_between_rename_and_journal(dirs, monkeypatch, mode, crash_state):
+    if mode == "copy":
+        _force_copy(monkeypatch)
+    source, dest = dirs
+    expected = _contents(source)
+    _crash_on(monkeypatch, crash_state)
+    with pytest.raises(Crash):
+        PluginRelocator(str(source), str(dest)).run()
+    monkeypatch.undo()
+    if mode == "copy":
+        _force_copy(monkeypatch)
+
+    assert PluginRelocator.pending(str(source)) == str(dest)
+    assert sorted(PluginRelocator(str(source), str(dest)).run()) == ["Alpha", "Beta"]
+    assert _contents(dest) == expected
+    assert os.listdir(source) == []
+
+
+@pytest.mark.parametrize("mode, crash_state", CRASHES)
+def test_rollback_after_crash_between_rename_and_journal(dirs, monkeypatch, mode, crash_state):
+    if mode == "copy":
+        _force_copy(monkeypatch)
+    source, dest = dirs
+    expected = _contents(source)
+    _crash_on(monkeypatch, crash_state)
+    with pytest.raises(Crash):
+        PluginRelocator(str(source), str(dest)).run()
+    monkeypatch.undo()
+
+    PluginRelocator(str(source), str(dest)).rollback()
+    assert _contents(source) == expected
+    assert not os.path.exists(source / JOURNAL_NAME)
+    assert _contents(dest) == []
+
+
+def test_existing_destination_folder_is_not_overwritten(dirs, mode):
+    source, dest = dirs
+    (dest / "Alpha").mkdir(parents=True)
+    (dest / "Alpha" / "mine.txt").write_text("keep")
+    with pytest.raises(RelocationError, match="Alpha"):
+        PluginRelocator(str(source), str(dest)).run()
+    assert _contents(dest / "Alpha") == ["mine.txt"]
+    assert (source / "Alpha" / "main.py").exists()
@@ -0,0 +1,76 @@
+import pytest
+
+from simpletoolsuite.search import CATALOG, INSTALLED, SearchIndex, tokenize
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add(INSTALLED, "Image Resizer", {"author": "Ada", "description": "Resize photos in bulk",
+                                           "features": ["batch", "thumbnails"]})
+    index.add(INSTALLED, "Hash Checker", {"author": "Grace", "description": "Verify file checksums"})
+    index.add(CATALOG, "Photo Tagger", {"author": "Ada", "description": "Tag photos with keywords"})
+    return index
+
+
+def _names(hits):
+    return [hit.name for hit in hits]
+
+
+def test_tokenize_splits_on_punctuation_and_underscores():
+    assert tokenize("Hash_Checker v2.0, fast!") == ["hash", "checker", "v2", "0", "fast"]
+    assert tokenize(None) == []
+
+
+def test_exact_prefix_and_fuzzy_matches(index):
+    assert _names(index.search("checker")) == ["Hash Checker"]
+    assert _names(index.search("chec")) == ["Hash Checker"]
+    assert _names(index.search("chekcer")) == ["Hash Checker"]  # adjacent letters swapped
+    assert index.search("chxxker") == []
+    assert _names(index.search("checkr")) == ["Hash Checker"]
+    assert _names(index.search("resizr")) == ["Image Resizer"]
+
+
+def test_every_query_word_must_match(index):
+    assert sorted(_names(index.search("ada photos"))) == ["Image Resizer", "Photo Tagger"]
+    assert _names(index.search("ada tag")) == ["Photo Tagger"]
+    assert index.search("ada checksums") == []
+
+
+def test_name_matches_rank_above_description_matches(index):
+    index.add(CATALOG, "Photo Booth", {"description": "Take pictures"})
+    hits = index.search("photo")
+    assert _names(hits) == ["Photo Booth", "Photo Tagger", "Image Resizer"]
+    assert hits[0].score > hits[-1].score
+
+
+def test_search_by_source_and_limit(index):
+    assert _names(index.search("ada", source=CATALOG)) == ["Photo Tagger"]
+    assert len(index.search("ada", limit=1)) == 1
+
+
+def test_remove_and_replace_keep_the_index_consistent(index):
+    assert index.remove(INSTALLED, "Hash Checker")
+    assert not index.remove(INSTALLED, "Hash Checker")
+    assert index.search("checksums") == []
+
+    index.replace(CATALOG, [("Photo Tagger", {"description": "Label pictures"}), ("Zip Tool", {})])
+    assert sorted(index.names(CATALOG)) == ["Photo Tagger", "Zip Tool"]
+    assert index.search("keywords") == []
+    assert _names(index.search("label")) == ["Photo Tagger"]
+    index.replace(CATALOG, [])
+    assert index.names(CATALOG) == []
+    assert len(index) == 1
+
+
+class _NoSlicing(list):
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            raise AssertionError("the vocabulary was copied")
+        return super().__getitem__(item)
+
+
+def test_prefix_lookup_does_not_copy_the_vocabulary(index):
+    index._vocabulary = _NoSlicing(index._vocabulary)
+    assert _names(index.search("thumb")) == ["Image Resizer"]
+    assert _names(index.search("zzz")) == []
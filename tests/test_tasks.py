@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def scheduler(qapp):
+    from simpletoolsuite.tasks import TaskScheduler
+    scheduler = TaskScheduler(max_threads=4)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def _wait_for(qapp, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def test_resubmitting_a_cancelled_key_waits_for_the_old_task(qapp, scheduler):
+    release = threading.Event()
+    running, overlaps, events = [], [], []
+
+    def work(task, name):
+        running.append(name)
+        overlaps.append(len(running))
+        release.wait(5)
+        task.progress(name)
+        running.remove(name)
+        return name
+
+    first = scheduler.submit("catalog", work, "first", on_progress=events.append,
+                             on_cancelled=lambda: events.append("first cancelled"))
+    _wait_for(qapp, lambda: running)
+    assert scheduler.cancel("catalog")
+    assert not scheduler.is_running("catalog")
+
+    second = scheduler.submit("catalog", work, "second", on_finished=events.append)
+    assert second is not first
+    assert scheduler.submit("catalog", work, "third") is second
+    assert scheduler.is_running("catalog")
+    time.sleep(0.05)
+    assert running == ["first"]  # the second is held back
+
+    release.set()
+    _wait_for(qapp, lambda: "second" in events and not scheduler.is_running("catalog"))
+    assert overlaps == [1, 1]
+    assert events == ["first cancelled", "second"]  # progress of the cancelled task is dropped
+
+
+def test_cancelling_a_held_task_reports_it_cancelled(qapp, scheduler):
+    release = threading.Event()
+    started, events = [], []
+
+    def work(task, name):
+        started.append(name)
+        release.wait(5)
+
+    scheduler.submit("catalog", work, "first")
+    _wait_for(qapp, lambda: started)
+    scheduler.cancel("catalog")
+    scheduler.submit("catalog", work, "second", on_cancelled=lambda: events.append("second cancelled"))
+    assert scheduler.cancel("catalog")
+    assert events == ["second cancelled"]
+    assert not scheduler.cancel("catalog")
+
+    release.set()
+    scheduler.pool.waitForDone(5000)
+    qapp.processEvents()
+    assert started == ["first"]